@@ -55,19 +55,15 @@ async def get_path_order(
     filter_data = {}
     if order_type:
         filter_data["order_type_id"] = str(order_type.id)
-    return await order_service.read_one(
-        id=str(order_id),
-        load_props=["order_type.params"],
-        **filter_data,
-    )
+    return await order_service.read_one(id=str(order_id), **filter_data)
 
 
 def get_order_filter(
-    id: Optional[List[str]] = Query(None),
-    parent_order_id: Optional[List[str]] = Query(None),
+    id: Optional[List[UUID]] = Query(None),
+    parent_order_id: Optional[List[UUID]] = Query(None),
     user_customer: Optional[List[str]] = Query(None),
     user_implementer: Optional[List[str]] = Query(None),
-    status: Optional[List[str]] = Query(None),
+    status: Optional[List[schemas.OrderStatus]] = Query(None),
     dep_type: Optional[List[str]] = Query(None),
 ) -> dict:
     return schemas.OrderFilter(
@@ -171,13 +167,16 @@ async def get_token(
 async def get_token_data(
     token: str = Depends(get_token),
 ) -> AsyncGenerator[Dict[str, Any], None]:
-    await auth.verify_token(token)
-    yield auth.decode_auth_token(token)
+    yield await auth.verify_token(token)
 
 
 async def get_user_data(
+    token: str = Depends(get_token),
     token_data: dict = Depends(get_token_data),
 ) -> AsyncGenerator[schemas.User, None]:
+    if user := auth.get_cached_user(token):
+        yield user
+        return
     logger.info(f"{token_data=}")
     roles = token_data.get("roles")
     if not roles:
@@ -185,9 +184,11 @@ async def get_user_data(
             roles = token_data["resource_access"][settings.KEYCLOAK_CLIENT_ID_FRONT][
                 "roles"
             ]
-    yield schemas.User(
+    user = schemas.User(
         user_id=token_data["sub"], name=token_data["preferred_username"], roles=roles
     )
+    auth.cache_user(token, user)
+    yield user
 
 
 class CurrentUser:
@@ -219,3 +220,18 @@ def get_sorting_list(sort: Optional[str] = None) -> Optional[schemas.SortingList
     SortValueChecker(sort=sort)
     sorting_list = util.parse_sorting(sort)
     return sorting_list
+
+
+def get_fieldset(
+    fields: Optional[str] = Query(
+        None, max_length=500, description="Fields to return: 'id,status'"
+    ),
+    expand: Optional[str] = Query(
+        None,
+        max_length=500,
+        description="Nested items to return: 'params,order_type.params'",
+    ),
+) -> schemas.FieldSet:
+    return schemas.FieldSet(
+        fields=util.parse_fields(fields), expand=util.parse_fields(expand)
+    )
@@ -1,10 +1,11 @@
-from typing import Dict, Optional
+import asyncio
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response, status
 
 from app import schemas
-from app.api import deps
-from app.core import keycloak
+from app.api import deps, util
+from app.core import auth_config, error, keycloak, user_directory
 from app.settings import settings
 
 router = APIRouter()
@@ -26,27 +27,60 @@ async def get_roles(
 
 @router.get("/users/", response_model=schemas.PaginatedResponse)
 async def get_role_with_users(
+    paginator: schemas.PaginationData = Depends(),
     role_name: Optional[str] = None,
     user: schemas.User = Depends(deps.CurrentUser([schemas.UserRole.STAFF])),
 ) -> schemas.PaginatedResponse:
+    if paginator.is_cursor:
+        # users are paged by offset only
+        raise error.IncorrectCursor(cursor=paginator.cursor or "")
+    directory = user_directory.get_user_directory()
     kc = keycloak.get_service_client()
-    if role_name is not None:
-        users = await kc.get_role_with_users(role_name=role_name)
+    offset, limit = paginator.offset, paginator.limit
+    count: Optional[int] = None
+    has_more: Optional[bool] = None
+    if directory.is_synced:
+        users = directory.get_users(role_name=role_name)
+        count = len(users)
+        users = users[offset:offset + limit]
+    elif role_name is not None:
+        # keycloak can not count role users: one extra user tells if next page exists
+        users = await kc.get_role_with_users(
+            role_name=role_name, first=offset, max=limit + 1
+        )
+        has_more = len(users) > limit
+        users = users[:limit]
     else:
-        users = await kc.get_users_with_roles()
-    return schemas.PaginatedResponse(
-        results=users,
-        count=len(users),
-        next=None,
-        previous=None,
+        users, count = await asyncio.gather(
+            kc.get_users(first=offset, max=limit), kc.get_users_count()
+        )
+        users = await kc.set_users_roles(users)
+    return await util.get_paginated_response(
+        schemas.PaginatedResponse(
+            results=users,
+            count=count,
+            has_more=has_more,
+            next=None,
+            previous=None,
+        ),
+        paginator,
     )
 
 
 @router.get("/auth/config/")
-async def get_auth_config() -> Dict:
-    kc = keycloak.get_service_client()
-    config = await kc.get_auth_config(client_id=settings.KEYCLOAK_CLIENT_ID_FRONT)
-    config["auth-server-url"] = settings.KEYCLOAK_URL_EXTERNAL
+async def get_auth_config(
+    response: Response, if_none_match: Optional[str] = Header(None)
+) -> Any:
+    config, etag = await auth_config.get_auth_config_cache().get()
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.KEYCLOAK_AUTH_CONFIG_MAX_AGE}",
+    }
+    if if_none_match is not None and {etag, "*"} & {
+        it.strip().replace("W/", "", 1) for it in if_none_match.split(",")
+    }:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
     return config
 
 
@@ -54,12 +88,15 @@ async def get_auth_config() -> Dict:
 async def get_user(
     user_id: str, user_data: schemas.User = Depends(deps.CurrentUser())
 ) -> Dict:
-    kc = keycloak.get_service_client()
-    user = await kc.get_user_by_id(user_id)
-    client = await kc.get_client(client_id=settings.KEYCLOAK_CLIENT_ID_FRONT)
-    roles = await kc.get_user_roles(user_id=user_id, client_id=client["id"])
-    user["roles"] = roles
-    return user
+    return await user_directory.get_user_directory().get_user(user_id)
+
+
+@router.delete("/cache/")
+async def flush_cache(
+    user: schemas.User = Depends(deps.CurrentUser([schemas.UserRole.STAFF])),
+) -> None:
+    keycloak.get_service_client().invalidate_metadata()
+    auth_config.get_auth_config_cache().clear()
 
 
 @router.get("/service-token-test/")
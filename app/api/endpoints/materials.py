@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from fastapi.encoders import jsonable_encoder
 
 from app import schemas, services
@@ -20,15 +20,10 @@ async def create_material(
         deps.get_materials_service
     ),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.Material:
+) -> Response:
     schemas.raise_order_type(user=user_data, order_type=str(order_type.name))
-    return schemas.Material(
-        **jsonable_encoder(
-            await materials_service.create(
-                item=item, user=user_data, order=order
-            )
-        )
-    )
+    created = await materials_service.create(item=item, user=user_data, order=order)
+    return util.json_response(schemas.serialize(schemas.Material, created))
 
 
 @router.get(
@@ -42,18 +37,17 @@ async def get_materials(
         deps.get_materials_service
     ),
     sorting_list: schemas.SortingList = Depends(deps.get_sorting_list),
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.PaginatedResponse:
-    return await util.get_paginated_response(
-        await materials_service.read_many_paginated(
-            wrapper_class=schemas.Material,
-            order_id=order.id,
-            sorting_list=sorting_list,
-            offset=paginator.offset,
-            limit=paginator.limit,
-        ),
-        paginator,
+) -> Response:
+    paginated = await materials_service.read_many_paginated(
+        wrapper_class=schemas.Material,
+        order_id=order.id,
+        sorting_list=sorting_list,
+        fieldset=fieldset,
+        **paginator.get_service_kwargs(),
     )
+    return util.json_response(await util.get_paginated_response(paginated, paginator))
 
 
 @router.get(
@@ -63,8 +57,9 @@ async def get_materials(
 async def get_material(
     material: entities.Material = Depends(deps.get_path_material),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.Material:
-    return schemas.Material(**jsonable_encoder(material))
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
+) -> Response:
+    return util.json_response(schemas.serialize(schemas.Material, material, fieldset))
 
 
 @router.put(
@@ -79,12 +74,12 @@ async def update_material(
         deps.get_materials_service
     ),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.Material:
+) -> Response:
     schemas.raise_order_type(user=user_data, order_type=str(order_type.name))
     updated = await materials_service.update_by_user(
         id=str(material.id), user=user_data, **jsonable_encoder(update_data, exclude_none=True)
     )
-    return schemas.Material(**jsonable_encoder(updated))
+    return util.json_response(schemas.serialize(schemas.Material, updated))
 
 
 @router.delete("/{order_type_id}/order/{order_id}/materials/{material_id}/")
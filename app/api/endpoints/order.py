@@ -1,6 +1,7 @@
+import asyncio
 from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from fastapi.encoders import jsonable_encoder
 
 from app import schemas, services
@@ -17,15 +18,18 @@ async def create_order(
     order: schemas.OrderCreate,
     order_type: entities.OrderType = Depends(deps.get_path_order_type),
     order_service: services.OrderService = Depends(deps.get_order_service),
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
     user: schemas.User = Depends(deps.get_user_data),
-) -> schemas.Order:
+) -> Response:
     user.check_one_role([schemas.UserRole.STAFF_CUSTOMER_MANAGER, schemas.UserRole.STAFF_ORDER_MANAGER])
     schemas.raise_order_type(user=user, order_type=str(order_type.name))
-    await schemas.raise_user_customer_data(order)
-    await schemas.raise_user_implementer_data(order)
-    return schemas.Order(
-        **jsonable_encoder(await order_service.create(order, order_type=order_type))
+    await schemas.raise_order_users_data(order)
+    created = await order_service.create(
+        order,
+        order_type=order_type,
+        load_plan=order_service.get_load_plan(schemas.Order, fieldset),
     )
+    return util.json_response(schemas.serialize(schemas.Order, created, fieldset))
 
 
 @router.get("/{order_type_id}/order/", response_model=schemas.PaginatedResponse)
@@ -35,23 +39,22 @@ async def get_orders(
     order_type: Optional[entities.OrderType] = Depends(deps.get_path_order_type),
     order_service: services.OrderService = Depends(deps.get_order_service),
     sorting_list: schemas.SortingList = Depends(deps.get_sorting_list),
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
     filter_data: dict = Depends(deps.get_order_filter),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.PaginatedResponse:
+) -> Response:
     if order_type:
         filter_data["order_type_id"] = str(order_type.id)
     if "staff" not in user_data.roles:
         filter_data["user_customer"] = str(user_data.user_id)
-    return await util.get_paginated_response(
-        await order_service.read_many_paginated(
-            wrapper_class=schemas.Order,
-            offset=paginator.offset,
-            limit=paginator.limit,
-            sorting_list=sorting_list,
-            **filter_data,
-        ),
-        paginator,
+    paginated = await order_service.read_many_paginated(
+        wrapper_class=schemas.Order,
+        **paginator.get_service_kwargs(),
+        sorting_list=sorting_list,
+        fieldset=fieldset,
+        **filter_data,
     )
+    return util.json_response(await util.get_paginated_response(paginated, paginator))
 
 
 @router.get("/{order_type_id}/test-order/", response_model=schemas.PaginatedResponse)
@@ -80,10 +83,11 @@ async def get_order(
     order: entities.Order = Depends(deps.get_path_order),
     order_type: entities.OrderType = Depends(deps.get_path_order_type),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.Order:
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
+) -> Response:
     if order.order_type.name != OrderTypeName.BATH_ORDER:
         user_data.check_one_role([schemas.UserRole.STAFF])
-    return schemas.Order(**jsonable_encoder(order))
+    return util.json_response(schemas.serialize(schemas.Order, order, fieldset))
 
 
 @router.put("/{order_type_id}/order/{order_id}/", response_model=schemas.Order)
@@ -98,13 +102,11 @@ async def update_order(
     status_service: services.OrderStatusUpdateService = Depends(
         deps.get_update_status_service
     ),
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
     user: schemas.User = Depends(deps.CurrentUser([schemas.UserRole.STAFF])),
-) -> schemas.Order:
+) -> Response:
     schemas.raise_order_type(user, str(order_type.name))
-    await schemas.raise_user_customer_update_data(order_update_data)
-    await schemas.raise_user_implementer_update_data(order_update_data)
     if order_update_data.status is not None:
-        schemas.raise_order_type(user=user, order_type=str(order_type.name))
         schemas.raise_order_status_update(
             user=user,
             old_status=schemas.OrderStatus(order.status),
@@ -113,10 +115,21 @@ async def update_order(
         schemas.raise_ready_order_update(
             new_status=order_update_data.status, order=order
         )
-        schemas.raise_accepted_order_update(
-            new_status=order_update_data.status,
-            child_orders=await order_service.read_many(parent_order_id=order.id),
-        )
+    # users are checked in keycloak while child orders statuses are read from db
+    users_check = asyncio.create_task(
+        schemas.raise_order_users_data(order_update_data)
+    )
+    try:
+        if order_update_data.status == OrderStatus.ACCEPTED:
+            schemas.raise_accepted_order_update(
+                new_status=order_update_data.status,
+                child_statuses=await order_service.read_child_statuses(order.id),
+            )
+    except BaseException:
+        users_check.cancel()
+        raise
+    await users_check
+    if order_update_data.status is not None:
         await status_service.create(
             user=user,
             new_order_status=order_update_data.status,
@@ -124,9 +137,11 @@ async def update_order(
             order_id=str(order.id),
         )
     updated = await order_service.update(
-        id=str(order.id), **jsonable_encoder(order_update_data, exclude_none=True)
+        id=str(order.id),
+        load_plan=order_service.get_load_plan(schemas.Order, fieldset),
+        **jsonable_encoder(order_update_data, exclude_none=True),
     )
-    return schemas.Order(**jsonable_encoder(updated))
+    return util.json_response(schemas.serialize(schemas.Order, updated, fieldset))
 
 
 @router.delete("/{order_type_id}/order/{order_id}/")
@@ -137,8 +152,9 @@ async def delete_order(
     status_service: services.OrderStatusUpdateService = Depends(
         deps.get_update_status_service
     ),
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
     user: schemas.User = Depends(deps.CurrentUser([schemas.UserRole.STAFF])),
-) -> schemas.Order:
+) -> Response:
     schemas.raise_order_type(user, str(order_type.name))
 
     schemas.raise_order_status_update(
@@ -154,8 +170,9 @@ async def delete_order(
     )
     updated = await order_service.update(
         id=str(order.id),
+        load_plan=order_service.get_load_plan(schemas.Order, fieldset),
         **jsonable_encoder(
             schemas.OrderUpdate(status=OrderStatus.TO_REMOVE), exclude_none=True
         ),
     )
-    return schemas.Order(**jsonable_encoder(updated))
+    return util.json_response(schemas.serialize(schemas.Order, updated, fieldset))
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from fastapi.encoders import jsonable_encoder
 
 from app import schemas, services
@@ -22,15 +22,12 @@ async def create_order_type(
         deps.get_order_param_value_service
     ),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.OrderParamValue:
+) -> Response:
     user_data.check_one_role([schemas.UserRole.STAFF])
-    return schemas.OrderParamValue(
-        **jsonable_encoder(
-            await order_param_value_service.create(
-                item=item, order=order, order_type_param=order_type_param
-            )
-        )
+    created = await order_param_value_service.create(
+        item=item, order=order, order_type_param=order_type_param
     )
+    return util.json_response(schemas.serialize(schemas.OrderParamValue, created))
 
 
 @router.get(
@@ -44,18 +41,17 @@ async def get_orders(
         deps.get_order_param_value_service
     ),
     sorting_list: schemas.SortingList = Depends(deps.get_sorting_list),
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.PaginatedResponse:
-    return await util.get_paginated_response(
-        await order_param_value_service.read_many_paginated(
-            wrapper_class=schemas.OrderParamValue,
-            order_id=order.id,
-            sorting_list=sorting_list,
-            offset=paginator.offset,
-            limit=paginator.limit,
-        ),
-        paginator,
+) -> Response:
+    paginated = await order_param_value_service.read_many_paginated(
+        wrapper_class=schemas.OrderParamValue,
+        order_id=order.id,
+        sorting_list=sorting_list,
+        fieldset=fieldset,
+        **paginator.get_service_kwargs(),
     )
+    return util.json_response(await util.get_paginated_response(paginated, paginator))
 
 
 @router.get(
@@ -67,8 +63,11 @@ async def get_order_param(
         deps.get_path_order_param_value
     ),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.OrderParamValue:
-    return schemas.OrderParamValue(**jsonable_encoder(order_param_value))
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
+) -> Response:
+    return util.json_response(
+        schemas.serialize(schemas.OrderParamValue, order_param_value, fieldset)
+    )
 
 
 @router.put(
@@ -84,12 +83,12 @@ async def update_order_param(
         deps.get_order_param_value_service
     ),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.OrderParamValue:
+) -> Response:
     user_data.check_one_role([schemas.UserRole.STAFF])
     updated = await order_param_value_service.update(
         id=str(order_param_value.id), **jsonable_encoder(update_data, exclude_none=True)
     )
-    return schemas.OrderParamValue(**jsonable_encoder(updated))
+    return util.json_response(schemas.serialize(schemas.OrderParamValue, updated))
 
 
 @router.delete("/{order_type_id}/order/{order_id}/params/{order_type_param_id}/")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from fastapi.encoders import jsonable_encoder
 
 from app import schemas, services
@@ -14,10 +14,14 @@ async def create_order_type(
     order_type_service: services.OrderTypeService = Depends(
         deps.get_order_type_service
     ),
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
     user_data: schemas.User = Depends(deps.CurrentUser()),
-) -> schemas.OrderType:
+) -> Response:
     user_data.check_one_role([schemas.UserRole.STAFF])
-    return schemas.OrderType(**jsonable_encoder(await order_type_service.create(item)))
+    created = await order_type_service.create(
+        item, load_plan=order_type_service.get_load_plan(schemas.OrderType, fieldset)
+    )
+    return util.json_response(schemas.serialize(schemas.OrderType, created, fieldset))
 
 
 @router.get("/", response_model=schemas.PaginatedResponse)
@@ -27,25 +31,25 @@ async def get_orders(
         deps.get_order_type_service
     ),
     sorting_list: schemas.SortingList = Depends(deps.get_sorting_list),
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
     user_data: schemas.User = Depends(deps.CurrentUser()),
-) -> schemas.PaginatedResponse:
-    return await util.get_paginated_response(
-        await order_type_service.read_many_paginated(
-            wrapper_class=schemas.OrderType,
-            offset=paginator.offset,
-            sorting_list=sorting_list,
-            limit=paginator.limit,
-        ),
-        paginator,
+) -> Response:
+    paginated = await order_type_service.read_many_paginated(
+        wrapper_class=schemas.OrderType,
+        sorting_list=sorting_list,
+        fieldset=fieldset,
+        **paginator.get_service_kwargs(),
     )
+    return util.json_response(await util.get_paginated_response(paginated, paginator))
 
 
 @router.get("/{order_type_id}/", response_model=schemas.OrderType)
 async def get_order(
     order: entities.OrderType = Depends(deps.get_path_order_type),
     user_data: schemas.User = Depends(deps.CurrentUser()),
-) -> schemas.OrderType:
-    return schemas.OrderType(**jsonable_encoder(order))
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
+) -> Response:
+    return util.json_response(schemas.serialize(schemas.OrderType, order, fieldset))
 
 
 @router.put("/{order_type_id}/", response_model=schemas.OrderType)
@@ -55,13 +59,16 @@ async def update_order(
     order_type_service: services.OrderTypeService = Depends(
         deps.get_order_type_service
     ),
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
     user_data: schemas.User = Depends(deps.CurrentUser()),
-) -> schemas.OrderType:
+) -> Response:
     user_data.check_one_role([schemas.UserRole.STAFF])
     updated = await order_type_service.update(
-        id=str(order_type.id), **jsonable_encoder(update_data, exclude_none=True)
+        id=str(order_type.id),
+        load_plan=order_type_service.get_load_plan(schemas.OrderType, fieldset),
+        **jsonable_encoder(update_data, exclude_none=True),
     )
-    return schemas.OrderType(**jsonable_encoder(updated))
+    return util.json_response(schemas.serialize(schemas.OrderType, updated, fieldset))
 
 
 @router.delete("/{order_type_id}/")
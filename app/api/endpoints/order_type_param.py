@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from fastapi.encoders import jsonable_encoder
 
 from app import schemas, services
@@ -16,13 +16,10 @@ async def create_order_type(
         deps.get_order_type_param_service
     ),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.OrderTypeParam:
+) -> Response:
     user_data.check_one_role([schemas.UserRole.STAFF])
-    return schemas.OrderTypeParam(
-        **jsonable_encoder(
-            await order_type_param_service.create(item=item, order_type=order_type)
-        )
-    )
+    created = await order_type_param_service.create(item=item, order_type=order_type)
+    return util.json_response(schemas.serialize(schemas.OrderTypeParam, created))
 
 
 @router.get("/{order_type_id}/params/", response_model=schemas.PaginatedResponse)
@@ -33,18 +30,17 @@ async def get_orders(
         deps.get_order_type_param_service
     ),
     sorting_list: schemas.SortingList = Depends(deps.get_sorting_list),
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.PaginatedResponse:
-    return await util.get_paginated_response(
-        await order_type_param_service.read_many_paginated(
-            wrapper_class=schemas.OrderTypeParam,
-            order_type_id=order_type.id,
-            offset=paginator.offset,
-            sorting_list=sorting_list,
-            limit=paginator.limit,
-        ),
-        paginator,
+) -> Response:
+    paginated = await order_type_param_service.read_many_paginated(
+        wrapper_class=schemas.OrderTypeParam,
+        order_type_id=order_type.id,
+        sorting_list=sorting_list,
+        fieldset=fieldset,
+        **paginator.get_service_kwargs(),
     )
+    return util.json_response(await util.get_paginated_response(paginated, paginator))
 
 
 @router.get(
@@ -54,8 +50,11 @@ async def get_orders(
 async def get_order_type_param(
     order_type_param: entities.OrderTypeParam = Depends(deps.get_path_order_type_param),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.OrderTypeParam:
-    return schemas.OrderTypeParam(**jsonable_encoder(order_type_param))
+    fieldset: schemas.FieldSet = Depends(deps.get_fieldset),
+) -> Response:
+    return util.json_response(
+        schemas.serialize(schemas.OrderTypeParam, order_type_param, fieldset)
+    )
 
 
 @router.put(
@@ -69,12 +68,12 @@ async def update_order_type_param(
         deps.get_order_type_param_service
     ),
     user_data: schemas.User = Depends(deps.get_user_data),
-) -> schemas.OrderTypeParam:
+) -> Response:
     user_data.check_one_role([schemas.UserRole.STAFF])
     updated = await order_type_param_service.update(
         id=str(order_type_param.id), **jsonable_encoder(update_data, exclude_none=True)
     )
-    return schemas.OrderTypeParam(**jsonable_encoder(updated))
+    return util.json_response(schemas.serialize(schemas.OrderTypeParam, updated))
 
 
 @router.delete("/{order_type_id}/params/{order_type_param_id}/")
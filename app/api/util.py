@@ -1,5 +1,8 @@
 import re
+from typing import Any, Optional, Tuple
 
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 from starlette.datastructures import URL
 
 from app import schemas
@@ -9,6 +12,20 @@ from app.settings import settings
 from app.util import urls
 
 
+def json_response(content: Any, status_code: int = 200) -> JSONResponse:
+    """
+    Response with already serialized content (see schemas.serialize),
+    endpoint response_model validation and jsonable_encoder are skipped for it
+
+    :param content: JSON-ready dict / list or pydantic model with JSON-ready fields
+    :param status_code: Response status code
+    """
+    if isinstance(content, BaseModel):
+        # fields are JSON-ready already, deep .dict() would copy all of them
+        content = dict(content)
+    return JSONResponse(content=content, status_code=status_code)
+
+
 async def get_paginated_response(
     paginated_response: PaginatedResponse,
     paginator: PaginationData,
@@ -17,18 +34,50 @@ async def get_paginated_response(
     query = urls.parse_query_dict(url)
     if settings.FORCE_HTTPS:
         url = url.replace(scheme="https")
+    if paginator.is_cursor:
+        return get_cursor_paginated_response(paginated_response, paginator, url)
     if paginator.offset >= paginator.limit:
         query["limit"] = str(paginator.limit)
         query["offset"] = str(paginator.offset - paginator.limit)
         paginated_response.previous = str(urls.replace_query_params(url, **query))
     offset = paginator.offset + paginator.limit
-    if offset < paginated_response.count:
+    has_next = (
+        offset < paginated_response.count
+        if paginated_response.count is not None
+        else bool(paginated_response.has_more)
+    )
+    if has_next:
         query["limit"] = str(paginator.limit)
         query["offset"] = str(offset)
         paginated_response.next = str(urls.replace_query_params(url, **query))
     return paginated_response
 
 
+def get_cursor_paginated_response(
+    paginated_response: PaginatedResponse,
+    paginator: PaginationData,
+    url: URL,
+) -> PaginatedResponse:
+    url = url.remove_query_params(["offset", "cursor"])
+    params = {
+        "limit": str(paginator.limit),
+        "pagination": schemas.PaginationType.CURSOR.value,
+    }
+    if paginated_response.previous_cursor is not None:
+        paginated_response.previous = str(
+            urls.replace_query_params(
+                url, cursor=paginated_response.previous_cursor, **params
+            )
+        )
+    if paginated_response.next_cursor is not None:
+        paginated_response.next = str(
+            urls.replace_query_params(
+                url, cursor=paginated_response.next_cursor, **params
+            )
+        )
+    return paginated_response
+
+
 def parse_sorting_item(sorting_item: str) -> schemas.SortingListItem:
     field = sorting_item
     sorting_type = schemas.SortingType.ASC
@@ -52,3 +101,10 @@ def parse_sorting(sorting_str: str) -> schemas.SortingList:
     if len(fields) != len(unique):
         raise error.IncorrectSorting(fields="duplicates", with_format=True)
     return schemas.SortingList(sorting_list=sorting_list)
+
+
+def parse_fields(fields_str: Optional[str]) -> Optional[Tuple[str, ...]]:
+    if fields_str is None:
+        return None
+    parts = [it for it in fields_str.replace(" ", "").split(",") if it]
+    return tuple(dict.fromkeys(parts))
@@ -1,17 +1,85 @@
 import base64
+import hashlib
 import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
 
 from fastapi.security import HTTPBearer
 
-from app.core import keycloak
+from app import schemas
+from app.core import jwks, keycloak
+from app.settings import settings
+from app.util.cache import SingleFlight, TTLCache
 
 oauth2_schema = HTTPBearer()
 
 
-async def verify_token(token: str) -> None:
-    await keycloak.get_service_client().verify_token(token)
+class TokenVerifyMode(schemas.StrEnum):
+    LOCAL = "local"
+    INTROSPECT = "introspect"
+
+
+@dataclass
+class VerifiedToken:
+    claims: Dict[str, Any]
+    user: Optional[schemas.User] = None
+
+
+_verified_tokens: TTLCache[str, VerifiedToken] = TTLCache(
+    maxsize=settings.KEYCLOAK_TOKEN_CACHE_SIZE,
+    ttl=settings.KEYCLOAK_TOKEN_CACHE_TTL,
+)
+_token_verification = SingleFlight()
+
+
+def get_token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def _verify_token(token: str) -> Dict[str, Any]:
+    if settings.KEYCLOAK_TOKEN_VERIFY_MODE == TokenVerifyMode.INTROSPECT:
+        return await keycloak.get_service_client().verify_token(token)
+    return await jwks.get_jwks_cache().verify_token(token)
+
+
+async def _verify_and_cache_token(token: str, key: str) -> Dict[str, Any]:
+    claims = await _verify_token(token)
+    ttl = int(claims.get("exp", 0)) - time.time()
+    _verified_tokens.set(key, VerifiedToken(claims=claims), ttl=ttl)
+    return claims
+
+
+async def verify_token(token: str) -> Dict[str, Any]:
+    """
+    Verify access token and return its claims
+
+    ``local`` mode checks signature and claims against cached realm keys (JWKS).
+    ``introspect`` mode asks keycloak about every token (strict, sees revoked sessions).
+    Positive results are cached until token expiration, but no longer than
+    KEYCLOAK_TOKEN_CACHE_TTL. Concurrent verifications of the same token share one call.
+
+    :param token: Bearer access token
+    :return: Token claims
+    """
+    key = get_token_key(token)
+    if verified := _verified_tokens.get(key):
+        return verified.claims
+    return await _token_verification.do(
+        key, lambda: _verify_and_cache_token(token, key)
+    )
+
+
+def get_cached_user(token: str) -> Optional[schemas.User]:
+    verified = _verified_tokens.get(get_token_key(token))
+    return verified.user if verified else None
+
+
+def cache_user(token: str, user: schemas.User) -> None:
+    if verified := _verified_tokens.get(get_token_key(token)):
+        verified.user = user
 
 
 def decode_auth_token(token: str) -> dict:
     token_data = token.split(".")[1]
-    return json.loads(base64.b64decode(bytes(token_data + "==", "ascii")))
+    return json.loads(base64.urlsafe_b64decode(bytes(token_data + "==", "ascii")))
@@ -0,0 +1,88 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from app.core import keycloak
+from app.log import logger
+from app.settings import settings
+from app.util.cache import SingleFlight
+
+
+@dataclass
+class AuthConfigCache:
+    """
+    Per-worker cache of frontend client auth config (keycloak.json) ready to be served
+
+    Config is rendered (``auth-server-url`` is rewritten to external keycloak url) once
+    and served with its ETag. After ``ttl`` seconds config is still served as is while
+    it is refreshed in the background.
+    """
+
+    client_id: str
+    auth_server_url: str
+    ttl: int = 300
+    _cached: Optional[Tuple[Dict, str]] = None
+    _fetched_at: float = 0
+    _refresh: SingleFlight = field(default_factory=SingleFlight)
+    _background: Optional["asyncio.Future[None]"] = None
+
+    @staticmethod
+    def get_etag(config: Dict) -> str:
+        body = json.dumps(config, sort_keys=True, separators=(",", ":"))
+        return f'"{hashlib.sha256(body.encode()).hexdigest()}"'
+
+    async def _fetch(self) -> Tuple[Dict, str]:
+        kc = keycloak.get_service_client()
+        config = await kc.get_auth_config(client_id=self.client_id)
+        config["auth-server-url"] = self.auth_server_url
+        self._cached = config, self.get_etag(config)
+        self._fetched_at = time.monotonic()
+        return self._cached
+
+    async def refresh(self) -> Tuple[Dict, str]:
+        """
+        :return: Fetched config and its ETag
+        """
+        return await self._refresh.do(self.client_id, self._fetch)
+
+    def refresh_in_background(self) -> None:
+        if self._background is not None and not self._background.done():
+            return
+
+        async def refresh() -> None:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Auth config background refresh failed: {e}")
+
+        self._background = asyncio.ensure_future(refresh())
+
+    async def get(self) -> Tuple[Dict, str]:
+        """
+        :return: Rendered config and its ETag
+        """
+        if self._cached is None:
+            return await self.refresh()
+        if time.monotonic() - self._fetched_at > self.ttl:
+            self.refresh_in_background()
+        return self._cached
+
+    def clear(self) -> None:
+        self._cached = None
+
+
+_auth_config_cache: Optional[AuthConfigCache] = None
+
+
+def get_auth_config_cache() -> AuthConfigCache:
+    global _auth_config_cache
+    if _auth_config_cache is None:
+        _auth_config_cache = AuthConfigCache(
+            client_id=settings.KEYCLOAK_CLIENT_ID_FRONT,
+            auth_server_url=settings.KEYCLOAK_URL_EXTERNAL,
+            ttl=settings.KEYCLOAK_AUTH_CONFIG_CACHE_TTL,
+        )
+    return _auth_config_cache
@@ -38,6 +38,25 @@ class IncorrectSorting(Exception):
         return message.ERROR_INCORRECT_SORTING.format(fields=self.fields)
 
 
+@dataclass
+class IncorrectCursor(Exception):
+    cursor: str = ""
+
+    def __str__(self) -> str:
+        return message.ERROR_INCORRECT_CURSOR.format(cursor=self.cursor)
+
+
+@dataclass
+class IncorrectFields(Exception):
+    fields: Union[List, Set, str] = ""
+    available: Optional[Set[str]] = None
+
+    def __str__(self) -> str:
+        return message.ERROR_INCORRECT_FIELDS.format(
+            fields=list(self.fields), available=sorted(self.available or [])
+        )
+
+
 @dataclass
 class IncorrectDataFormat(Exception):
     allowed_formats: Optional[Iterable] = None
@@ -60,3 +79,14 @@ class ActionForbidden(Exception):
 class Unauthorized(Exception):
     def __str__(self) -> str:
         return message.ERROR_NOT_AUTHORIZED
+
+
+@dataclass
+class UnsupportedOperation(Exception):
+    operation: str = ""
+    dialect: str = ""
+
+    def __str__(self) -> str:
+        return message.ERROR_UNSUPPORTED_OPERATION.format(
+            operation=self.operation, dialect=self.dialect
+        )
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from jose import JWTError, jwt
+
+from app.core import error, keycloak
+from app.log import logger
+from app.settings import settings
+from app.util.cache import SingleFlight
+
+ALGORITHM = "RS256"
+
+
+@dataclass
+class JWKSCache:
+    """
+    In-process cache of realm signing keys (JWKS) used to verify access tokens locally
+
+    Keys are fetched once and then refreshed in the background every ``refresh_interval``
+    seconds. Unknown key id (keys were rotated) triggers immediate refetch, but not more
+    often than once per ``min_refresh_interval`` seconds.
+    """
+
+    url: str
+    issuers: List[str]
+    audience: Optional[str] = None
+    leeway: int = 0
+    refresh_interval: int = 3600
+    min_refresh_interval: int = 10
+    _keys: Dict[str, Dict] = field(default_factory=dict)
+    _fetched_at: float = 0
+    _refresh: SingleFlight = field(default_factory=SingleFlight)
+    _background: Optional["asyncio.Future[None]"] = None
+
+    async def _fetch(self) -> None:
+        response = await keycloak.get_service_client().http.get(self.url)
+        response.raise_for_status()
+        keys = response.json().get("keys", [])
+        self._keys = {
+            it["kid"]: it for it in keys if it.get("use", "sig") == "sig" and "kid" in it
+        }
+        self._fetched_at = time.monotonic()
+        logger.info(f"JWKS refreshed, {len(self._keys)} signing keys")
+
+    async def refresh(self) -> None:
+        await self._refresh.do(self.url, self._fetch)
+
+    def refresh_in_background(self) -> None:
+        if self._background is not None and not self._background.done():
+            return
+
+        async def refresh() -> None:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"JWKS background refresh failed: {e}")
+
+        self._background = asyncio.ensure_future(refresh())
+
+    async def get_key(self, kid: str) -> Dict:
+        age = time.monotonic() - self._fetched_at
+        if kid not in self._keys and (not self._keys or age > self.min_refresh_interval):
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"JWKS refresh failed: {e}")
+        elif age > self.refresh_interval:
+            self.refresh_in_background()
+        if key := self._keys.get(kid):
+            return key
+        raise error.Unauthorized
+
+    async def verify_token(self, token: str) -> Dict[str, Any]:
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError:
+            raise error.Unauthorized
+        if header.get("alg") != ALGORITHM or not header.get("kid"):
+            raise error.Unauthorized
+        key = await self.get_key(header["kid"])
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[ALGORITHM],
+                audience=self.audience,
+                issuer=self.issuers,
+                options={"verify_aud": self.audience is not None, "leeway": self.leeway},
+            )
+        except JWTError:
+            raise error.Unauthorized
+
+
+_jwks_cache: Optional[JWKSCache] = None
+
+
+def get_jwks_cache() -> JWKSCache:
+    global _jwks_cache
+    if _jwks_cache is None:
+        realm_path = f"/realms/{settings.KEYCLOAK_REALM}"
+        issuers = {
+            f"{settings.KEYCLOAK_URL}{realm_path}",
+            f"{settings.KEYCLOAK_URL_EXTERNAL}{realm_path}",
+        }
+        if issuer := settings.KEYCLOAK_OPENID_CONFIG.get("issuer"):
+            issuers.add(issuer)
+        _jwks_cache = JWKSCache(
+            url=settings.KEYCLOAK_OPENID_CONFIG["jwks_uri"],
+            issuers=sorted(issuers),
+            audience=settings.KEYCLOAK_TOKEN_AUDIENCE,
+            leeway=settings.KEYCLOAK_TOKEN_LEEWAY,
+            refresh_interval=settings.KEYCLOAK_JWKS_REFRESH_INTERVAL,
+        )
+    return _jwks_cache
@@ -1,13 +1,22 @@
+import asyncio
+import importlib.util
 import time
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List,
+                    Optional, Tuple, Union)
 
 import httpx
 from fastapi import status
 
 from app import schemas
 from app.core import auth, error, message
+from app.log import logger
 from app.settings import settings
+from app.util.cache import SingleFlight, TTLCache
+
+# http2 extra of httpx (h2 package) is optional
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
 
 # REST API DOCS: https://www.keycloak.org/docs-api/20.0.5/rest-api/index.html
 
@@ -26,7 +35,77 @@ class KeycloakClient:
     client_id: str
     client_secret: Optional[str] = None
     exp_threshold: int = 50
+    refresh_ahead: int = 30
     _access_token: Optional[str] = None
+    _access_token_exp: float = 0
+    _token_refresh: SingleFlight = field(default_factory=SingleFlight)
+    _token_background_refresh: Optional["asyncio.Future[None]"] = None
+    _http: Optional[httpx.AsyncClient] = None
+    _http_loop: Optional[asyncio.AbstractEventLoop] = None
+    _metadata: TTLCache[Tuple, Any] = field(
+        default_factory=lambda: TTLCache(
+            maxsize=1000, ttl=settings.KEYCLOAK_METADATA_CACHE_TTL
+        )
+    )
+    _metadata_loads: SingleFlight = field(default_factory=SingleFlight)
+
+    @staticmethod
+    def create_http_client() -> httpx.AsyncClient:
+        if settings.KEYCLOAK_HTTP2 and not HTTP2_AVAILABLE:
+            logger.warning("KEYCLOAK_HTTP2 is set, but h2 is not installed, HTTP/1.1 is used")
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.KEYCLOAK_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.KEYCLOAK_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.KEYCLOAK_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                settings.KEYCLOAK_HTTP_TIMEOUT,
+                connect=settings.KEYCLOAK_HTTP_CONNECT_TIMEOUT,
+            ),
+            http2=settings.KEYCLOAK_HTTP2 and HTTP2_AVAILABLE,
+        )
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """
+        Pooled keep-alive http client. Connections are bound to event loop,
+        client used from another loop must be closed with aclose() first
+        """
+        loop = asyncio.get_running_loop()
+        if self._http is not None and not self._http.is_closed and self._http_loop is not loop:
+            raise RuntimeError("Keycloak http client is bound to another event loop")
+        if self._http is None or self._http.is_closed:
+            self._http = self.create_http_client()
+            self._http_loop = loop
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+        self._http_loop = None
+
+    async def _get_metadata(self, key: Tuple, load: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get rarely changed keycloak data (clients, roles) from cache or load it
+
+        :param key: Cache key
+        :param load: Coroutine function that loads data on cache miss
+        :return: Cached or loaded data
+        """
+        if (value := self._metadata.get(key)) is not None:
+            return value
+
+        async def load_and_cache() -> Any:
+            value = await load()
+            self._metadata.set(key, value)
+            return value
+
+        return await self._metadata_loads.do(key, load_and_cache)
+
+    def invalidate_metadata(self) -> None:
+        self._metadata.clear()
 
     @staticmethod
     def get_token_auth_headers(token: str) -> Dict:
@@ -42,45 +121,66 @@ class KeycloakClient:
         self, client_id: str, token: Optional[str] = None
     ) -> Dict:
         token = token if token else await self.get_active_access_token()
-        client_k = await self.get_client(client_id, token=token)
         headers = self.get_token_auth_headers(token)
         url = schemas.KeycloakEndpoint.GET_INSTALLATION_CONFIG.value.format(
             url=self.url,
             realm=self.realm,
-            client_id=client_k["id"],
+            client_id=await self.get_client_uuid(client_id, token=token),
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await self.http.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
 
     async def set_access_token_and_return(self) -> str:
-        self._access_token = await self.get_token_by_secret()
-        return self._access_token
+        token = await self.get_token_by_secret()
+        self._access_token_exp = int(auth.decode_auth_token(token).get("exp", 0))
+        self._access_token = token
+        return token
+
+    async def refresh_access_token(self) -> str:
+        return await self._token_refresh.do(
+            "access_token", self.set_access_token_and_return
+        )
+
+    def refresh_access_token_in_background(self) -> None:
+        if self._token_refresh.in_flight("access_token"):
+            return
+
+        async def refresh() -> None:
+            try:
+                await self.refresh_access_token()
+            except Exception as e:
+                logger.error(f"Service token background refresh failed: {e}")
+
+        self._token_background_refresh = asyncio.ensure_future(refresh())
 
     async def get_active_access_token(self) -> str:
-        if not self._access_token:
-            return await self.set_access_token_and_return()
-        token_data = auth.decode_auth_token(self._access_token)
-        if (int(token_data.get("exp", 0)) - time.time()) < self.exp_threshold:
-            return await self.set_access_token_and_return()
+        """
+        Get service access token shared between requests. Token is refreshed in
+        background when it is about to expire (``exp_threshold + refresh_ahead``
+        seconds left) and synchronously when less than ``exp_threshold`` seconds left
+        """
+        expires_in = self._access_token_exp - time.time()
+        if not self._access_token or expires_in < self.exp_threshold:
+            return await self.refresh_access_token()
+        if expires_in < self.exp_threshold + self.refresh_ahead:
+            self.refresh_access_token_in_background()
         return self._access_token
 
     async def get_token_by_secret(self) -> str:
         if not self.client_secret:
             raise ValueError("Client secret not specified")
 
-        async with httpx.AsyncClient() as client:
-            headers = {"Content-Type": "application/x-www-form-urlencoded"}
-            data = {
-                "grant_type": "client_credentials",
-                "client_secret": self.client_secret,
-                "client_id": self.client_id,
-            }
-            url = self.get_url_for(KeycloakAuthEndpointKey.TOKEN)
-            response = await client.post(url, data=data, headers=headers)
-            response.raise_for_status()
-            return response.json().get("access_token")
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        data = {
+            "grant_type": "client_credentials",
+            "client_secret": self.client_secret,
+            "client_id": self.client_id,
+        }
+        url = self.get_url_for(KeycloakAuthEndpointKey.TOKEN)
+        response = await self.http.post(url, data=data, headers=headers)
+        response.raise_for_status()
+        return response.json().get("access_token")
 
     async def get_client(self, client_id: str, token: Optional[str] = None) -> Dict:
         token = token if token else await self.get_active_access_token()
@@ -90,13 +190,31 @@ class KeycloakClient:
             realm=self.realm,
         )
         params = {"clientId": client_id}
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            if len(data) < 1:
-                raise error.ItemNotFound(item=message.MODEL_AUTH_CLIENT)
-            return response.json()[0]
+        response = await self.http.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        data = response.json()
+        if len(data) < 1:
+            raise error.ItemNotFound(item=message.MODEL_AUTH_CLIENT)
+        return response.json()[0]
+
+    async def get_client_uuid(
+        self, client_id: Optional[str] = None, token: Optional[str] = None
+    ) -> str:
+        """
+        Get keycloak internal id (UUID) of client by its clientId (cached)
+
+        :param client_id: Client clientId, frontend client is used by default
+        :param token: Access token
+        :return: Client UUID
+        """
+        client: str = client_id or settings.KEYCLOAK_CLIENT_ID_FRONT
+        return await self._get_metadata(
+            ("client_uuid", client),
+            lambda: self._load_client_uuid(client_id=client, token=token),
+        )
+
+    async def _load_client_uuid(self, client_id: str, token: Optional[str]) -> str:
+        return (await self.get_client(client_id=client_id, token=token))["id"]
 
     async def get_clients(self, token: Optional[str] = None) -> List:
         token = token if token else await self.get_active_access_token()
@@ -105,12 +223,11 @@ class KeycloakClient:
             url=self.url,
             realm=self.realm,
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await self.http.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
 
-    async def verify_token(self, token: str) -> None:
+    async def verify_token(self, token: str) -> Dict:
         url = self.get_url_for(KeycloakAuthEndpointKey.INTROSPECT)
         data = {
             "grant_type": "client_credentials",
@@ -119,89 +236,194 @@ class KeycloakClient:
             "token": token,
         }
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, data=data)
-                response.raise_for_status()
+            response = await self.http.post(url, data=data)
+            response.raise_for_status()
+            token_data = response.json()
         except Exception:
             raise error.Unauthorized
+        if not token_data.get("active"):
+            raise error.Unauthorized
+        return token_data
 
     async def get_roles(self, token: Optional[str] = None) -> List:
+        client_id = await self.get_client_uuid(token=token)
+        return list(
+            await self._get_metadata(
+                ("roles", client_id),
+                lambda: self._load_roles(client_id=client_id, token=token),
+            )
+        )
+
+    async def _load_roles(self, client_id: str, token: Optional[str] = None) -> List:
         token = token if token else await self.get_active_access_token()
         headers = self.get_token_auth_headers(token)
-        client_id = (
-            await self.get_client(
-                client_id=settings.KEYCLOAK_CLIENT_ID_FRONT, token=token
-            )
-        )["id"]
         url = schemas.KeycloakEndpoint.GET_ROLES.value.format(
             url=self.url, realm=self.realm, client_id=client_id
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            if len(data) == 0:
-                data = []
-            return data
+        response = await self.http.get(url, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        if len(data) == 0:
+            data = []
+        return data
 
     async def get_role_with_users(
-        self, role_name: str, token: Optional[str] = None
+        self,
+        role_name: str,
+        token: Optional[str] = None,
+        first: Optional[int] = None,
+        max: Optional[int] = None,
     ) -> List:
         token = token if token else await self.get_active_access_token()
         headers = self.get_token_auth_headers(token)
-        client_id = (
-            await self.get_client(
-                client_id=settings.KEYCLOAK_CLIENT_ID_FRONT, token=token
-            )
-        )["id"]
+        client_id = await self.get_client_uuid(token=token)
         url = schemas.KeycloakEndpoint.GET_ROLE_USERS.value.format(
             url=self.url, realm=self.realm, client_id=client_id, role_name=role_name
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            if len(data) == 0:
-                data = []
-            return data
+        params = {
+            k: v for k, v in {"first": first, "max": max}.items() if v is not None
+        }
+        response = await self.http.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        data = response.json()
+        if len(data) == 0:
+            data = []
+        return data
 
-    async def get_users(self, token: Optional[str] = None) -> List:
+    async def get_users(
+        self,
+        token: Optional[str] = None,
+        first: Optional[int] = None,
+        max: Optional[int] = None,
+    ) -> List:
         token = token if token else await self.get_active_access_token()
         headers = self.get_token_auth_headers(token)
         url = schemas.KeycloakEndpoint.GET_USERS.value.format(
             url=self.url,
             realm=self.realm,
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            if len(data) == 0:
-                data = []
-            return data
+        params = {
+            k: v for k, v in {"first": first, "max": max}.items() if v is not None
+        }
+        response = await self.http.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        data = response.json()
+        if len(data) == 0:
+            data = []
+        return data
+
+    async def get_users_count(self, token: Optional[str] = None) -> int:
+        token = token if token else await self.get_active_access_token()
+        headers = self.get_token_auth_headers(token)
+        url = schemas.KeycloakEndpoint.GET_USERS_COUNT.value.format(
+            url=self.url,
+            realm=self.realm,
+        )
+        response = await self.http.get(url, headers=headers)
+        response.raise_for_status()
+        return int(response.json())
+
+    @staticmethod
+    async def iter_pages(
+        get_page: Callable[[int, int], Awaitable[List]],
+        page_size: int = 100,
+        prefetch: int = 1,
+    ) -> AsyncIterator[Dict]:
+        """
+        Walk over paged keycloak list (``first`` / ``max``) item by item.
+        Up to ``prefetch`` next pages are requested while current page is consumed.
+
+        :param get_page: Coroutine function returning page by (first, max)
+        :param page_size: Items amount requested at once
+        :param prefetch: Amount of pages requested ahead
+        """
+        pages: Deque["asyncio.Future[List]"] = deque()
+        first = 0
+
+        def request_page() -> None:
+            nonlocal first
+            pages.append(asyncio.ensure_future(get_page(first, page_size)))
+            first += page_size
+
+        try:
+            for _ in range(prefetch + 1):
+                request_page()
+            while pages:
+                page = await pages.popleft()
+                for item in page:
+                    yield item
+                if len(page) < page_size:
+                    return
+                request_page()
+        finally:
+            for it in pages:
+                it.cancel()
+
+    def iter_users(
+        self, token: Optional[str] = None, page_size: int = 100, prefetch: int = 1
+    ) -> AsyncIterator[Dict]:
+        return self.iter_pages(
+            lambda first, max: self.get_users(token=token, first=first, max=max),
+            page_size=page_size,
+            prefetch=prefetch,
+        )
+
+    async def get_users_all(
+        self, token: Optional[str] = None, page_size: int = 500
+    ) -> List:
+        token = token if token else await self.get_active_access_token()
+        return [it async for it in self.iter_users(token=token, page_size=page_size)]
+
+    async def set_users_roles(
+        self, users: List[Dict], token: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Set "roles" (frontend client roles) of every user, roles are requested
+        with at most KEYCLOAK_REQUEST_CONCURRENCY parallel requests
+        """
+        token = token if token else await self.get_active_access_token()
+        client_id = await self.get_client_uuid(token=token)
+        semaphore = asyncio.Semaphore(settings.KEYCLOAK_REQUEST_CONCURRENCY)
+
+        async def get_roles(user: Dict) -> List[Dict]:
+            async with semaphore:
+                return await self.get_user_roles(
+                    user_id=user["id"], client_id=client_id, token=token
+                )
+
+        for user, roles in zip(
+            users, await asyncio.gather(*(get_roles(it) for it in users))
+        ):
+            user["roles"] = roles
+        return users
 
     async def get_role_by_name(
         self, role_name: str, token: Union[str, None] = None
+    ) -> Dict:
+        client_id = await self.get_client_uuid(token=token)
+        return await self._get_metadata(
+            ("role", client_id, role_name),
+            lambda: self._load_role_by_name(
+                client_id=client_id, role_name=role_name, token=token
+            ),
+        )
+
+    async def _load_role_by_name(
+        self, client_id: str, role_name: str, token: Union[str, None] = None
     ) -> Dict:
         token = token if token else await self.get_active_access_token()
         headers = self.get_token_auth_headers(token)
-        client_id = (
-            await self.get_client(
-                client_id=settings.KEYCLOAK_CLIENT_ID_FRONT, token=token
-            )
-        )["id"]
         url = schemas.KeycloakEndpoint.GET_ROLE.value.format(
             url=self.url,
             realm=self.realm,
             client_id=client_id,
             role_name=role_name,
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            if response.status_code == status.HTTP_404_NOT_FOUND:
-                raise error.ItemNotFound(item=f"{message.MODEL_ROLE} {role_name}")
-            response.raise_for_status()
-            return response.json()
+        response = await self.http.get(url, headers=headers)
+        if response.status_code == status.HTTP_404_NOT_FOUND:
+            raise error.ItemNotFound(item=f"{message.MODEL_ROLE} {role_name}")
+        response.raise_for_status()
+        return response.json()
 
     async def add_user_roles(
         self,
@@ -211,11 +433,7 @@ class KeycloakClient:
     ) -> None:
         token = token if token else await self.get_active_access_token()
         headers = self.get_token_auth_headers(token)
-        client_id = (
-            await self.get_client(
-                client_id=settings.KEYCLOAK_CLIENT_ID_FRONT, token=token
-            )
-        )["id"]
+        client_id = await self.get_client_uuid(token=token)
         url = schemas.KeycloakEndpoint.USER_ROLES.value.format(
             url=self.url,
             realm=self.realm,
@@ -223,20 +441,19 @@ class KeycloakClient:
             client_id=client_id,
         )
         roles = roles if isinstance(roles, list) else [roles]
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=roles)
-            response.raise_for_status()
+        response = await self.http.post(url, headers=headers, json=roles)
+        response.raise_for_status()
+        # avoid import cycle: user directory is built on keycloak client
+        from app.core import user_directory
+
+        user_directory.get_user_directory().add_roles(user_id, roles)
 
     async def clear_user_roles(
         self, user_id: str, token: Union[str, None] = None
     ) -> None:
         token = token if token else await self.get_active_access_token()
         headers = self.get_token_auth_headers(token)
-        client_id = (
-            await self.get_client(
-                client_id=settings.KEYCLOAK_CLIENT_ID_FRONT, token=token
-            )
-        )["id"]
+        client_id = await self.get_client_uuid(token=token)
         url = schemas.KeycloakEndpoint.USER_ROLES.value.format(
             url=self.url,
             realm=self.realm,
@@ -246,9 +463,11 @@ class KeycloakClient:
         roles = await self.get_user_roles(
             user_id=user_id, client_id=client_id, token=token
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.request("delete", url, headers=headers, json=roles)
-            response.raise_for_status()
+        response = await self.http.request("delete", url, headers=headers, json=roles)
+        response.raise_for_status()
+        from app.core import user_directory
+
+        user_directory.get_user_directory().clear_roles(user_id)
 
     async def get_user_by_username(
         self, username: str, token: Union[str, None] = None
@@ -259,17 +478,23 @@ class KeycloakClient:
             url=self.url,
             realm=self.realm,
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url, headers=headers, params={"username": username, "exact": True}
-            )
-            response.raise_for_status()
-            data = response.json()
-            if len(data) == 0:
-                raise error.ItemNotFound(item=message.MODEL_USER)
-            return data[0]
+        response = await self.http.get(
+            url, headers=headers, params={"username": username, "exact": True}
+        )
+        response.raise_for_status()
+        data = response.json()
+        if len(data) == 0:
+            raise error.ItemNotFound(item=message.MODEL_USER)
+        return data[0]
 
-    async def create_user(self, user: dict, token: Union[str, None] = None) -> None:
+    async def create_user(
+        self, user: dict, token: Union[str, None] = None
+    ) -> Optional[str]:
+        """
+        Create enabled user with password
+
+        :return: Id of created user (from Location header) if keycloak returned it
+        """
         token = token if token else await self.get_active_access_token()
         headers = self.get_token_auth_headers(token)
         url = schemas.KeycloakEndpoint.CREATE_USER.value.format(
@@ -281,33 +506,69 @@ class KeycloakClient:
             "enabled": True,
             "credentials": [{"type": "password", "value": user["password"]}],
         }
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=data)
-            response.raise_for_status()
+        response = await self.http.post(url, headers=headers, json=data)
+        response.raise_for_status()
+        location = response.headers.get("Location")
+        return location.rstrip("/").rsplit("/", 1)[-1] if location else None
 
-    async def get_users_with_roles(self, token: Optional[str] = None) -> List:
+    async def get_role_users_all(
+        self,
+        role_name: str,
+        client_id: Optional[str] = None,
+        token: Optional[str] = None,
+        page_size: int = 500,
+    ) -> List:
+        """
+        Get all users with client role, page by page (keycloak returns 100 users by default)
+
+        :param role_name: Client role name
+        :param client_id: Client UUID, frontend client is used by default
+        :param token: Access token
+        :param page_size: Users amount requested at once
+        :return: List of users
+        """
         token = token if token else await self.get_active_access_token()
         headers = self.get_token_auth_headers(token)
-        url = schemas.KeycloakEndpoint.GET_USERS.value.format(
-            url=self.url,
-            realm=self.realm,
+        client_id = client_id or await self.get_client_uuid(token=token)
+        url = schemas.KeycloakEndpoint.GET_ROLE_USERS.value.format(
+            url=self.url, realm=self.realm, client_id=client_id, role_name=role_name
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
+
+        async def get_page(first: int, max: int) -> List:
+            params = {"first": first, "max": max}
+            response = await self.http.get(url, headers=headers, params=params)
             response.raise_for_status()
-            data = response.json()
-            if len(data) == 0:
-                data = []
-            client_id = (
-                await self.get_client(
-                    client_id=settings.KEYCLOAK_CLIENT_ID_FRONT, token=token
-                )
-            )["id"]
-            for d in data:
-                d["roles"] = await self.get_user_roles(
-                    client_id=client_id, token=token, user_id=d["id"]
+            return response.json()
+
+        return [it async for it in self.iter_pages(get_page, page_size=page_size)]
+
+    async def get_users_with_roles(self, token: Optional[str] = None) -> List:
+        """
+        Get users with their frontend client roles.
+        Members of every client role are requested (with bounded concurrency)
+        and grouped by user, so requests amount depends on roles amount, not users amount.
+        """
+        token = token if token else await self.get_active_access_token()
+        client_id = await self.get_client_uuid(token=token)
+        roles = await self.get_roles(token=token)
+        semaphore = asyncio.Semaphore(settings.KEYCLOAK_REQUEST_CONCURRENCY)
+
+        async def get_members(role: Dict) -> List:
+            async with semaphore:
+                return await self.get_role_users_all(
+                    role_name=role["name"], client_id=client_id, token=token
                 )
-            return data
+
+        users, *members = await asyncio.gather(
+            self.get_users_all(token=token), *(get_members(role) for role in roles)
+        )
+        user_roles: Dict[str, List] = {}
+        for role, role_users in zip(roles, members):
+            for role_user in role_users:
+                user_roles.setdefault(role_user["id"], []).append(role)
+        for user in users:
+            user["roles"] = user_roles.get(user["id"], [])
+        return users
 
     async def get_user_by_id(self, user_id: str, token: Optional[str] = None) -> Dict:
         token = token if token else await self.get_active_access_token()
@@ -317,17 +578,17 @@ class KeycloakClient:
             realm=self.realm,
             user_id=user_id,
         )
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                return response.json()
-        except Exception:
+        response = await self.http.get(url, headers=headers)
+        # only 404 means missing user, keycloak that is down, misbehaves or rejects
+        # service token (401, 403, 429) is not a reason to consider user missing
+        if response.status_code == httpx.codes.NOT_FOUND:
             raise error.ItemNotFound(item=message.MODEL_USER)
+        response.raise_for_status()
+        return response.json()
 
     async def get_user_roles(
         self, user_id: str, client_id: str, token: Optional[str] = None
-    ) -> Dict:
+    ) -> List[Dict]:
         token = token if token else await self.get_active_access_token()
         headers = self.get_token_auth_headers(token)
         url = schemas.KeycloakEndpoint.GET_USER_ROLES.value.format(
@@ -336,16 +597,31 @@ class KeycloakClient:
             user_id=user_id,
             client_id=client_id,
         )
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
+        response = await self.http.get(url, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+
+_service_client: Optional[KeycloakClient] = None
 
 
 def get_service_client() -> KeycloakClient:
-    return KeycloakClient(
-        url=settings.KEYCLOAK_URL,
-        realm=settings.KEYCLOAK_REALM,
-        client_id=settings.KEYCLOAK_CLIENT_ID_SERIVCE,
-        client_secret=settings.KEYCLOAK_CLIENT_SECRET_SERIVCE,
-    )
+    """
+    Get process-wide service client (one per worker) with shared token and connection pool
+    """
+    global _service_client
+    if _service_client is None:
+        _service_client = KeycloakClient(
+            url=settings.KEYCLOAK_URL,
+            realm=settings.KEYCLOAK_REALM,
+            client_id=settings.KEYCLOAK_CLIENT_ID_SERIVCE,
+            client_secret=settings.KEYCLOAK_CLIENT_SECRET_SERIVCE,
+        )
+    return _service_client
+
+
+async def close_service_client() -> None:
+    global _service_client
+    if _service_client is not None:
+        await _service_client.aclose()
+        _service_client = None
@@ -19,10 +19,15 @@ ERROR_INCORRECT_SORTING_WITH_AVAILABLE = (
     "Поле сортировки '{fields}' не поддерживается. "
     "Поддерживаемые форматы - '{available}'"
 )
+ERROR_INCORRECT_CURSOR = "Курсор пагинации '{cursor}' некорректен или устарел"
+ERROR_INCORRECT_FIELDS = (
+    "Поля '{fields}' не поддерживаются. Поддерживаемые поля - '{available}'"
+)
 ERROR_ACTION_FORBIDDEN = "Недостаточно прав"
 ERROR_NOT_AUTHORIZED = "Пользователь не прошел аутентификацию"
 ERROR_NO_PARENT_ORDER = "Заполните родительский заказ"
 ERROR_ORDER_WITH_TYPE_EXISTS = "Заявка с таким типом уже была создана"
+ERROR_UNSUPPORTED_OPERATION = "Операция '{operation}' не поддерживается базой данных '{dialect}'"
 
 """
 MODELS
@@ -0,0 +1,186 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from app.core import error, keycloak, message
+from app.log import logger
+from app.settings import settings
+from app.util.cache import SingleFlight, TTLCache
+
+
+@dataclass
+class UserDirectory:
+    """
+    Local (per worker) mirror of keycloak users with their frontend client roles
+
+    Mirror is filled only by ``full_resync`` and kept fresh with ``refresh`` that
+    re-reads one page of users (``first`` / ``max``) per call, walking over all users
+    in turn. Users missing in the mirror are requested from keycloak, results of these
+    lookups (including not found users) are kept apart from the mirror in bounded caches
+    for USER_LOOKUP_CACHE_TTL seconds, so repeated validation of the same ids does not
+    hit keycloak.
+
+    Roles changed with KeycloakClient of this worker are applied to the mirror at once.
+    Other changes in keycloak are seen after the next refresh of the user page, but users
+    deleted in keycloak are dropped only by full resync, so they stay valid for at most
+    USER_DIRECTORY_RESYNC_INTERVAL seconds.
+    """
+
+    page_size: int = 100
+    _users: Dict[str, Dict] = field(default_factory=dict)
+    _synced_at: Optional[float] = None
+    _refresh_first: int = 0
+    _sync: SingleFlight = field(default_factory=SingleFlight)
+    _found: TTLCache[str, Dict] = field(
+        default_factory=lambda: TTLCache(
+            maxsize=10000, ttl=settings.USER_LOOKUP_CACHE_TTL
+        )
+    )
+    _missing: TTLCache[str, bool] = field(
+        default_factory=lambda: TTLCache(
+            maxsize=10000, ttl=settings.USER_LOOKUP_CACHE_TTL
+        )
+    )
+
+    @property
+    def is_synced(self) -> bool:
+        return self._synced_at is not None
+
+    @property
+    def synced_ago(self) -> Optional[float]:
+        if self._synced_at is None:
+            return None
+        return time.monotonic() - self._synced_at
+
+    async def _full_resync(self) -> None:
+        started = time.monotonic()
+        users = await keycloak.get_service_client().get_users_with_roles()
+        self._users = {it["id"]: it for it in users}
+        self._missing.clear()
+        self._synced_at = time.monotonic()
+        self._refresh_first = 0
+        logger.info(
+            f"User directory synced: {len(users)} users in {self._synced_at - started:.2f}s"
+        )
+
+    async def full_resync(self) -> None:
+        await self._sync.do("full_resync", self._full_resync)
+
+    async def refresh(
+        self, first: Optional[int] = None, max: Optional[int] = None
+    ) -> None:
+        """
+        Re-read one page of users and their roles
+
+        :param first: Page offset, next page after previous refresh by default
+        :param max: Page size
+        """
+        kc = keycloak.get_service_client()
+        first = self._refresh_first if first is None else first
+        max = max or self.page_size
+        users = await kc.set_users_roles(await kc.get_users(first=first, max=max))
+        for user in users:
+            self._users[user["id"]] = user
+            self._missing.pop(user["id"])
+        self._refresh_first = first + max if len(users) == max else 0
+
+    def _get_cached(self, user_id: str) -> List[Dict]:
+        return [
+            it
+            for it in (self._users.get(user_id), self._found.get(user_id))
+            if it is not None
+        ]
+
+    def add_roles(self, user_id: str, roles: List[Dict]) -> None:
+        """
+        Apply roles added to user in keycloak
+
+        :param user_id: Keycloak user id
+        :param roles: Added role representations
+        """
+        for user in self._get_cached(user_id):
+            names = {it["name"] for it in user["roles"]}
+            user["roles"] = user["roles"] + [it for it in roles if it["name"] not in names]
+
+    def clear_roles(self, user_id: str) -> None:
+        """
+        Apply removal of all roles of user in keycloak
+
+        :param user_id: Keycloak user id
+        """
+        for user in self._get_cached(user_id):
+            user["roles"] = []
+
+    async def get_user(self, user_id: str) -> Dict:
+        """
+        Get user with roles from mirror, falls back to keycloak on miss
+
+        :param user_id: Keycloak user id
+        :return: User representation with "roles"
+        """
+        if user := self._users.get(user_id) or self._found.get(user_id):
+            return user
+        if self._missing.get(user_id):
+            raise error.ItemNotFound(item=message.MODEL_USER)
+        return await self._sync.do(("user", user_id), lambda: self._load_user(user_id))
+
+    async def get_users_by_ids(self, user_ids: Iterable[Optional[str]]) -> List[Dict]:
+        """
+        Get several users concurrently, every distinct id is looked up once
+
+        :param user_ids: Keycloak user ids, None values are skipped
+        :return: Users in order of first occurrence of their ids
+        """
+        unique_ids = list(dict.fromkeys(it for it in user_ids if it is not None))
+        return list(await asyncio.gather(*(self.get_user(it) for it in unique_ids)))
+
+    async def _load_user(self, user_id: str) -> Dict:
+        kc = keycloak.get_service_client()
+        try:
+            user = await kc.get_user_by_id(user_id)
+        except error.ItemNotFound:
+            self._missing.set(user_id, True)
+            raise
+        user["roles"] = await kc.get_user_roles(
+            user_id=user_id, client_id=await kc.get_client_uuid()
+        )
+        self._found.set(user_id, user)
+        return user
+
+    def get_users(self, role_name: Optional[str] = None) -> List[Dict]:
+        users = list(self._users.values())
+        if role_name is None:
+            return users
+        return [
+            it for it in users if role_name in [role["name"] for role in it["roles"]]
+        ]
+
+
+_user_directory: Optional[UserDirectory] = None
+
+
+def get_user_directory() -> UserDirectory:
+    global _user_directory
+    if _user_directory is None:
+        _user_directory = UserDirectory(page_size=settings.USER_DIRECTORY_PAGE_SIZE)
+    return _user_directory
+
+
+async def sync_job() -> None:
+    """
+    Full resync on start and every USER_DIRECTORY_RESYNC_INTERVAL seconds,
+    incremental refresh of the next users page otherwise
+    """
+    if not settings.USER_DIRECTORY_ENABLED:
+        return
+    directory = get_user_directory()
+    try:
+        if directory.synced_ago is None or (
+            directory.synced_ago > settings.USER_DIRECTORY_RESYNC_INTERVAL
+        ):
+            await directory.full_resync()
+        else:
+            await directory.refresh()
+    except Exception as e:
+        logger.error(f"User directory sync failed: {e}")
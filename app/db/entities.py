@@ -1,12 +1,29 @@
-import uuid
-from typing import List
+from typing import List, Optional
 
 import sqlalchemy as sa
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
+from app.schemas.order import OrderStatus
+from app.util.ids import gen_id
+
 from .base_class import Base
 
+# native uuid in database, str in python
+Id = sa.Uuid(as_uuid=False)
+
+
+def order_status_type() -> sa.Enum:
+    """
+    Native enum in database, OrderStatus (str) in python.
+    Type is made by call, so mypy plugin infers python type of column from it
+    """
+    return sa.Enum(
+        OrderStatus,
+        name="order_status",
+        values_callable=lambda statuses: [it.value for it in statuses],
+    )
+
 
 class TimeStamped(Base):
     __abstract__ = True
@@ -23,8 +40,12 @@ class TimeStamped(Base):
 
 class TimeStampedWithId(TimeStamped):
     __abstract__ = True
-    id = sa.Column(
-        sa.String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4())
+    id: Mapped[str] = mapped_column(
+        Id,
+        primary_key=True,
+        index=True,
+        default=gen_id,
+        server_default=func.gen_random_uuid(),
     )
 
 
@@ -38,7 +59,6 @@ class OrderType(TimeStampedWithId):
         "OrderTypeParam",
         back_populates="order_type",
         uselist=True,
-        lazy="joined",
     )
 
 
@@ -53,8 +73,8 @@ class OrderTypeParam(TimeStampedWithId):
     order_type: Mapped[OrderType] = relationship(
         "OrderType", cascade="all,delete", back_populates="params"
     )
-    order_type_id = sa.Column(
-        sa.String(50), sa.ForeignKey("order_type.id"), nullable=False
+    order_type_id: Mapped[str] = sa.Column(
+        Id, sa.ForeignKey("order_type.id"), nullable=False, index=True
     )
 
 
@@ -68,35 +88,58 @@ OrderTypeParamSortingFields = {
 
 
 class Order(TimeStampedWithId):
-    status = sa.Column(sa.String(100))
-    user_customer = sa.Column(sa.String(100))
-    user_implementer = sa.Column(sa.String(100))
-    order_type: Mapped[OrderType] = relationship(
-        "OrderType", cascade="all,delete", lazy="joined"
-    )
-    order_type_id = sa.Column(
-        sa.String(50), sa.ForeignKey("order_type.id"), nullable=False
+    status: Mapped[OrderStatus] = sa.Column(order_status_type())
+    # created_at of the last status update (order creation if there is none)
+    status_changed_at = sa.Column(
+        sa.DateTime(timezone=True), default=func.now(), server_default=func.now()
     )
+    user_customer = sa.Column(sa.String(100))
+    user_implementer = sa.Column(sa.String(100), index=True)
+    order_type: Mapped[OrderType] = relationship("OrderType", cascade="all,delete")
+    order_type_id: Mapped[str] = sa.Column(Id, sa.ForeignKey("order_type.id"), nullable=False)
+    # many-to-one to parent order (not one-to-many to children of self-reference)
     parent_order: Mapped["Order"] = relationship(
-        "Order", cascade="all,delete", lazy="joined"
+        "Order", cascade="all,delete", remote_side="Order.id"
+    )
+    parent_order_id: Mapped[Optional[str]] = sa.Column(
+        Id, sa.ForeignKey("order.id"), nullable=True, index=True
     )
-    parent_order_id = sa.Column(sa.String(50), sa.ForeignKey("order.id"), nullable=True)
     params: Mapped[List["OrderParamValue"]] = relationship(
         "OrderParamValue",
         back_populates="order",
         uselist=True,
-        lazy="joined",
     )
     history: Mapped[List["OrderStatusUpdate"]] = relationship(
         "OrderStatusUpdate",
         back_populates="order",
         uselist=True,
-        lazy="joined",
         order_by="OrderStatusUpdate.created_at",
     )
 
 
-OrderSortingFields = {*DefaultSortingFields, "status", "order_type_id", "dep_type"}
+# user_customer, order_type_id and status filters are served by leading columns
+# of composite indexes, pages are sorted by created_at
+sa.Index(
+    "ix_order_user_customer_created_at",
+    Order.user_customer,
+    Order.created_at.desc(),
+)
+sa.Index(
+    "ix_order_order_type_id_status_created_at",
+    Order.order_type_id,
+    Order.status,
+    Order.created_at.desc(),
+)
+# orders in status for longer than some time
+sa.Index("ix_order_status_status_changed_at", Order.status, Order.status_changed_at)
+
+OrderSortingFields = {
+    *DefaultSortingFields,
+    "status",
+    "status_changed_at",
+    "order_type_id",
+    "dep_type",
+}
 
 
 class OrderParamValue(TimeStampedWithId):
@@ -105,13 +148,13 @@ class OrderParamValue(TimeStampedWithId):
     order_type_param: Mapped[OrderTypeParam] = relationship(
         "OrderTypeParam", cascade="all,delete"
     )
-    order_type_param_id = sa.Column(
-        sa.String(50), sa.ForeignKey("order_type_param.id"), nullable=False
+    order_type_param_id: Mapped[str] = sa.Column(
+        Id, sa.ForeignKey("order_type_param.id"), nullable=False, index=True
     )
     order: Mapped[Order] = relationship(
         "Order", cascade="all,delete", back_populates="params"
     )
-    order_id = sa.Column(sa.String(50), sa.ForeignKey("order.id"), nullable=False)
+    order_id: Mapped[str] = sa.Column(Id, sa.ForeignKey("order.id"), nullable=False, index=True)
 
 
 OrderParamValueSortingFields = {
@@ -126,7 +169,7 @@ class OrderConfirmation(TimeStampedWithId):
     user = sa.Column(sa.String(100))
     signed = sa.Column(sa.Boolean)
     order: Mapped[Order] = relationship("Order", cascade="all,delete")
-    order_id = sa.Column(sa.String(50), sa.ForeignKey("order.id"), nullable=False)
+    order_id: Mapped[str] = sa.Column(Id, sa.ForeignKey("order.id"), nullable=False, index=True)
 
 
 OrderConfirmationSortingFields = {*DefaultSortingFields, "signed", "order_id"}
@@ -134,11 +177,18 @@ OrderConfirmationSortingFields = {*DefaultSortingFields, "signed", "order_id"}
 
 class OrderStatusUpdate(TimeStampedWithId):
     user = sa.Column(sa.String(100))
-    old_status = sa.Column(sa.String(100))
-    new_status = sa.Column(sa.String(100))
+    old_status: Mapped[OrderStatus] = sa.Column(order_status_type())
+    new_status: Mapped[OrderStatus] = sa.Column(order_status_type())
     order: Mapped[Order] = relationship("Order", cascade="all,delete")
-    order_id = sa.Column(sa.String(50), sa.ForeignKey("order.id"), nullable=False)
+    order_id: Mapped[str] = sa.Column(Id, sa.ForeignKey("order.id"), nullable=False)
+
 
+# history of orders is loaded ordered by created_at
+sa.Index(
+    "ix_order_status_update_order_id_created_at",
+    OrderStatusUpdate.order_id,
+    OrderStatusUpdate.created_at,
+)
 
 OrderStatusUpdateSortingFields = {*DefaultSortingFields, "order_id"}
 
@@ -151,7 +201,7 @@ class Material(TimeStampedWithId):
     user_creator = sa.Column(sa.String(100))
     user_updator = sa.Column(sa.String(100))
     order: Mapped[Order] = relationship("Order", cascade="all,delete")
-    order_id = sa.Column(sa.String(50), sa.ForeignKey("order.id"), nullable=False)
+    order_id: Mapped[str] = sa.Column(Id, sa.ForeignKey("order.id"), nullable=False, index=True)
 
 
 MaterialSortingFields = {*DefaultSortingFields, "order_id", "amount", "item_type", "item_price", "full_price"}
@@ -9,7 +9,7 @@ from fastapi.responses import JSONResponse
 
 from app import schemas, services
 from app.api.api import router as api_router
-from app.core import error
+from app.core import error, keycloak, user_directory
 from app.db.session import wrap_session
 from app.log import logger
 from app.settings import settings
@@ -67,6 +67,8 @@ async def internal_server_error_handler(
 @app.exception_handler(ValueError)
 @app.exception_handler(error.IncorrectDataFormat)
 @app.exception_handler(error.IncorrectSorting)
+@app.exception_handler(error.IncorrectCursor)
+@app.exception_handler(error.IncorrectFields)
 @app.exception_handler(error.EntityEntryAlreadyExists)
 async def client_exception_handler(
     req: Request, exc: Exception
@@ -117,31 +119,44 @@ async def test_job() -> None:
         timeout = timedelta(0, 60)  # one minute
         order_service = services.OrderService(session)
         order_status_service = services.OrderStatusUpdateService(session)
-        orders_to_remove = await order_service.read_many(
-            status=schemas.OrderStatus.TO_REMOVE
+        order_ids = await order_service.read_ids_in_status(
+            status=schemas.OrderStatus.TO_REMOVE,
+            changed_before=datetime.now(pytz.UTC) - timeout,
         )
-        for order in orders_to_remove:
-            if order.history[-1].created_at + timeout < datetime.now(pytz.UTC):
-                await order_status_service.create(
-                    user=schemas.User(name="SYSTEM", user_id="SYSTEM", roles=[]),
-                    new_order_status=schemas.OrderStatus.REMOVED,
-                    old_order_status=schemas.OrderStatus(order.status),
-                    order_id=str(order.id),
-                )
-                await order_service.update(
-                    id=str(order.id),
-                    **jsonable_encoder(
-                        schemas.OrderUpdate(status=schemas.OrderStatus.REMOVED),
-                        exclude_none=True,
-                    ),
-                )
-                logger.info(f"Cleared order {order.id}")
+        for order_id in order_ids:
+            await order_status_service.create(
+                user=schemas.User(name="SYSTEM", user_id="SYSTEM", roles=[]),
+                new_order_status=schemas.OrderStatus.REMOVED,
+                old_order_status=schemas.OrderStatus.TO_REMOVE,
+                order_id=order_id,
+            )
+            await order_service.update(
+                id=order_id,
+                **jsonable_encoder(
+                    schemas.OrderUpdate(status=schemas.OrderStatus.REMOVED),
+                    exclude_none=True,
+                ),
+            )
+            logger.info(f"Cleared order {order_id}")
         await session.commit()
     logger.info("Job ended")
 
 
+@app.on_event("startup")
+async def startup_keycloak_client() -> None:
+    await keycloak.get_service_client().get_active_access_token()
+
+
+@app.on_event("shutdown")
+async def shutdown_keycloak_client() -> None:
+    await keycloak.close_service_client()
+
+
 @app.on_event("startup")
 async def startup_event() -> None:
+    from datetime import datetime
+
+    import pytz
     from apscheduler.schedulers.asyncio import AsyncIOScheduler
     from apscheduler.triggers.cron import CronTrigger
 
@@ -151,4 +166,10 @@ async def startup_event() -> None:
     ]:
         await job()
         scheduler.add_job(job, CronTrigger.from_crontab(interval))
+    # first sync runs in background, users are requested from keycloak until it ends
+    scheduler.add_job(
+        user_directory.sync_job,
+        CronTrigger.from_crontab("* * * * *"),
+        next_run_time=datetime.now(pytz.UTC),
+    )
     scheduler.start()
@@ -0,0 +1,93 @@
+"""add foreign key and filter indexes
+
+Revision ID: 3031e066f6b8
+Revises: 6cc41a6505a6
+Create Date: 2026-10-18 13:45:02.417153
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3031e066f6b8"
+down_revision = "6cc41a6505a6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f("ix_order_status"), "order", ["status"], unique=False)
+    op.create_index(
+        op.f("ix_order_user_implementer"), "order", ["user_implementer"], unique=False
+    )
+    op.create_index(
+        op.f("ix_order_parent_order_id"), "order", ["parent_order_id"], unique=False
+    )
+    op.create_index(
+        "ix_order_user_customer_created_at",
+        "order",
+        ["user_customer", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_order_order_type_id_status_created_at",
+        "order",
+        ["order_type_id", "status", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_order_type_param_order_type_id"),
+        "order_type_param",
+        ["order_type_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_order_param_value_order_id"),
+        "order_param_value",
+        ["order_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_order_param_value_order_type_param_id"),
+        "order_param_value",
+        ["order_type_param_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_order_status_update_order_id_created_at",
+        "order_status_update",
+        ["order_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_order_confirmation_order_id"),
+        "order_confirmation",
+        ["order_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_material_order_id"), "material", ["order_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_material_order_id"), table_name="material")
+    op.drop_index(
+        op.f("ix_order_confirmation_order_id"), table_name="order_confirmation"
+    )
+    op.drop_index(
+        "ix_order_status_update_order_id_created_at", table_name="order_status_update"
+    )
+    op.drop_index(
+        op.f("ix_order_param_value_order_type_param_id"),
+        table_name="order_param_value",
+    )
+    op.drop_index(op.f("ix_order_param_value_order_id"), table_name="order_param_value")
+    op.drop_index(
+        op.f("ix_order_type_param_order_type_id"), table_name="order_type_param"
+    )
+    op.drop_index("ix_order_order_type_id_status_created_at", table_name="order")
+    op.drop_index("ix_order_user_customer_created_at", table_name="order")
+    op.drop_index(op.f("ix_order_parent_order_id"), table_name="order")
+    op.drop_index(op.f("ix_order_user_implementer"), table_name="order")
+    op.drop_index(op.f("ix_order_status"), table_name="order")
@@ -0,0 +1,56 @@
+"""order status enum
+
+Revision ID: 6f6d09e17c0d
+Revises: 7f845709902f
+Create Date: 2026-10-18 14:41:12.530871
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "6f6d09e17c0d"
+down_revision = "7f845709902f"
+branch_labels = None
+depends_on = None
+
+order_status = postgresql.ENUM(
+    "NEW",
+    "READY",
+    "IN PROGRESS",
+    "DONE",
+    "ACCEPTED",
+    "TO REMOVE",
+    "REMOVED",
+    name="order_status",
+)
+STATUS_COLUMNS = [
+    ("order", "status"),
+    ("order_status_update", "old_status"),
+    ("order_status_update", "new_status"),
+]
+
+
+def upgrade() -> None:
+    order_status.create(op.get_bind())
+    for table, column in STATUS_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.String(length=100),
+            type_=order_status,
+            postgresql_using=f"{column}::order_status",
+        )
+
+
+def downgrade() -> None:
+    for table, column in STATUS_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=order_status,
+            type_=sa.String(length=100),
+            postgresql_using=f"{column}::varchar",
+        )
+    order_status.drop(op.get_bind())
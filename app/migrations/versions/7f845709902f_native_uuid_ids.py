@@ -0,0 +1,98 @@
+"""native uuid ids
+
+Revision ID: 7f845709902f
+Revises: 3031e066f6b8
+Create Date: 2026-10-18 14:10:37.815204
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "7f845709902f"
+down_revision = "3031e066f6b8"
+branch_labels = None
+depends_on = None
+
+TABLES = [
+    "order_type",
+    "order_type_param",
+    "order",
+    "order_param_value",
+    "order_confirmation",
+    "order_status_update",
+    "material",
+]
+# table, column, referred table
+FOREIGN_KEYS = [
+    ("order_type_param", "order_type_id", "order_type"),
+    ("order", "order_type_id", "order_type"),
+    ("order", "parent_order_id", "order"),
+    ("order_param_value", "order_type_param_id", "order_type_param"),
+    ("order_param_value", "order_id", "order"),
+    ("order_confirmation", "order_id", "order"),
+    ("order_status_update", "order_id", "order"),
+    ("material", "order_id", "order"),
+]
+
+
+def get_fk_name(table: str, column: str) -> str:
+    # default postgres name of constraints created without name
+    return f"{table}_{column}_fkey"
+
+
+def drop_foreign_keys() -> None:
+    for table, column, _ in FOREIGN_KEYS:
+        op.drop_constraint(get_fk_name(table, column), table, type_="foreignkey")
+
+
+def create_foreign_keys() -> None:
+    for table, column, referred in FOREIGN_KEYS:
+        op.create_foreign_key(
+            get_fk_name(table, column), table, referred, [column], ["id"]
+        )
+
+
+def upgrade() -> None:
+    drop_foreign_keys()
+    for table in TABLES:
+        op.alter_column(
+            table,
+            "id",
+            existing_type=sa.String(length=36),
+            type_=postgresql.UUID(as_uuid=False),
+            postgresql_using="id::uuid",
+            server_default=sa.text("gen_random_uuid()"),
+        )
+    for table, column, _ in FOREIGN_KEYS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.String(length=50),
+            type_=postgresql.UUID(as_uuid=False),
+            postgresql_using=f"{column}::uuid",
+        )
+    create_foreign_keys()
+
+
+def downgrade() -> None:
+    drop_foreign_keys()
+    for table, column, _ in FOREIGN_KEYS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=postgresql.UUID(as_uuid=False),
+            type_=sa.String(length=50),
+            postgresql_using=f"{column}::varchar",
+        )
+    for table in TABLES:
+        op.alter_column(
+            table,
+            "id",
+            existing_type=postgresql.UUID(as_uuid=False),
+            type_=sa.String(length=36),
+            postgresql_using="id::varchar",
+            server_default=None,
+        )
+    create_foreign_keys()
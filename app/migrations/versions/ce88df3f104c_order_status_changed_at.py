@@ -0,0 +1,54 @@
+"""order status changed at
+
+Revision ID: ce88df3f104c
+Revises: 6f6d09e17c0d
+Create Date: 2026-10-18 15:02:48.116530
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "ce88df3f104c"
+down_revision = "6f6d09e17c0d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "order",
+        sa.Column(
+            "status_changed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+    )
+    # time of the last status update, creation time for orders without updates
+    op.execute(
+        """
+        UPDATE "order"
+        SET status_changed_at = coalesce(
+            (
+                SELECT max(order_status_update.created_at)
+                FROM order_status_update
+                WHERE order_status_update.order_id = "order".id
+            ),
+            "order".created_at
+        )
+        """
+    )
+    op.create_index(
+        "ix_order_status_status_changed_at",
+        "order",
+        ["status", "status_changed_at"],
+        unique=False,
+    )
+    op.drop_index("ix_order_status", table_name="order")
+
+
+def downgrade() -> None:
+    op.create_index("ix_order_status", "order", ["status"], unique=False)
+    op.drop_index("ix_order_status_status_changed_at", table_name="order")
+    op.drop_column("order", "status_changed_at")
@@ -4,16 +4,17 @@ from .materials import (Material, MaterialCreate, MaterialUpdate,
 from .order import (CreateOrderStatus, Order, OrderCreate, OrderFilter,
                     OrderStatus, OrderUpdate, order_type_requisites,
                     raise_accepted_order_update, raise_order_status_update,
-                    raise_order_type, raise_ready_order_update,
-                    raise_user_customer_data, raise_user_customer_update_data,
-                    raise_user_implementer_data,
-                    raise_user_implementer_update_data)
+                    raise_order_type, raise_order_users_data,
+                    raise_ready_order_update)
 from .order_param_value import (OrderParamValue, OrderParamValueCreate,
                                 OrderParamValueUpdate)
 from .order_type import (OrderDepType, OrderType, OrderTypeCreate,
                          OrderTypeName, OrderTypeUpdate)
 from .order_type_param import (OrderParamValueType, OrderTypeParam,
                                OrderTypeParamCreate, OrderTypeParamUpdate)
-from .util import (PaginatedResponse, PaginationData, SortingList,
-                   SortingListItem, SortingType, StrEnum, Timestamped,
-                   TimestampedWithId, ValuesEnum, Version)
+from .serializers import (FieldSet, get_include_columns, get_include_paths,
+                          get_serializer, serialize, serialize_many)
+from .util import (CountStrategy, PaginatedResponse, PaginationData,
+                   PaginationType, SortingList, SortingListItem, SortingType,
+                   StrEnum, Timestamped, TimestampedWithId, UUIDStr,
+                   ValuesEnum, Version)
@@ -16,6 +16,7 @@ class KeycloakEndpoint(StrEnum):
         "{url}/admin/realms/{realm}/clients/{client_id}/roles/{role_name}/users"
     )
     GET_USERS = "{url}/admin/realms/{realm}/users"
+    GET_USERS_COUNT = "{url}/admin/realms/{realm}/users/count"
     GET_USER = "{url}/admin/realms/{realm}/users/{user_id}"
     USER_ROLES = (
         "{url}/admin/realms/{realm}/users/{user_id}/role-mappings/clients/{client_id}"
@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from pydantic import BaseModel
 
 from .util import StrEnum, TimestampedWithId
@@ -27,4 +29,4 @@ class Material(TimestampedWithId):
     item_price: int
     user_creator: str
     user_updator: str
-    order_id: str
+    order_id: UUID
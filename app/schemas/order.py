@@ -1,14 +1,16 @@
-from typing import Dict, List, Optional, Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Union
+from uuid import UUID
 
 from pydantic import BaseModel
 
-from app.log import logger
-
-from ..db import entities
 from .keycloak_user import User, UserRole
 from .order_param_value import OrderParamValue
 from .order_type import OrderType, OrderTypeName
-from .util import StrEnum, TimestampedWithId
+from .util import StrEnum, TimestampedWithId, UUIDStr
+
+if TYPE_CHECKING:
+    from ..db import entities
 
 
 class OrderStatus(StrEnum):
@@ -106,8 +108,8 @@ allowed_status_transitions: Dict[str, List[str]] = {
 
 class CreateOrderStatus(BaseModel):
     new_order_status: OrderStatus
-    order_id: str
-    order_type_id: str
+    order_id: UUIDStr
+    order_type_id: UUIDStr
 
 
 class OrderStatusUpdate(TimestampedWithId):
@@ -119,23 +121,24 @@ class OrderStatusUpdate(TimestampedWithId):
 class OrderCreate(BaseModel):
     user_customer: str
     user_implementer: str
-    order_type_id: str
-    parent_order_id: Optional[str] = None
+    order_type_id: UUIDStr
+    parent_order_id: Optional[UUIDStr] = None
 
 
 class OrderUpdate(BaseModel):
     status: Optional[OrderStatus] = None
     user_customer: Optional[str] = None
     user_implementer: Optional[str] = None
-    parent_order_id: Optional[str] = None
+    parent_order_id: Optional[UUIDStr] = None
 
 
 class Order(TimestampedWithId):
-    status: str
+    status: OrderStatus
+    status_changed_at: Optional[datetime] = None
     user_customer: str
     user_implementer: str
-    order_type_id: Optional[str]
-    parent_order_id: Optional[str] = None
+    order_type_id: Optional[UUID]
+    parent_order_id: Optional[UUID] = None
     parent_order: Optional["Order"] = None
     params: List[OrderParamValue]
     history: List[OrderStatusUpdate]
@@ -143,12 +146,12 @@ class Order(TimestampedWithId):
 
 
 class OrderFilter(BaseModel):
-    id: Optional[List[str]]
-    parent_order_id: Optional[List[str]]
+    id: Optional[List[UUIDStr]]
+    parent_order_id: Optional[List[UUIDStr]]
     user_customer: Optional[List[str]]
     user_implementer: Optional[List[str]]
     dep_type: Optional[List[str]]
-    status: Optional[List[str]]
+    status: Optional[List[OrderStatus]]
 
 
 class OrderDepType(StrEnum):
@@ -170,7 +173,7 @@ def raise_order_status_update(
         raise ValueError(f"Could not transition from {old_status} to {new_status}")
 
 
-def raise_ready_order_update(new_status: OrderStatus, order: entities.Order) -> None:
+def raise_ready_order_update(new_status: OrderStatus, order: "entities.Order") -> None:
     if new_status != OrderStatus.READY:
         return
     errors = ""
@@ -188,13 +191,12 @@ def raise_ready_order_update(new_status: OrderStatus, order: entities.Order) ->
 
 
 def raise_accepted_order_update(
-    new_status: OrderStatus, child_orders: Sequence[entities.Order]
+    new_status: OrderStatus, child_statuses: Sequence[str]
 ) -> None:
     if new_status != OrderStatus.ACCEPTED:
         return
-    logger.info(child_orders)
-    for child_order in child_orders:
-        if child_order.status not in [
+    for child_status in child_statuses:
+        if child_status not in [
             OrderStatus.ACCEPTED,
             OrderStatus.TO_REMOVE,
             OrderStatus.REMOVED,
@@ -202,41 +204,15 @@ def raise_accepted_order_update(
             raise ValueError("Все дочерние заказы должны быть завершены")
 
 
-async def raise_user_customer_data(
-    order_create_data: OrderCreate,
+async def raise_order_users_data(
+    order_data: Union[OrderCreate, OrderUpdate],
 ) -> None:
-    from ..core import keycloak
-
-    kc = keycloak.get_service_client()
-    await kc.get_user_by_id(order_create_data.user_customer)
-
-
-async def raise_user_implementer_data(
-    order_create_data: OrderCreate,
-) -> None:
-    from ..core import keycloak
-
-    kc = keycloak.get_service_client()
-    await kc.get_user_by_id(order_create_data.user_implementer)
-
-
-async def raise_user_customer_update_data(
-    order_update_data: OrderUpdate,
-) -> None:
-    if order_update_data.user_customer is None:
-        return
-    from ..core import keycloak
-
-    kc = keycloak.get_service_client()
-    await kc.get_user_by_id(order_update_data.user_customer)
-
-
-async def raise_user_implementer_update_data(
-    order_update_data: OrderUpdate,
-) -> None:
-    if order_update_data.user_implementer is None:
-        return
-    from ..core import keycloak
-
-    kc = keycloak.get_service_client()
-    await kc.get_user_by_id(order_update_data.user_implementer)
+    """
+    Check that order customer and implementer exist in keycloak.
+    Users are looked up concurrently, same user is looked up once.
+    """
+    from ..core import user_directory
+
+    await user_directory.get_user_directory().get_users_by_ids(
+        [order_data.user_customer, order_data.user_implementer]
+    )
@@ -1,4 +1,5 @@
 from typing import Optional
+from uuid import UUID
 
 from pydantic import BaseModel
 
@@ -16,6 +17,6 @@ class OrderParamValueUpdate(BaseModel):
 
 class OrderParamValue(TimestampedWithId):
     value: str
-    order_type_param_id: str
-    order_id: str
+    order_type_param_id: UUID
+    order_id: UUID
     order_type_param: Optional[OrderTypeParam]
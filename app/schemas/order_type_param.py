@@ -1,4 +1,5 @@
 from typing import Optional
+from uuid import UUID
 
 from pydantic import BaseModel
 
@@ -28,4 +29,4 @@ class OrderTypeParam(TimestampedWithId):
     name: str
     required: bool
     value_type: str
-    order_type_id: str
+    order_type_id: UUID
@@ -0,0 +1,264 @@
+"""
+Compiled serializers of ORM entities to JSON-ready dicts
+
+Serializer is built once per schema from its fields and reads only attributes
+already loaded to entity (not loaded relationships are serialized as empty),
+so it never triggers lazy loading and does not validate data again.
+Serializer may be restricted to subset of fields (see FieldSet).
+"""
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import (Any, Callable, Dict, Hashable, Iterable, List, Optional,
+                    Tuple, Type)
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+
+from app.core.error import IncorrectFields
+from app.settings import settings
+from app.util.cache import TTLCache
+
+Serializer = Callable[[Any], Dict[str, Any]]
+Converter = Callable[[Any], Any]
+# field name -> None for plain field or Include of nested schema fields
+Include = Dict[str, Optional["Include"]]
+
+SerializerKey = Tuple[Type[BaseModel], Hashable]
+
+# include comes from fields and expand query params, so amount of keys is not bounded
+_serializers: TTLCache[SerializerKey, Serializer] = TTLCache(
+    maxsize=settings.SERIALIZER_CACHE_SIZE, ttl=math.inf
+)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _isoformat(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (date, datetime, time)) else value
+
+
+def _to_str(value: Any) -> Any:
+    return str(value) if isinstance(value, UUID) else value
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _to_float(value: Any) -> Any:
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def _get_scalar_converter(type_: Any) -> Converter:
+    if isinstance(type_, type):
+        if issubclass(type_, (date, datetime, time)):
+            return _isoformat
+        if issubclass(type_, UUID):
+            return _to_str
+        if issubclass(type_, Enum):
+            return _enum_value
+        if issubclass(type_, Decimal):
+            return _to_float
+    return _identity
+
+
+def _get_nested_schema(field: ModelField) -> Optional[Type[BaseModel]]:
+    type_ = field.type_
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        return type_
+    return None
+
+
+def _get_include_key(include: Optional[Include]) -> Hashable:
+    if include is None:
+        return None
+    return tuple(sorted((k, _get_include_key(v)) for k, v in include.items()))
+
+
+def _get_converter(
+    field: ModelField,
+    include: Optional[Include],
+    compiled: Dict[SerializerKey, Serializer],
+) -> Converter:
+    nested_schema = _get_nested_schema(field)
+    convert: Converter
+    if nested_schema is not None:
+        convert = _compile(nested_schema, include, compiled)
+    else:
+        convert = _get_scalar_converter(field.type_)
+    if field.shape == SHAPE_LIST:
+        return lambda value: [convert(it) for it in value]
+    if field.shape != SHAPE_SINGLETON:
+        return jsonable_encoder
+    return convert
+
+
+def _get_default(field: ModelField) -> Any:
+    if field.shape == SHAPE_LIST:
+        return []
+    return field.default
+
+
+def _compile(
+    schema: Type[BaseModel],
+    include: Optional[Include],
+    compiled: Dict[SerializerKey, Serializer],
+) -> Serializer:
+    """
+    Compile serializer with nested ones
+
+    :param compiled: Serializers compiled for this call by key, schema may refer
+        to itself and gets the serializer that is being compiled
+    """
+    key = (schema, _get_include_key(include))
+    if serializer := compiled.get(key):
+        return serializer
+    fields: List = []
+
+    def serialize(item: Any) -> Dict[str, Any]:
+        values = item if isinstance(item, dict) else getattr(item, "__dict__", {})
+        result = {}
+        for name, alias, convert, default in fields:
+            value = values.get(name, default)
+            result[alias] = None if value is None else convert(value)
+        return result
+
+    compiled[key] = serialize
+    for field in schema.__fields__.values():
+        if include is not None and field.name not in include:
+            continue
+        nested_include = include.get(field.name) if include is not None else None
+        fields.append(
+            (
+                field.name,
+                field.alias,
+                _get_converter(field, nested_include, compiled),
+                _get_default(field),
+            )
+        )
+    return serialize
+
+
+def get_serializer(
+    schema: Type[BaseModel], include: Optional[Include] = None
+) -> Serializer:
+    """
+    Get (compile on first call) serializer of entity to dict with schema fields.
+    Compiled serializers are kept in LRU cache of SERIALIZER_CACHE_SIZE
+
+    :param schema: Pydantic schema
+    :param include: Fields to serialize (all schema fields if not set)
+    """
+    key = (schema, _get_include_key(include))
+    if serializer := _serializers.get(key):
+        return serializer
+    serializer = _compile(schema, include, {})
+    _serializers.set(key, serializer)
+    return serializer
+
+
+@dataclass(frozen=True)
+class FieldSet:
+    """
+    Fields requested with ``fields`` and ``expand`` query params
+
+    ``fields`` limits plain fields of item (all of them by default), ``expand`` lists
+    nested items to include, dotted for deeper levels (``order_type.params``).
+    Nested items are included with their plain fields only.
+    If both are not set all schema fields are included.
+    """
+
+    fields: Optional[Tuple[str, ...]] = None
+    expand: Optional[Tuple[str, ...]] = None
+
+    @property
+    def is_full(self) -> bool:
+        return self.fields is None and self.expand is None
+
+    @staticmethod
+    def _get_plain_fields(schema: Type[BaseModel]) -> Include:
+        return {
+            name: None
+            for name, field in schema.__fields__.items()
+            if _get_nested_schema(field) is None
+        }
+
+    def _expand(self, schema: Type[BaseModel], include: Include, path: str) -> None:
+        for name in path.split("."):
+            field = schema.__fields__.get(name)
+            nested_schema = _get_nested_schema(field) if field is not None else None
+            if nested_schema is None:
+                raise IncorrectFields(
+                    fields=[path],
+                    available={
+                        it.name
+                        for it in schema.__fields__.values()
+                        if _get_nested_schema(it) is not None
+                    },
+                )
+            if include.get(name) is None:
+                include[name] = self._get_plain_fields(nested_schema)
+            schema, include = nested_schema, include[name]  # type: ignore
+
+    def get_include(self, schema: Type[BaseModel]) -> Optional[Include]:
+        """
+        :return: Fields of schema to serialize (None if all fields are requested)
+        """
+        if self.is_full:
+            return None
+        plain = self._get_plain_fields(schema)
+        fields = list(plain) if self.fields is None else self.fields
+        unknown = {it for it in fields if it not in schema.__fields__}
+        if unknown:
+            raise IncorrectFields(fields=unknown, available=set(schema.__fields__))
+        include: Include = {it: None for it in fields if it in plain}
+        expand = [it for it in fields if it not in plain] + list(self.expand or [])
+        for path in expand:
+            self._expand(schema, include, path)
+        return include
+
+
+def get_include_columns(include: Include) -> List[str]:
+    """
+    Plain (not nested) fields of include
+    """
+    return [k for k, v in include.items() if v is None]
+
+
+def get_include_paths(include: Include, prefix: str = "") -> List[str]:
+    """
+    Dotted paths to the deepest nested items of include (``order_type.params``)
+    """
+    paths = []
+    for name, nested in include.items():
+        if nested is None:
+            continue
+        path = f"{prefix}{name}"
+        paths.extend(get_include_paths(nested, prefix=f"{path}.") or [path])
+    return paths
+
+
+def serialize(
+    schema: Type[BaseModel], item: Any, fieldset: Optional[FieldSet] = None
+) -> Optional[Dict[str, Any]]:
+    if item is None:
+        return None
+    include = fieldset.get_include(schema) if fieldset is not None else None
+    return get_serializer(schema, include)(item)
+
+
+def serialize_many(
+    schema: Type[BaseModel],
+    items: Iterable[Any],
+    fieldset: Optional[FieldSet] = None,
+) -> List[Dict]:
+    include = fieldset.get_include(schema) if fieldset is not None else None
+    serializer = get_serializer(schema, include)
+    return [serializer(it) for it in items]
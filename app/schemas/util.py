@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import Any, List, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 from uuid import UUID
 
 from fastapi import Request
@@ -11,16 +11,29 @@ class PaginatedResponse(BaseModel):
     results: List
     next: Union[AnyHttpUrl, str, None]
     previous: Union[AnyHttpUrl, str, None]
-    count: int
+    count: Optional[int] = None
+    count_strategy: Optional["CountStrategy"] = None
+    has_more: Optional[bool] = None
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
 
 
-class PaginationData(BaseModel):
-    request: Request
-    limit: int = Field(10, ge=0)
-    offset: int = Field(0, ge=0)
+class UUIDStr(str):
+    """
+    UUID in input data, kept as str as ids of entities are
+    """
 
-    class Config:
-        arbitrary_types_allowed = True
+    @classmethod
+    def __get_validators__(cls) -> Iterator[Callable]:
+        yield cls.validate
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: Dict[str, Any]) -> None:
+        field_schema.update(type="string", format="uuid")
+
+    @classmethod
+    def validate(cls, value: Any) -> str:
+        return str(UUID(str(value)))
 
 
 class Timestamped(BaseModel):
@@ -67,5 +80,58 @@ class SortingList(BaseModel):
     sorting_list: List[SortingListItem]
 
 
+class PaginationType(StrEnum):
+    OFFSET = "offset"
+    CURSOR = "cursor"
+
+
+class CountStrategy(StrEnum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+
+
+class PaginationData(BaseModel):
+    """
+    Pagination query params
+
+    offset - pages by limit / offset with total count
+    (with_count=false - count is not calculated, has_more is returned instead,
+    count_strategy - how count is calculated, PAGINATION_COUNT_STRATEGY by default)
+    cursor - pages by opaque cursor from next / previous links, count is not calculated
+    """
+
+    request: Request
+    limit: int = Field(10, ge=0)
+    offset: int = Field(0, ge=0)
+    pagination: Optional[PaginationType] = None
+    cursor: Optional[str] = None
+    with_count: bool = True
+    count_strategy: Optional[CountStrategy] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def is_cursor(self) -> bool:
+        return self.pagination == PaginationType.CURSOR or self.cursor is not None
+
+    def get_service_kwargs(self) -> Dict[str, Any]:
+        """
+        :return: Pagination kwargs for BaseService.read_many_paginated
+        """
+        if self.is_cursor:
+            return {"limit": self.limit, "cursor": self.cursor, "keyset": True}
+        return {
+            "limit": self.limit,
+            "offset": self.offset,
+            "with_count": self.with_count,
+            "count_strategy": self.count_strategy,
+        }
+
+
 class DatetimeConverter(BaseModel):
     dt: datetime
+
+
+PaginatedResponse.update_forward_refs()
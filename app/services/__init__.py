@@ -1,3 +1,4 @@
+from .base import BaseService, LoadPlan, LoadStrategy
 from .materials import MaterialsService
 from .order import OrderService
 from .order_param_value import OrderParamValueService
@@ -1,21 +1,83 @@
-from functools import reduce
-from typing import (Any, Callable, Iterable, List, Optional, Sequence, Set,
-                    Type, Union)
+import json
+import math
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from functools import partial, reduce
+from typing import (Any, Callable, Dict, Hashable, Iterable, List, Optional,
+                    Sequence, Set, Tuple, Type, Union)
 from uuid import UUID
 
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy import and_, delete, or_, update
+from sqlalchemy import (Select, Uuid, and_, bindparam, delete, false, insert,
+                        literal_column, or_, text, update)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import Query, joinedload
+from sqlalchemy.orm import Load, class_mapper, load_only
 from sqlalchemy.sql import func
-from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.expression import BindParameter, ColumnElement
 
 from app import schemas
 from app.core import error
 from app.db.base_class import Base
+from app.settings import settings
+from app.util.cache import TTLCache
+from app.util.cursor import decode_cursor, encode_cursor
 
-QueryModifier = Callable[[Query], Query]
+from .counts import Explain, count_cache, get_filter_key
+
+QueryModifier = Callable[[Select], Select]
+# _setup_query args that do not change amount of results
+COUNT_INDEPENDENT_ARGS = {
+    "operator",
+    "selectable",
+    "offset",
+    "limit",
+    "load_props",
+    "load_plan",
+    "fields",
+    "sorting_list",
+}
+# _setup_query args that are not filters
+SETUP_QUERY_ARGS = {
+    *COUNT_INDEPENDENT_ARGS,
+    "filtering_policy",
+    "modifiers",
+}
+KeysetColumn = Tuple[str, Any, bool]  # field name, column, is descending
+# INSERT ... ON CONFLICT constructs of dialects that support it
+UPSERT_INSERTS: Dict[str, Callable] = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class LoadStrategy(Enum):
+    """Relationship loader options (names of sqlalchemy.orm.Load methods)"""
+
+    JOINED = "joinedload"
+    SELECTIN = "selectinload"
+    SUBQUERY = "subqueryload"
+    NOLOAD = "noload"
+
+
+# Statements with bind parameters by query shape (see BaseService._get_cached_query)
+statement_cache: TTLCache[Hashable, Any] = TTLCache(
+    maxsize=settings.STATEMENT_CACHE_SIZE, ttl=math.inf
+)
+# Relationships to load: dotted path -> strategy (None for default one).
+# Not listed parts of paths are loaded with default strategy:
+# selectin for collections, joined for many-to-one.
+LoadPlan = Dict[str, Optional[LoadStrategy]]
+
+
+@dataclass
+class KeysetPage:
+    items: Sequence[Any]
+    has_more: bool
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
 
 
 class BaseService:
@@ -25,22 +87,30 @@ class BaseService:
         entity: Type,
         entity_name: str,
         sorting_fields: Optional[Set[str]] = None,
+        load_plan: Optional[LoadPlan] = None,
     ):
+        """
+        :param load_plan: Relationships loaded by default with entities
+            (nothing is loaded if not set)
+        """
         self.db_session = db_session
         self.entity = entity
         self.entity_name = entity_name
         self.sorting_fields = sorting_fields or Set[str]()
+        self.load_plan = load_plan or {}
 
     def _set_filter_chunk(self, key: Any, value: Any) -> Any:
         if isinstance(value, bool):
             return getattr(self.entity, key).is_(value)
-        if isinstance(value, list):
+        if isinstance(value, list) or (
+            isinstance(value, BindParameter) and value.expanding
+        ):
             return getattr(self.entity, key).in_(value)
         return getattr(self.entity, key) == value
 
     def _set_filter(
-        self, q: Query, filtering: dict, filtering_policy: str = "and"
-    ) -> Query:
+        self, q: Select, filtering: dict, filtering_policy: str = "and"
+    ) -> Select:
         predicate = or_ if filtering_policy == "or" else and_
         return q.filter(
             predicate(*(self._set_filter_chunk(k, v) for k, v in filtering.items()))
@@ -77,8 +147,8 @@ class BaseService:
 
     @staticmethod
     def _set_order_by(
-        query: Query, order_by: Optional[List[ColumnElement]] = None
-    ) -> Query:
+        query: Select, order_by: Optional[List[ColumnElement]] = None
+    ) -> Select:
         """
         Define query ORDER BY part
 
@@ -88,57 +158,80 @@ class BaseService:
         """
         return query.order_by(*order_by) if order_by else query
 
-    def _set_joinedload_nested(self, q: Query, load_props: List[str]) -> Query:
-        attr = getattr(
-            self.entity, load_props[0]
-        )  # type is sqlalchemy.orm.attributes.InstrumentedAttribute
-        load = joinedload(attr)
-        parent_entity = attr.property.entity.entity
-        for field in load_props[1:]:
-            attr = getattr(parent_entity, field)
-            load = load.joinedload(attr)
-            parent_entity = attr.property.entity.entity
-        return q.options(load)
+    @staticmethod
+    def get_default_load_strategy(attr: Any) -> LoadStrategy:
+        if attr.property.uselist:
+            return LoadStrategy.SELECTIN
+        return LoadStrategy.JOINED
 
-    def _set_joinedload(
-        self, q: Query, load_props: Optional[Iterable[str]] = None
-    ) -> Query:
+    def _get_loader(self, path: str, load_plan: LoadPlan) -> Load:
         """
-        Define fields that will be loaded with joinedload (for inner entity fields)
+        Loader option of relationships path with strategies of load plan
 
-        :param query: Database query
-        :param prefetch_fields: Iterable with field names that will be prefetched
-        :return: Modified database query
+        :param path: Dotted relationships path (``order_type.params``)
+        :param load_plan: LoadPlan with strategies of path parts
+        :return: Loader option for query
         """
+        load, entity, prefix = Load(self.entity), self.entity, ""
+        for name in [it for it in path.split(".") if it]:
+            attr = getattr(entity, name)
+            prefix = f"{prefix}{name}"
+            strategy = load_plan.get(prefix) or self.get_default_load_strategy(attr)
+            load = getattr(load, strategy.value)(attr)
+            entity = attr.property.entity.entity
+            prefix = f"{prefix}."
+        return load
+
+    def _get_load_plan(
+        self,
+        load_props: Optional[Iterable[str]] = None,
+        load_plan: Optional[LoadPlan] = None,
+    ) -> LoadPlan:
+        """
+        :param load_props: Relationships paths to load with default strategies
+        :param load_plan: LoadPlan to use
+        :return: Given load plan, plan of load_props or service default plan
+        """
+        if load_plan is not None:
+            return load_plan
         if load_props is not None:
-            for field in load_props:
-                load_props = [it for it in field.split(".") if it]
-                q = self._set_joinedload_nested(q, load_props)
-        return q
+            return dict.fromkeys(load_props)
+        return self.load_plan
+
+    def _set_load_plan(self, q: Select, load_plan: LoadPlan) -> Select:
+        """
+        Define relationships that will be loaded with entities
+
+        :param q: Database query
+        :param load_plan: LoadPlan with relationships paths and their strategies
+        :return: Modified database query
+        """
+        return reduce(
+            lambda acc, path: acc.options(self._get_loader(path, load_plan)),
+            load_plan,
+            q,
+        )
+
+    def _set_fields(self, q: Select, fields: Optional[Iterable[str]] = None) -> Select:
+        """
+        Load only given columns of entity
 
-    # def _set_joinedload(
-    #     self,
-    #     q: Query,
-    #     load_props: Optional[Iterable[str]] = None
-    # ) -> Query:
-    #     """
-    #     Define joined load modifiers (to load some foreign fields on select)
-
-    #     :param q: Database query
-    #     :param load_props: Iterable with attrs names
-    #     :return: Modified database query
-    #     """
-    #     return reduce(
-    #         lambda acc, attr: acc.options(joinedload(getattr(self.entity, attr))),
-    #         load_props or [],
-    #         q
-    #     )
+        :param q: Database query
+        :param fields: Iterable with column names (all columns if not set)
+        :return: Modified database query
+        """
+        if fields is None:
+            return q
+        columns = class_mapper(self.entity).columns
+        return q.options(
+            load_only(*(getattr(self.entity, it) for it in fields if it in columns))
+        )
 
     @staticmethod
     def _set_modifiers(
-        q: Query,
+        q: Select,
         modifiers: Optional[Iterable[QueryModifier]] = None,
-    ) -> Query:
+    ) -> Select:
         """
         Define query modifiers (functions that get query as arg and return modified query)
 
@@ -155,14 +248,20 @@ class BaseService:
         offset: Optional[int] = None,
         limit: Optional[int] = None,
         load_props: Optional[List[str]] = None,
+        load_plan: Optional[LoadPlan] = None,
+        fields: Optional[List[str]] = None,
         filtering_policy: str = "and",
         modifiers: Optional[Iterable[QueryModifier]] = None,
         sorting_list: Optional[schemas.SortingList] = None,
         **kwargs: Any,
-    ) -> Query:
+    ) -> Select:
         q = operator(selectable if selectable is not None else self.entity)
         q = self._set_filter(q=q, filtering=kwargs, filtering_policy=filtering_policy)
-        q = self._set_joinedload(q=q, load_props=load_props)
+        if operator == select and selectable is None:
+            q = self._set_fields(q=q, fields=fields)
+            q = self._set_load_plan(
+                q=q, load_plan=self._get_load_plan(load_props, load_plan)
+            )
         q = self._set_modifiers(q=q, modifiers=modifiers)
         if operator == select:
             order_by = self._parse_sorting(sorting=sorting_list)
@@ -185,20 +284,369 @@ class BaseService:
         q = self._setup_query(selectable=func.count(predicate), **kwargs)
         return (await self.db_session.execute(q)).scalar_one() or 0
 
+    @staticmethod
+    def _get_filters(**kwargs: Any) -> Optional[Dict[str, Any]]:
+        """
+        Filters that define count of _setup_query results (None if query has modifiers)
+        """
+        if kwargs.get("modifiers"):
+            return None
+        return {k: v for k, v in kwargs.items() if k not in COUNT_INDEPENDENT_ARGS}
+
+    def _get_cached_count(self, **kwargs: Any) -> Optional[int]:
+        if (filters := self._get_filters(**kwargs)) is None:
+            return None
+        return count_cache.get(self.entity.__tablename__, get_filter_key(filters))
+
+    def _set_cached_count(self, count: int, **kwargs: Any) -> None:
+        if (filters := self._get_filters(**kwargs)) is None:
+            return
+        count_cache.set(self.entity.__tablename__, get_filter_key(filters), count)
+
+    async def estimate_count(self, **kwargs: Any) -> Optional[int]:
+        """
+        Postgres planner estimate of items count: table statistics (pg_class.reltuples)
+        without filters, EXPLAIN rows estimate with filters
+
+        :return: Estimated count or None if it is not available
+            or lower than COUNT_ESTIMATE_THRESHOLD (then exact count is cheap)
+        """
+        filters = self._get_filters(**kwargs)
+        connection = await self.db_session.connection()
+        if filters is None or connection.dialect.name != "postgresql":
+            return None
+        if not filters:
+            estimate = (
+                await self.db_session.execute(
+                    text(
+                        "SELECT reltuples::bigint FROM pg_class "
+                        "WHERE oid = to_regclass(:table)"
+                    ),
+                    {"table": self.entity.__tablename__},
+                )
+            ).scalar()
+        else:
+            kwargs.pop("sorting_list", None)
+            q = self._setup_query(selectable=self.entity.id, **kwargs)
+            plan: Any = (await self.db_session.execute(Explain(q))).scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            estimate = plan[0]["Plan"]["Plan Rows"]
+        if estimate is None or estimate < settings.COUNT_ESTIMATE_THRESHOLD:
+            return None
+        return int(estimate)
+
+    @staticmethod
+    def _get_value_shape(value: Any) -> Any:
+        """
+        Part of filter value that changes SQL of query
+        """
+        if value is None or isinstance(value, bool):
+            return value
+        return list if isinstance(value, list) else object
+
+    def _get_statement_key(self, kind: str, **kwargs: Any) -> Optional[Hashable]:
+        """
+        Shape of query: everything that defines its SQL except filter values,
+        offset and limit (None if query can not be cached)
+        """
+        if (
+            settings.STATEMENT_CACHE_SIZE <= 0
+            or kwargs.get("modifiers")
+            or kwargs.get("selectable") is not None
+        ):
+            return None
+        sorting = kwargs.get("sorting_list")
+        load_plan = self._get_load_plan(
+            kwargs.get("load_props"), kwargs.get("load_plan")
+        )
+        fields = kwargs.get("fields")
+        return (
+            self.entity,
+            kind,
+            kwargs.get("operator", select),
+            kwargs.get("filtering_policy", "and"),
+            tuple(
+                sorted(
+                    (k, self._get_value_shape(v))
+                    for k, v in kwargs.items()
+                    if k not in SETUP_QUERY_ARGS
+                )
+            ),
+            kwargs.get("offset") is not None,
+            kwargs.get("limit") is not None,
+            tuple((it.field, it.type) for it in sorting.sorting_list)
+            if sorting
+            else None,
+            tuple(load_plan.items()),
+            tuple(fields) if fields is not None else None,
+        )
+
+    def _bind_params(self, **kwargs: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Replace filter values, offset and limit with bind parameters
+
+        :return: Query args with bind parameters and values of bind parameters
+        """
+        args: Dict[str, Any] = {}
+        params: Dict[str, Any] = {}
+        for key, value in kwargs.items():
+            if key in ("offset", "limit") and value is not None:
+                args[key] = bindparam(f"page_{key}")
+                params[f"page_{key}"] = value
+            elif key in SETUP_QUERY_ARGS or value is None or isinstance(value, bool):
+                args[key] = value
+            else:
+                args[key] = bindparam(
+                    f"filter_{key}", expanding=isinstance(value, list)
+                )
+                params[f"filter_{key}"] = value
+        return args, params
+
+    def _get_cached_query(
+        self, build: Callable[..., Select], kind: str = "select", **kwargs: Any
+    ) -> Tuple[Select, Dict[str, Any]]:
+        """
+        Query built with bind parameters once per query shape, so it is not built
+        and its SQL is not compiled again for every call with new values
+
+        :param build: Query builder (_setup_query or alike) that gets kwargs
+        :param kind: Name of query kind for cache key
+        :param kwargs: Query args
+        :return: Query and values of its bind parameters for execution
+        """
+        key = self._get_statement_key(kind, **kwargs)
+        if key is None:
+            return build(**kwargs), {}
+        args, params = self._bind_params(**kwargs)
+        q = statement_cache.get(key)
+        if q is None:
+            q = build(**args)
+            statement_cache.set(key, q)
+        return q, params
+
+    async def _execute_query(self, **kwargs: Any) -> Any:
+        """
+        Execute _setup_query with kwargs using statement cache
+        """
+        q, params = self._get_cached_query(self._setup_query, **kwargs)
+        return await self.db_session.execute(q, params)
+
     async def read_many(
         self, offset: int = 0, limit: Optional[int] = None, **kwargs: Any
     ) -> Sequence[Any]:
         return (
-            (
-                await self.db_session.execute(
-                    self._setup_query(offset=offset, limit=limit, **kwargs)
-                )
-            )
+            (await self._execute_query(offset=offset, limit=limit, **kwargs))
             .scalars()
             .unique()
             .all()
         )
 
+    def _setup_query_with_count(
+        self,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        load_props: Optional[List[str]] = None,
+        load_plan: Optional[LoadPlan] = None,
+        fields: Optional[List[str]] = None,
+        sorting_list: Optional[schemas.SortingList] = None,
+        **kwargs: Any,
+    ) -> Select:
+        """
+        Query of page of entities with total count (see read_many_with_count)
+        """
+        order_by = self._parse_sorting(sorting=sorting_list)
+        page = (
+            self._setup_query(
+                selectable=self.entity.id,
+                offset=offset,
+                limit=limit,
+                sorting_list=sorting_list,
+                **kwargs,
+            )
+            .add_columns(
+                func.count().over().label("total_count"),
+                func.row_number().over(order_by=order_by).label("position"),
+            )
+            .subquery()
+        )
+        q = (
+            select(self.entity, page.c.total_count)
+            .join(page, self.entity.id == page.c.id)
+            .order_by(page.c.position)
+        )
+        q = self._set_fields(q=q, fields=fields)
+        return self._set_load_plan(
+            q=q, load_plan=self._get_load_plan(load_props, load_plan)
+        )
+
+    async def read_many_with_count(
+        self, offset: int = 0, limit: Optional[int] = None, **kwargs: Any
+    ) -> Tuple[Sequence[Any], Optional[int]]:
+        """
+        Read page of items together with total amount of items in one query.
+        Page ids with total count (count(*) OVER ()) are selected in subquery,
+        then entities are joined to it and their relationships are loaded.
+
+        :param offset: Offset value for database query (skip first results amount)
+        :param limit: Limit value for database query (max results amount)
+        :param kwargs: Dictionary will be passed to _setup_query function
+            (load_props, load_plan and fields are applied to entities)
+        :return: Items and total count (None if page is empty)
+        """
+        q, params = self._get_cached_query(
+            self._setup_query_with_count,
+            kind="with_count",
+            offset=offset,
+            limit=limit,
+            **kwargs,
+        )
+        rows = (await self.db_session.execute(q, params)).unique().all()
+        if not rows:
+            return [], None
+        return [it[0] for it in rows], rows[0][1]
+
+    def _get_keyset_columns(
+        self, sorting: Optional[schemas.SortingList] = None
+    ) -> List[KeysetColumn]:
+        """
+        Columns of sorting with id as the last one (tiebreaker for unique order).
+        Ids are time-ordered, so tiebreaker follows direction of the last column
+        """
+        self._parse_sorting(sorting=sorting)
+        keys = [
+            (
+                it.field,
+                getattr(self.entity, it.field),
+                it.type == schemas.SortingType.DESC,
+            )
+            for it in (sorting.sorting_list if sorting else [])
+        ]
+        if "id" not in [it[0] for it in keys]:
+            keys.append(("id", self.entity.id, keys[-1][2] if keys else False))
+        return keys
+
+    @staticmethod
+    def _keyset_after(column: Any, value: Any, desc: bool) -> Any:
+        """
+        Condition for rows placed strictly after value in column order
+        (postgres places NULL last in ascending order and first in descending)
+        """
+        if desc:
+            return column.isnot(None) if value is None else column < value
+        return false() if value is None else or_(column > value, column.is_(None))
+
+    def _keyset_filter(
+        self, order: List[Tuple[Any, bool]], values: List[Any]
+    ) -> ColumnElement:
+        clauses = []
+        equal: List[Any] = []
+        for (column, desc), value in zip(order, values):
+            clauses.append(and_(*equal, self._keyset_after(column, value, desc)))
+            equal.append(column.is_(None) if value is None else column == value)
+        return or_(*clauses)
+
+    @staticmethod
+    def _coerce_keyset_value(column: Any, value: Any) -> Any:
+        if value is None:
+            return None
+        if isinstance(column.type, Uuid):
+            value = UUID(str(value))
+            return value if column.type.as_uuid else str(value)
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+        if python_type in (datetime, date):
+            return python_type.fromisoformat(value)
+        return python_type(value)
+
+    @staticmethod
+    def _get_keyset_fields(keys: List[KeysetColumn]) -> List[str]:
+        """
+        Sorting of cursor: field names, descending ones with "-" prefix
+        """
+        return [f"-{name}" if desc else name for name, _, desc in keys]
+
+    def _encode_keyset_cursor(
+        self, keys: List[KeysetColumn], item: Any, reverse: bool
+    ) -> str:
+        return encode_cursor(
+            {
+                "f": self._get_keyset_fields(keys),
+                "v": [getattr(item, it[0]) for it in keys],
+                "r": reverse,
+            }
+        )
+
+    def _decode_keyset_cursor(
+        self, keys: List[KeysetColumn], cursor: str
+    ) -> Tuple[List[Any], bool]:
+        data = decode_cursor(cursor)
+        fields, values = data.get("f"), data.get("v")
+        # cursor from page with another sorting
+        if fields != self._get_keyset_fields(keys) or not isinstance(values, list):
+            raise error.IncorrectCursor(cursor=cursor)
+        if len(values) != len(keys):
+            raise error.IncorrectCursor(cursor=cursor)
+        try:
+            values = [
+                self._coerce_keyset_value(column, value)
+                for (_, column, _), value in zip(keys, values)
+            ]
+        except (TypeError, ValueError):
+            raise error.IncorrectCursor(cursor=cursor)
+        return values, bool(data.get("r"))
+
+    async def read_many_keyset(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sorting_list: Optional[schemas.SortingList] = None,
+        **kwargs: Any,
+    ) -> KeysetPage:
+        """
+        Read page of items after (or before) cursor, keyed on sorting fields and id.
+        One extra row is requested to know if there are more items, count is not used.
+
+        :param limit: Max results amount
+        :param cursor: Opaque cursor from previous page, first page if not set
+        :param sorting_list: SortingList with fields to order by
+        :param kwargs: Dictionary will be passed to _setup_query function
+        :return: KeysetPage with items and cursors of next and previous pages
+        """
+        keys = self._get_keyset_columns(sorting=sorting_list)
+        values, reverse = None, False
+        if kwargs.get("fields") is not None:
+            # cursors are made from sorting fields of items
+            kwargs["fields"] = [*kwargs["fields"], *(it[0] for it in keys)]
+        if cursor is not None:
+            values, reverse = self._decode_keyset_cursor(keys=keys, cursor=cursor)
+        # previous page is read in reversed order from its last item
+        order = [(column, desc != reverse) for _, column, desc in keys]
+        q = self._setup_query(limit=limit + 1 if limit is not None else None, **kwargs)
+        if values is not None:
+            q = q.filter(self._keyset_filter(order=order, values=values))
+        # NULL placement of postgres is set explicitly, _keyset_after relies on it
+        q = q.order_by(
+            *(
+                column.desc().nulls_first() if desc else column.asc().nulls_last()
+                for column, desc in order
+            )
+        )
+        items = list((await self.db_session.execute(q)).scalars().unique().all())
+        has_extra = limit is not None and len(items) > limit
+        items = items[:limit]
+        if reverse:
+            items.reverse()
+        has_next = True if reverse else has_extra
+        has_previous = has_extra if reverse else cursor is not None
+        page = KeysetPage(items=items, has_more=has_next)
+        if items and has_next:
+            page.next_cursor = self._encode_keyset_cursor(keys, items[-1], False)
+        if items and has_previous:
+            page.previous_cursor = self._encode_keyset_cursor(keys, items[0], True)
+        return page
+
     async def read_many_paginated(
         self,
         *args: Any,
@@ -206,68 +654,329 @@ class BaseService:
         offset: int = 0,
         limit: Optional[int] = None,
         method: Optional[Callable] = None,
+        window_count: bool = True,
+        keyset: bool = False,
+        cursor: Optional[str] = None,
+        with_count: bool = True,
+        count_strategy: Optional[schemas.CountStrategy] = None,
+        fieldset: Optional[schemas.FieldSet] = None,
         **kwargs: Any,
     ) -> schemas.PaginatedResponse:
         """
-        Get count of items by filter
+        Get page of items and count of items by filter
 
         :param args: Args will be passed to method
-        :param wrapper_class: Class that will wrap entity from database
+        :param wrapper_class: Schema that entities from database are serialized with
         :param offset: Offset value for database query (skip first results amount)
         :param limit: Limit value for database query (max results amount)
         :param method: Callable method that will be used to get paginated results
+        :param window_count: Get count with page in one query (read_many_with_count),
+            separate count query is used with custom method or for empty page
+        :param keyset: Use cursor pagination (read_many_keyset), offset is ignored
+        :param cursor: Cursor for keyset pagination
+        :param with_count: Calculate count, otherwise has_more is set by one extra row
+        :param count_strategy: How count is calculated (exact, cached or estimated),
+            PAGINATION_COUNT_STRATEGY by default
+        :param fieldset: Fields of wrapper_class to load and serialize
+            (columns and relationships), all fields by default
         :param kwargs: Dictionary will be passed to _setup_query function
         :return: PaginatedResponse with results
         """
-        if not method:
-            method = self.read_many
-        count = await self.count(**kwargs) or 0
-        kwargs["limit"] = limit
-        kwargs["offset"] = offset
-        results = [
-            wrapper_class(**jsonable_encoder(it))
-            for it in await method(*args, **kwargs)
-        ]
-        return schemas.PaginatedResponse(results=results, count=count)
+        include = fieldset.get_include(wrapper_class) if fieldset else None
+        if include is not None:
+            kwargs["fields"] = schemas.get_include_columns(include)
+            kwargs["load_props"] = schemas.get_include_paths(include)
+        if keyset:
+            page = await self.read_many_keyset(limit=limit, cursor=cursor, **kwargs)
+            return schemas.PaginatedResponse(
+                results=schemas.serialize_many(wrapper_class, page.items, fieldset),
+                has_more=page.has_more,
+                next_cursor=page.next_cursor,
+                previous_cursor=page.previous_cursor,
+            )
+        read_page: Callable[..., Any] = method or self.read_many
+        if not with_count:
+            fetch_limit = limit + 1 if limit is not None else None
+            items = await read_page(*args, offset=offset, limit=fetch_limit, **kwargs)
+            return schemas.PaginatedResponse(
+                results=schemas.serialize_many(wrapper_class, items[:limit], fieldset),
+                has_more=limit is not None and len(items) > limit,
+            )
+        strategy = schemas.CountStrategy(
+            count_strategy or settings.PAGINATION_COUNT_STRATEGY
+        )
+        count: Optional[int] = None
+        if strategy == schemas.CountStrategy.CACHED:
+            count = self._get_cached_count(**kwargs)
+        elif strategy == schemas.CountStrategy.ESTIMATED:
+            count = await self.estimate_count(**kwargs)
+        if count is None:
+            # count is not cached or not estimated, exact count is calculated
+            strategy = schemas.CountStrategy.EXACT
+            if read_page == self.read_many and window_count:
+                items, count = await self.read_many_with_count(
+                    offset=offset, limit=limit, **kwargs
+                )
+            else:
+                items = await read_page(*args, offset=offset, limit=limit, **kwargs)
+            if count is None:
+                count = await self.count(**kwargs) or 0
+            self._set_cached_count(count, **kwargs)
+        else:
+            items = await read_page(*args, offset=offset, limit=limit, **kwargs)
+        return schemas.PaginatedResponse(
+            results=schemas.serialize_many(wrapper_class, items, fieldset),
+            count=count,
+            count_strategy=strategy,
+        )
 
     async def read_one(self, **kwargs: Any) -> Any:
-        if item := (
-            await self.db_session.execute(self._setup_query(**kwargs))
-        ).scalar():
+        if item := (await self._execute_query(**kwargs)).scalar():
             return item
         raise error.ItemNotFound(item=self.entity_name)
 
+    def _setup_exists_query(self, **kwargs: Any) -> Select[Tuple[bool]]:
+        """
+        SELECT EXISTS(SELECT 1 ... LIMIT 1) without entity columns and loaders
+        """
+        kwargs.pop("sorting_list", None)
+        q = self._setup_query(selectable=literal_column("1"), limit=1, **kwargs)
+        return select(q.select_from(self.entity).exists())
+
     async def exists(self, **kwargs: Any) -> bool:
-        return bool(
-            (await self.db_session.execute(self._setup_query(**kwargs))).scalar()
+        q, params = self._get_cached_query(
+            self._setup_exists_query, kind="exists", **kwargs
+        )
+        return bool((await self.db_session.execute(q, params)).scalar())
+
+    def _setup_scalar_query(self, column: str, **kwargs: Any) -> Select:
+        return self._setup_query(selectable=getattr(self.entity, column), **kwargs)
+
+    async def read_scalar(
+        self,
+        column: str,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[Any]:
+        """
+        Read values of one column of entities without loading entities
+
+        :param column: Entity column name
+        :param kwargs: Query args as for read_many
+        :return: Column values
+        """
+        q, params = self._get_cached_query(
+            partial(self._setup_scalar_query, column),
+            kind=f"scalar:{column}",
+            offset=offset,
+            limit=limit,
+            **kwargs,
+        )
+        return list((await self.db_session.execute(q, params)).scalars().all())
+
+    async def read_ids(self, **kwargs: Any) -> List[Any]:
+        """
+        Read ids of entities without loading entities
+        """
+        return await self.read_scalar("id", **kwargs)
+
+    async def _reload(self, item: Any, load_plan: Optional[LoadPlan] = None) -> Any:
+        """
+        Load relationships of written item (item is returned as is without load_plan)
+        """
+        if not load_plan:
+            return item
+        q = self._setup_query(id=item.id, load_plan=load_plan).execution_options(
+            populate_existing=True
         )
+        return (await self.db_session.execute(q)).scalar_one()
 
-    async def _create(self, item: Base) -> Any:
+    def _get_values(self, item: Base) -> Dict[str, Any]:
+        """
+        Column values set on entity object
+        """
+        return {
+            attr.key: getattr(item, attr.key)
+            for attr in class_mapper(self.entity).column_attrs
+            if attr.key in item.__dict__
+        }
+
+    async def _create(self, item: Base, load_plan: Optional[LoadPlan] = None) -> Any:
+        """
+        Insert item with one INSERT ... RETURNING statement
+
+        :param item: Entity object to insert
+        :param load_plan: Relationships to load for created item (not loaded if not set)
+        :return: Created entity
+        """
+        q = insert(self.entity).values(**self._get_values(item)).returning(self.entity)
         try:
-            self.db_session.add(item)
-            await self.db_session.flush()  # noqa
-            return await self.read_one(id=item.id)
+            created = (await self.db_session.execute(q)).scalar_one()
+            return await self._reload(created, load_plan=load_plan)
         except Exception as e:
             await self.db_session.rollback()  # noqa
             raise e
 
-    async def _update(self, id: Union[UUID, str], item: Any) -> Any:
-        await self.read_one(id=id)
+    async def _update(
+        self,
+        id: Union[UUID, str],
+        item: Any,
+        load_plan: Optional[LoadPlan] = None,
+    ) -> Any:
+        """
+        Update item with one UPDATE ... RETURNING statement
+
+        :param id: Item id
+        :param item: Values to set
+        :param load_plan: Relationships to load for updated item (not loaded if not set)
+        :return: Updated entity
+        """
         q = (
             update(self.entity)
             .where(self.entity.id == id)
             .values(**jsonable_encoder(item))
-            .execution_options(synchronize_session="fetch")
+            .returning(self.entity)
+            .execution_options(populate_existing=True)
         )
         try:
-            await self.db_session.execute(q)
-            return await self.read_one(id=id)
+            updated = (await self.db_session.execute(q)).scalar_one_or_none()
         except Exception as e:
             await self.db_session.rollback()  # noqa
             raise e
+        if updated is None:
+            raise error.ItemNotFound(item=self.entity_name)
+        return await self._reload(updated, load_plan=load_plan)
+
+    async def update(
+        self, id: Union[UUID, str], load_plan: Optional[LoadPlan] = None, **kwargs: Any
+    ) -> Any:
+        return await self._update(id=id, item=kwargs, load_plan=load_plan)
+
+    def get_load_plan(
+        self, wrapper_class: Type, fieldset: Optional[schemas.FieldSet] = None
+    ) -> LoadPlan:
+        """
+        Relationships needed to serialize entity with wrapper_class and fieldset
 
-    async def update(self, id: Union[UUID, str], **kwargs: Any) -> Any:
-        return await self._update(id=id, item=kwargs)
+        :return: Service load plan if all fields are requested, plan of expanded
+            relationships otherwise
+        """
+        include = fieldset.get_include(wrapper_class) if fieldset else None
+        if include is None:
+            return self.load_plan
+        return dict.fromkeys(schemas.get_include_paths(include))
+
+    def _get_rows(self, items: Iterable[Union[Base, Dict[str, Any]]]) -> List[Dict]:
+        return [
+            dict(it) if isinstance(it, dict) else self._get_values(it) for it in items
+        ]
+
+    def _get_returning(self, returning: Optional[Sequence[str]] = None) -> List[Any]:
+        return [getattr(self.entity, it) for it in returning or ["id"]]
+
+    @staticmethod
+    def _get_returned(result: Any, returning: Optional[Sequence[str]] = None) -> List:
+        if returning is None:
+            return list(result.scalars().all())
+        return [dict(it._mapping) for it in result.all()]
+
+    async def bulk_create(
+        self,
+        items: Sequence[Union[Base, Dict[str, Any]]],
+        returning: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """
+        Insert items with multi-row INSERT ... RETURNING statements
+        (items are not added to session)
+
+        :param items: Entity objects or dicts with column values
+        :param returning: Columns to return (only ids are returned if not set)
+        :return: Ids or dicts with returning columns in order of items
+        """
+        if not items:
+            return []
+        q = insert(self.entity).returning(
+            *self._get_returning(returning), sort_by_parameter_order=True
+        )
+        try:
+            result = await self.db_session.execute(q, self._get_rows(items))
+        except Exception as e:
+            await self.db_session.rollback()  # noqa
+            raise e
+        return self._get_returned(result, returning)
+
+    async def bulk_update(
+        self,
+        ids: Sequence[Union[UUID, str]],
+        values: Dict[str, Any],
+        returning: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """
+        Set the same values to items with one UPDATE ... RETURNING statement
+
+        :param ids: Ids of items to update
+        :param values: Values to set
+        :param returning: Columns to return (only ids are returned if not set)
+        :return: Ids or dicts with returning columns of updated items
+        """
+        if not ids:
+            return []
+        q = (
+            update(self.entity)
+            .where(self.entity.id.in_([str(it) for it in ids]))
+            .values(**jsonable_encoder(values))
+            .returning(*self._get_returning(returning))
+        )
+        try:
+            result = await self.db_session.execute(q)
+        except Exception as e:
+            await self.db_session.rollback()  # noqa
+            raise e
+        return self._get_returned(result, returning)
+
+    async def bulk_upsert(
+        self,
+        items: Sequence[Union[Base, Dict[str, Any]]],
+        conflict_cols: Sequence[str],
+        update_cols: Optional[Sequence[str]] = None,
+        returning: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """
+        Insert items or update existing ones with INSERT ... ON CONFLICT DO UPDATE
+
+        :param items: Entity objects or dicts with column values
+        :param conflict_cols: Columns of unique index that define existing item
+        :param update_cols: Columns to update for existing items
+            (all given columns except conflict_cols by default)
+        :param returning: Columns to return (only ids are returned if not set)
+        :return: Ids or dicts with returning columns in order of items
+        """
+        if not items:
+            return []
+        connection = await self.db_session.connection()
+        if connection.dialect.name not in UPSERT_INSERTS:
+            raise error.UnsupportedOperation(
+                operation="upsert", dialect=connection.dialect.name
+            )
+        rows = self._get_rows(items)
+        if update_cols is None:
+            update_cols = [
+                it for it in rows[0] if it not in conflict_cols and it != "id"
+            ]
+        q = UPSERT_INSERTS[connection.dialect.name](self.entity)
+        set_ = {it: q.excluded[it] for it in update_cols}
+        if "updated_at" in class_mapper(self.entity).columns:
+            set_.setdefault("updated_at", func.now())
+        q = q.on_conflict_do_update(index_elements=conflict_cols, set_=set_).returning(
+            *self._get_returning(returning), sort_by_parameter_order=True
+        )
+        try:
+            result = await self.db_session.execute(q, rows)
+        except Exception as e:
+            await self.db_session.rollback()  # noqa
+            raise e
+        return self._get_returned(result, returning)
 
     async def delete(self, **kwargs: Any) -> None:
         await self.db_session.execute(self._setup_query(operator=delete, **kwargs))
@@ -0,0 +1,90 @@
+from collections import defaultdict
+from itertools import chain
+from typing import Any, Dict, Hashable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.settings import settings
+from app.util.cache import TTLCache
+
+
+class CountCache:
+    """
+    Per-worker cache of list counts by table and filter
+
+    Every table has a generation number that is increased on any write to the table
+    made in this worker (see listeners below), so cached counts of the table are not
+    used anymore. Writes made by other workers are seen after ``ttl`` seconds.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._counts: TTLCache[Hashable, int] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: Dict[str, int] = defaultdict(int)
+
+    def invalidate(self, table: str) -> None:
+        self._generations[table] += 1
+
+    def get(self, table: str, key: Hashable) -> Optional[int]:
+        return self._counts.get((table, self._generations[table], key))
+
+    def set(self, table: str, key: Hashable, count: int) -> None:
+        self._counts.set((table, self._generations[table], key), count)
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+
+count_cache = CountCache(
+    maxsize=settings.COUNT_CACHE_SIZE, ttl=settings.COUNT_CACHE_TTL
+)
+
+
+def get_filter_key(filters: Dict[str, Any]) -> Hashable:
+    return tuple(sorted((k, repr(v)) for k, v in filters.items()))
+
+
+class Explain(Executable, ClauseElement):
+    """
+    Postgres EXPLAIN (FORMAT JSON) of statement, parameters of statement are bound
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: Any):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element: Explain, compiler: SQLCompiler, **kwargs: Any) -> str:
+    # statement is compiled as nested one, so types of its columns
+    # are not applied to rows of plan
+    compiler.stack.append(
+        {
+            "correlate_froms": set(),
+            "asfrom_froms": set(),
+            "selectable": element.statement,
+        }
+    )
+    try:
+        return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
+    finally:
+        compiler.stack.pop()
+
+
+@event.listens_for(Session, "after_flush")
+def invalidate_flushed(session: Session, flush_context: UOWTransaction) -> None:
+    for item in chain(session.new, session.dirty, session.deleted):
+        if table := getattr(item, "__tablename__", None):
+            count_cache.invalidate(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def invalidate_executed(state: ORMExecuteState) -> None:
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    if state.bind_mapper is not None:
+        count_cache.invalidate(state.bind_mapper.class_.__tablename__)
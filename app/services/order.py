@@ -1,10 +1,13 @@
+from datetime import datetime
+from typing import List, Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import schemas
 from app.core import message
 from app.db import entities
 
-from .base import BaseService
+from .base import BaseService, LoadPlan, LoadStrategy
 
 
 class OrderService(BaseService):
@@ -14,12 +17,22 @@ class OrderService(BaseService):
             entity=entities.Order,
             entity_name=message.MODEL_ORDER,
             sorting_fields=entities.OrderSortingFields,
+            # everything schemas.Order has, parent order with its own relationships
+            load_plan={
+                "order_type.params": LoadStrategy.SELECTIN,
+                "params": LoadStrategy.SELECTIN,
+                "history": LoadStrategy.SELECTIN,
+                "parent_order.order_type.params": LoadStrategy.SELECTIN,
+                "parent_order.params": LoadStrategy.SELECTIN,
+                "parent_order.history": LoadStrategy.SELECTIN,
+            },
         )
 
     async def create(
         self,
         item: schemas.OrderCreate,
         order_type: entities.OrderType,
+        load_plan: Optional[LoadPlan] = None,
     ) -> entities.Order:
         if str(order_type.dep_type) != schemas.OrderDepType.MAIN and item.parent_order_id is None:
             raise ValueError(message.ERROR_NO_PARENT_ORDER)
@@ -36,5 +49,26 @@ class OrderService(BaseService):
                 user_implementer=item.user_implementer,
                 parent_order_id=item.parent_order_id,
                 order_type_id=order_type.id,
-            )
+            ),
+            load_plan=load_plan,
+        )
+
+    async def read_child_statuses(self, parent_order_id: str) -> List[str]:
+        """
+        Read statuses of child orders without loading orders themselves
+        """
+        return await self.read_scalar("status", parent_order_id=parent_order_id)
+
+    async def read_ids_in_status(
+        self, status: schemas.OrderStatus, changed_before: datetime
+    ) -> List[str]:
+        """
+        Read ids of orders that are in status since before given time
+        (range scan of status and status_changed_at index)
+        """
+        return await self.read_ids(
+            status=status,
+            modifiers=[
+                lambda q: q.filter(self.entity.status_changed_at < changed_before)
+            ],
         )
@@ -1,3 +1,4 @@
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import schemas
@@ -22,8 +23,8 @@ class OrderStatusUpdateService(BaseService):
         order_id: str,
         new_order_status: schemas.OrderStatus,
         old_order_status: schemas.OrderStatus,
-    ) -> entities.Order:
-        return await self._create(
+    ) -> entities.OrderStatusUpdate:
+        created = await self._create(
             item=entities.OrderStatusUpdate(
                 order_id=order_id,
                 new_status=new_order_status,
@@ -31,3 +32,9 @@ class OrderStatusUpdateService(BaseService):
                 user=user.user_id,
             )
         )
+        await self.db_session.execute(
+            update(entities.Order)
+            .where(entities.Order.id == order_id)
+            .values(status_changed_at=created.created_at)
+        )
+        return created
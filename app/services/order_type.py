@@ -1,10 +1,12 @@
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import schemas
 from app.core import message
 from app.db import entities
 
-from .base import BaseService
+from .base import BaseService, LoadPlan, LoadStrategy
 
 
 class OrderTypeService(BaseService):
@@ -14,12 +16,16 @@ class OrderTypeService(BaseService):
             entity=entities.OrderType,
             entity_name=message.MODEL_ORDER_TYPE,
             sorting_fields=entities.OrderTypeSortingFields,
+            load_plan={"params": LoadStrategy.SELECTIN},
         )
 
-    async def create(self, item: schemas.OrderTypeCreate) -> entities.OrderType:
+    async def create(
+        self, item: schemas.OrderTypeCreate, load_plan: Optional[LoadPlan] = None
+    ) -> entities.OrderType:
         return await self._create(
             item=entities.OrderType(
                 name=item.name,
                 dep_type=item.dep_type,
-            )
+            ),
+            load_plan=load_plan,
         )
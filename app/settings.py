@@ -1,6 +1,6 @@
 import os.path
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 import toml
 from pydantic import BaseSettings, validator
@@ -40,6 +40,13 @@ class Settings(BaseSettings):
             )
         return v
 
+    PAGINATION_COUNT_STRATEGY: str = "exact"  # exact | cached | estimated
+    COUNT_CACHE_TTL: int = 60
+    COUNT_CACHE_SIZE: int = 10000
+    COUNT_ESTIMATE_THRESHOLD: int = 10000
+    STATEMENT_CACHE_SIZE: int = 500  # 0 disables cache
+    SERIALIZER_CACHE_SIZE: int = 500  # 0 disables cache
+
     KEYCLOAK_URL: str
     KEYCLOAK_URL_EXTERNAL: str
     KEYCLOAK_REALM: str
@@ -47,6 +54,26 @@ class Settings(BaseSettings):
     KEYCLOAK_CLIENT_ID_SERIVCE: str
     KEYCLOAK_CLIENT_SECRET_SERIVCE: str
     KEYCLOAK_OPENID_CONFIG: Dict = {}
+    KEYCLOAK_TOKEN_VERIFY_MODE: str = "local"  # local | introspect
+    KEYCLOAK_TOKEN_AUDIENCE: Optional[str] = None
+    KEYCLOAK_TOKEN_LEEWAY: int = 0
+    KEYCLOAK_JWKS_REFRESH_INTERVAL: int = 3600
+    KEYCLOAK_TOKEN_CACHE_TTL: int = 30
+    KEYCLOAK_TOKEN_CACHE_SIZE: int = 10000
+    KEYCLOAK_HTTP_MAX_CONNECTIONS: int = 100
+    KEYCLOAK_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    KEYCLOAK_HTTP_KEEPALIVE_EXPIRY: float = 30
+    KEYCLOAK_HTTP_TIMEOUT: float = 10
+    KEYCLOAK_HTTP_CONNECT_TIMEOUT: float = 5
+    KEYCLOAK_HTTP2: bool = False
+    KEYCLOAK_METADATA_CACHE_TTL: int = 300
+    KEYCLOAK_REQUEST_CONCURRENCY: int = 8
+    KEYCLOAK_AUTH_CONFIG_CACHE_TTL: int = 300
+    KEYCLOAK_AUTH_CONFIG_MAX_AGE: int = 60
+    USER_DIRECTORY_ENABLED: bool = True
+    USER_DIRECTORY_PAGE_SIZE: int = 100
+    USER_DIRECTORY_RESYNC_INTERVAL: int = 600
+    USER_LOOKUP_CACHE_TTL: int = 30
 
     @validator("KEYCLOAK_OPENID_CONFIG")
     def validate_keycloak(cls, v: str, values: dict) -> str:  # noqa
@@ -0,0 +1,26 @@
+import base64
+import json
+from typing import Any, Dict
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core import error
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    """
+    Encode cursor data to opaque url-safe string
+    """
+    body = json.dumps(jsonable_encoder(data), separators=(",", ":"))
+    return base64.urlsafe_b64encode(body.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except ValueError:
+        raise error.IncorrectCursor(cursor=cursor)
+    if not isinstance(data, dict):
+        raise error.IncorrectCursor(cursor=cursor)
+    return data
@@ -0,0 +1,44 @@
+import os
+import threading
+import time
+from uuid import UUID
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+COUNTER_BITS = 12
+RANDOM_BITS = 62
+
+
+def uuid7() -> UUID:
+    """
+    Time-ordered UUID version 7 (RFC 9562): 48 bits of unix time in milliseconds,
+    12 bits counter of ids generated in the same millisecond, 62 random bits.
+
+    Ids generated by process are strictly increasing, so new rows are appended
+    to the end of primary key index instead of random pages of it
+    """
+    global _last_ms, _counter
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            # random start leaves at least half of counter for the same millisecond
+            _last_ms = ms
+            _counter = int.from_bytes(os.urandom(2), "big") >> (17 - COUNTER_BITS)
+        else:
+            # same millisecond or clock went back: continue previous sequence
+            _counter += 1
+            if _counter >> COUNTER_BITS:
+                _last_ms += 1
+                _counter = 0
+        ms, counter = _last_ms, _counter
+    random_bits = int.from_bytes(os.urandom(8), "big") >> (64 - RANDOM_BITS)
+    return UUID(int=ms << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | random_bits)
+
+
+def gen_id() -> str:
+    """
+    New id of entity
+    """
+    return str(uuid7())
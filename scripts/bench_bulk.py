@@ -0,0 +1,117 @@
+"""
+Benchmark BaseService bulk APIs against per-row create / update loop
+
+Materials of one order are created, updated and upserted, rows per second
+are printed for every method. Data is created in a transaction that is rolled
+back at the end, so any database may be used (tables are created for sqlite).
+
+Usage: python bench_bulk.py --rows 5000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Fix import for app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import schemas, services  # noqa
+from app.db import entities  # noqa
+from app.db.base_class import Base  # noqa
+from app.settings import settings  # noqa
+
+USER = schemas.User(name="bench", user_id="bench", roles=[])
+
+
+async def measure(name: str, rows: int, fn: Callable[[], Awaitable]) -> None:
+    started = time.perf_counter()
+    await fn()
+    elapsed = time.perf_counter() - started
+    print(f"{name:>12}: {elapsed:8.3f}s {rows / elapsed:10.0f} rows/s")
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_uri)
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        if connection.dialect.name == "sqlite":
+            await connection.run_sync(Base.metadata.create_all)
+        session = AsyncSession(bind=connection)
+        order_type = await services.OrderTypeService(session).create(
+            schemas.OrderTypeCreate(name="Заказ на баню", dep_type="MAIN")
+        )
+        order = await services.OrderService(session).create(
+            schemas.OrderCreate(
+                user_customer="customer",
+                user_implementer="implementer",
+                order_type_id=order_type.id,
+            ),
+            order_type=order_type,
+        )
+        service = services.MaterialsService(session)
+        item = schemas.MaterialCreate(
+            name="Дрова",
+            amount=1,
+            value_type=schemas.MaterialValueType.MASS,
+            item_price=100,
+        )
+        loop_ids: List[str] = []
+        bulk_ids: List[str] = []
+
+        async def loop_create() -> None:
+            for _ in range(args.rows):
+                created = await service.create(item=item, user=USER, order=order)
+                loop_ids.append(created.id)
+
+        async def bulk_create() -> None:
+            for start in range(0, args.rows, args.batch):
+                rows = [
+                    entities.Material(
+                        **item.dict(),
+                        user_creator=USER.user_id,
+                        user_updator=USER.user_id,
+                        order_id=order.id,
+                    )
+                    for _ in range(min(args.batch, args.rows - start))
+                ]
+                bulk_ids.extend(await service.bulk_create(rows))
+
+        async def loop_update() -> None:
+            for id in loop_ids:
+                await service.update(id=id, amount=2)
+
+        async def bulk_update() -> None:
+            for start in range(0, args.rows, args.batch):
+                await service.bulk_update(
+                    bulk_ids[start:start + args.batch], {"amount": 2}
+                )
+
+        async def bulk_upsert() -> None:
+            for start in range(0, args.rows, args.batch):
+                await service.bulk_upsert(
+                    [
+                        {"id": id, "amount": 3, "order_id": order.id}
+                        for id in bulk_ids[start:start + args.batch]
+                    ],
+                    conflict_cols=["id"],
+                )
+
+        await measure("loop create", args.rows, loop_create)
+        await measure("bulk create", args.rows, bulk_create)
+        await measure("loop update", args.rows, loop_update)
+        await measure("bulk update", args.rows, bulk_update)
+        await measure("bulk upsert", args.rows, bulk_upsert)
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-uri", default=settings.DATABASE_URI)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000)
+    asyncio.run(run(parser.parse_args()))
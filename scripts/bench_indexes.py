@@ -0,0 +1,225 @@
+"""
+Compare query plans of hot order queries without and with indexes
+of the filter indexes migrations (3031e066f6b8, ce88df3f104c)
+
+Dataset of orders with params, status history and materials is generated,
+then every query is explained (and timed) with the indexes dropped and created.
+Data is created in a transaction that is rolled back at the end, so any database
+may be used (tables are created for sqlite).
+
+Usage: python bench_indexes.py --orders 50000 --customers 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+# Fix import for app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import schemas  # noqa
+from app.db import entities  # noqa
+from app.db.base_class import Base  # noqa
+from app.settings import settings  # noqa
+
+INDEXES = {
+    "ix_order_status_status_changed_at",
+    "ix_order_user_implementer",
+    "ix_order_parent_order_id",
+    "ix_order_user_customer_created_at",
+    "ix_order_order_type_id_status_created_at",
+    "ix_order_type_param_order_type_id",
+    "ix_order_param_value_order_id",
+    "ix_order_param_value_order_type_param_id",
+    "ix_order_status_update_order_id_created_at",
+    "ix_order_confirmation_order_id",
+    "ix_material_order_id",
+}
+NOW = datetime(2023, 5, 1, tzinfo=timezone.utc)
+
+
+def gen_id() -> str:
+    return str(uuid.uuid4())
+
+
+def timestamps(i: int) -> Dict[str, Any]:
+    created_at = NOW + timedelta(seconds=i)
+    return {"id": gen_id(), "created_at": created_at, "updated_at": created_at}
+
+
+async def seed(connection: AsyncConnection, args: argparse.Namespace) -> Dict:
+    order_types = [
+        {**timestamps(0), "name": name, "dep_type": schemas.OrderDepType.MAIN}
+        for name in schemas.OrderTypeName
+    ]
+    type_params = [
+        {
+            **timestamps(0),
+            "name": f"param {i}",
+            "value_type": "string",
+            "required": False,
+            "order_type_id": order_type["id"],
+        }
+        for order_type in order_types
+        for i in range(3)
+    ]
+    # most orders are finished, few are waiting for removal
+    statuses = list(schemas.OrderStatus)
+    weights = [5, 5, 10, 30, 40, 1, 9]
+    orders: List[Dict] = []
+    for i in range(args.orders):
+        order_type = random.choice(order_types)
+        orders.append(
+            {
+                **timestamps(i),
+                "status": random.choices(statuses, weights)[0],
+                "user_customer": f"customer {random.randrange(args.customers)}",
+                "user_implementer": f"implementer {random.randrange(10)}",
+                "order_type_id": order_type["id"],
+                "parent_order_id": orders[-1]["id"] if i % 3 == 2 else None,
+            }
+        )
+    await connection.execute(insert(entities.OrderType), order_types)
+    await connection.execute(insert(entities.OrderTypeParam), type_params)
+    for start in range(0, len(orders), args.batch):
+        batch = orders[start:start + args.batch]
+        await connection.execute(insert(entities.Order), batch)
+        await connection.execute(
+            insert(entities.OrderStatusUpdate),
+            [
+                {
+                    **timestamps(start + k),
+                    "user": "user",
+                    "old_status": schemas.OrderStatus.NEW,
+                    "new_status": order["status"],
+                    "order_id": order["id"],
+                }
+                for k, order in enumerate(batch)
+                for _ in range(args.history)
+            ],
+        )
+        await connection.execute(
+            insert(entities.Material),
+            [
+                {
+                    **timestamps(start + k),
+                    "name": "Дрова",
+                    "amount": 1,
+                    "value_type": schemas.MaterialValueType.MASS,
+                    "item_price": 100,
+                    "order_id": order["id"],
+                }
+                for k, order in enumerate(batch)
+            ],
+        )
+    return {"order": orders[len(orders) // 2], "order_type": order_types[0]}
+
+
+def get_queries(sample: Dict) -> Dict[str, Any]:
+    order, order_type = sample["order"], sample["order_type"]
+    Order = entities.Order
+    page = Order.created_at.desc()
+    return {
+        "customer orders page": select(Order)
+        .where(Order.user_customer == order["user_customer"])
+        .order_by(page)
+        .limit(20),
+        "orders of type by status": select(Order)
+        .where(
+            Order.order_type_id == order_type["id"],
+            Order.status == schemas.OrderStatus.NEW,
+        )
+        .order_by(page)
+        .limit(20),
+        "implementer orders": select(Order).where(
+            Order.user_implementer == order["user_implementer"]
+        ),
+        "orders to remove": select(Order).where(
+            Order.status == schemas.OrderStatus.TO_REMOVE
+        ),
+        "child orders": select(Order).where(Order.parent_order_id == order["id"]),
+        "order history": select(entities.OrderStatusUpdate)
+        .where(entities.OrderStatusUpdate.order_id == order["id"])
+        .order_by(entities.OrderStatusUpdate.created_at),
+        "order materials": select(entities.Material).where(
+            entities.Material.order_id == order["id"]
+        ),
+        "order type params": select(entities.OrderTypeParam).where(
+            entities.OrderTypeParam.order_type_id == order_type["id"]
+        ),
+    }
+
+
+async def explain(connection: AsyncConnection, query: Any) -> str:
+    sql = str(
+        query.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    if connection.dialect.name == "sqlite":
+        rows = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+        return "; ".join(row[-1] for row in rows)
+    rows = await connection.exec_driver_sql(f"EXPLAIN (COSTS OFF) {sql}")
+    return "; ".join(row[0].strip().lstrip("-> ") for row in rows)
+
+
+async def measure(connection: AsyncConnection, query: Any, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        (await connection.execute(query)).all()
+    return (time.perf_counter() - started) / repeat
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_uri)
+    indexes = [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if index.name in INDEXES
+    ]
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        if connection.dialect.name == "sqlite":
+            await connection.run_sync(Base.metadata.create_all)
+        for index in indexes:
+            await connection.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+        queries = get_queries(await seed(connection, args))
+        results: Dict[str, List] = {name: [] for name in queries}
+        for create in (False, True):
+            if create:
+                for index in indexes:
+                    await connection.run_sync(index.create)
+            await connection.exec_driver_sql("ANALYZE")
+            for name, query in queries.items():
+                results[name].append(
+                    (
+                        await explain(connection, query),
+                        await measure(connection, query, args.repeat),
+                    )
+                )
+        for name, ((old_plan, old), (new_plan, new)) in results.items():
+            print(f"{name}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms")
+            print(f"    before: {old_plan}")
+            print(f"    after:  {new_plan}")
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-uri", default=settings.DATABASE_URI)
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--history", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
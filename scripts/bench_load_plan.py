@@ -0,0 +1,153 @@
+"""
+Benchmark orders page loading: previous joined eager loading of all relationships
+against OrderService load plan (joined many-to-one, selectin collections)
+
+Prints number of queries, number of rows returned by database and time per page.
+Data is created in a transaction that is rolled back at the end, so any database
+may be used (tables are created for sqlite).
+
+Usage: python bench_load_plan.py --orders 200 --history 20 --limit 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (AsyncConnection, AsyncSession,
+                                    create_async_engine)
+
+# Fix import for app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import schemas, services  # noqa
+from app.db import entities  # noqa
+from app.db.base_class import Base  # noqa
+from app.settings import settings  # noqa
+
+JOINED = services.LoadStrategy.JOINED
+# lazy="joined" of all relationships as it was set in entities
+ALL_JOINED: services.LoadPlan = {
+    "order_type.params": JOINED,
+    "params": JOINED,
+    "history": JOINED,
+    "parent_order.order_type.params": JOINED,
+    "parent_order.params": JOINED,
+    "parent_order.history": JOINED,
+}
+
+
+async def seed(
+    session: AsyncSession, orders_n: int, params_n: int, history_n: int
+) -> None:
+    order_type = entities.OrderType(name="Заказ на баню", dep_type="MAIN")
+    session.add(order_type)
+    await session.flush()
+    type_params = [
+        entities.OrderTypeParam(
+            name=f"param {i}",
+            value_type="string",
+            required=False,
+            order_type_id=order_type.id,
+        )
+        for i in range(params_n)
+    ]
+    session.add_all(type_params)
+    await session.flush()
+    for i in range(orders_n):
+        order = entities.Order(
+            status="NEW",
+            user_customer="customer",
+            user_implementer="implementer",
+            order_type_id=order_type.id,
+        )
+        session.add(order)
+        await session.flush()
+        session.add_all(
+            entities.OrderParamValue(
+                value=f"value {i}",
+                order_id=order.id,
+                order_type_param_id=type_param.id,
+            )
+            for type_param in type_params
+        )
+        session.add_all(
+            entities.OrderStatusUpdate(
+                user="user", old_status="NEW", new_status="READY", order_id=order.id
+            )
+            for _ in range(history_n)
+        )
+    await session.flush()
+    session.expunge_all()
+
+
+async def count_rows(
+    connection: AsyncConnection, statements: List[Tuple[str, Any]]
+) -> int:
+    rows = 0
+    for statement, parameters in statements:
+        rows += (
+            await connection.exec_driver_sql(
+                f"SELECT count(*) FROM ({statement}) AS q", parameters
+            )
+        ).scalar_one()
+    return rows
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_uri)
+    statements: List[Tuple[str, Any]] = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, *_: statements.append(
+            (statement, parameters)
+        ),
+    )
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        if connection.dialect.name == "sqlite":
+            await connection.run_sync(Base.metadata.create_all)
+        session = AsyncSession(bind=connection)
+        await seed(session, args.orders, args.params, args.history)
+        sorting = schemas.SortingList(
+            sorting_list=[
+                schemas.SortingListItem(type=schemas.SortingType.DESC, field="id")
+            ]
+        )
+        for name, load_plan in [("all joined", ALL_JOINED), ("load plan", None)]:
+            service = services.OrderService(session)
+            elapsed = 0.0
+            for _ in range(args.repeat):
+                session.expunge_all()
+                statements.clear()
+                started = time.perf_counter()
+                page = await service.read_many_paginated(
+                    wrapper_class=schemas.Order,
+                    limit=args.limit,
+                    sorting_list=sorting,
+                    load_plan=load_plan,
+                )
+                elapsed += time.perf_counter() - started
+            queries = list(statements)
+            rows = await count_rows(connection, queries)
+            print(
+                f"{name:>10}: {len(queries):3d} queries {rows:8d} rows "
+                f"{elapsed / args.repeat * 1000:8.2f} ms "
+                f"({len(page.results)} orders)"
+            )
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-uri", default=settings.DATABASE_URI)
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--params", type=int, default=10)
+    parser.add_argument("--history", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,143 @@
+"""
+Benchmark serialization of orders page: previous jsonable_encoder + pydantic path
+against compiled serializers (schemas.serialize_many)
+
+Orders are built in memory, every order has parent order, params, full status history
+and order type with its params (as loaded by order endpoints).
+
+Usage: python bench_serialization.py --orders 100 --history 20 --repeat 50
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm.attributes import set_committed_value
+
+# Fix import for app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import schemas  # noqa
+from app.db import entities  # noqa
+
+NOW = datetime(2023, 5, 1, tzinfo=timezone.utc)
+
+
+def timestamps(i: int) -> dict:
+    created_at = NOW + timedelta(minutes=i)
+    return {"id": str(uuid4()), "created_at": created_at, "updated_at": created_at}
+
+
+def make_order_type(params_n: int) -> entities.OrderType:
+    order_type = entities.OrderType(
+        name="Заказ на баню", dep_type="MAIN", **timestamps(0)
+    )
+    params = [
+        entities.OrderTypeParam(
+            name=f"param {i}",
+            value_type="string",
+            required=bool(i % 2),
+            order_type_id=order_type.id,
+            **timestamps(i),
+        )
+        for i in range(params_n)
+    ]
+    set_committed_value(order_type, "params", params)
+    return order_type
+
+
+def make_order(
+    i: int, order_type: entities.OrderType, history_n: int, parent: Any = None
+) -> entities.Order:
+    order = entities.Order(
+        status="IN PROGRESS",
+        user_customer=str(uuid4()),
+        user_implementer=str(uuid4()),
+        order_type_id=order_type.id,
+        parent_order_id=parent.id if parent is not None else None,
+        **timestamps(i),
+    )
+    params = [
+        entities.OrderParamValue(
+            value=f"value {k}",
+            order_id=order.id,
+            order_type_param_id=type_param.id,
+            **timestamps(k),
+        )
+        for k, type_param in enumerate(order_type.params)
+    ]
+    for param, type_param in zip(params, order_type.params):
+        set_committed_value(param, "order_type_param", type_param)
+    history = [
+        entities.OrderStatusUpdate(
+            user=str(uuid4()),
+            old_status="NEW",
+            new_status="READY",
+            order_id=order.id,
+            **timestamps(k),
+        )
+        for k in range(history_n)
+    ]
+    set_committed_value(order, "order_type", order_type)
+    set_committed_value(order, "params", params)
+    set_committed_value(order, "history", history)
+    set_committed_value(order, "parent_order", parent)
+    return order
+
+
+def encoder_path(orders: List[entities.Order]) -> str:
+    """Previous path: jsonable_encoder -> pydantic -> response_model -> json"""
+    response = schemas.PaginatedResponse(
+        results=[schemas.Order(**jsonable_encoder(it)) for it in orders],
+        count=len(orders),
+        next=None,
+        previous=None,
+    )
+    validated = schemas.PaginatedResponse.validate(jsonable_encoder(response))
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False)
+
+
+def serializer_path(orders: List[entities.Order]) -> str:
+    response = schemas.PaginatedResponse(
+        results=schemas.serialize_many(schemas.Order, orders),
+        count=len(orders),
+        next=None,
+        previous=None,
+    )
+    # as util.json_response does
+    return json.dumps(dict(response), ensure_ascii=False)
+
+
+def measure(fn: Callable[[List], str], orders: List, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(orders)
+    return (time.perf_counter() - started) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--history", type=int, default=20)
+    parser.add_argument("--params", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    order_type = make_order_type(args.params)
+    parent = make_order(0, order_type, args.history)
+    orders = [
+        make_order(i, order_type, args.history, parent=parent)
+        for i in range(args.orders)
+    ]
+    if json.loads(encoder_path(orders)) != json.loads(serializer_path(orders)):
+        raise AssertionError("Serializers output differs from previous path")
+    print(f"{len(encoder_path(orders)) / 1024:.0f} KiB page of {args.orders} orders")
+    old = measure(encoder_path, orders, args.repeat)
+    new = measure(serializer_path, orders, args.repeat)
+    print(f"jsonable_encoder + pydantic: {old * 1000:8.2f} ms")
+    print(f"compiled serializer:         {new * 1000:8.2f} ms ({old / new:.1f}x)")
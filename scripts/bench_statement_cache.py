@@ -0,0 +1,131 @@
+"""
+Benchmark BaseService statement cache on the hottest query shapes:
+order by id (path dependency) and page of orders by type and customer
+
+For every shape CPU time per request is printed with statement cache disabled
+and enabled: query building only (statement and its SQLAlchemy cache key, as
+done on every execution) and the whole request to database.
+Data is created in a transaction that is rolled back at the end, so any database
+may be used (tables are created for sqlite).
+
+Usage: python bench_statement_cache.py --orders 100 --repeat 500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Fix import for app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import schemas, services  # noqa
+from app.db import entities  # noqa
+from app.db.base_class import Base  # noqa
+from app.services.base import statement_cache  # noqa
+from app.settings import settings  # noqa
+
+
+def build(service: services.OrderService, kind: str, kwargs: Dict) -> None:
+    builder = (
+        service._setup_query if kind == "select" else service._setup_query_with_count
+    )
+    q, _ = service._get_cached_query(builder, kind=kind, **kwargs)
+    q._generate_cache_key()
+
+
+async def measure(repeat: int, fn: Callable[[], Awaitable[Any]]) -> float:
+    started = time.process_time()
+    for _ in range(repeat):
+        await fn()
+    return (time.process_time() - started) / repeat
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_uri)
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        if connection.dialect.name == "sqlite":
+            await connection.run_sync(Base.metadata.create_all)
+        session = AsyncSession(bind=connection)
+        order_type = entities.OrderType(name="Заказ на баню", dep_type="MAIN")
+        session.add(order_type)
+        await session.flush()
+        orders: List[entities.Order] = []
+        for i in range(args.orders):
+            orders.append(
+                entities.Order(
+                    status="NEW",
+                    user_customer=f"customer {i % 10}",
+                    user_implementer="implementer",
+                    order_type_id=order_type.id,
+                )
+            )
+        session.add_all(orders)
+        await session.flush()
+        service = services.OrderService(session)
+        sorting = schemas.SortingList(
+            sorting_list=[
+                schemas.SortingListItem(
+                    type=schemas.SortingType.DESC, field="created_at"
+                )
+            ]
+        )
+        shapes = [
+            ("order by id", "select", {"id": orders[0].id}),
+            (
+                "orders page",
+                "with_count",
+                {
+                    "order_type_id": order_type.id,
+                    "user_customer": ["customer 1"],
+                    "sorting_list": sorting,
+                    "offset": 0,
+                    "limit": 20,
+                },
+            ),
+        ]
+        for name, kind, kwargs in shapes:
+            request = (
+                service.read_one if kind == "select" else service.read_many_with_count
+            )
+            results = []
+            for cache_size in (0, args.cache_size):
+                settings.STATEMENT_CACHE_SIZE = cache_size
+                statement_cache.clear()
+
+                async def build_query() -> None:
+                    build(service, kind, kwargs)
+
+                async def execute() -> None:
+                    await request(**kwargs)
+
+                await execute()
+                results.append(
+                    (
+                        await measure(args.repeat, build_query),
+                        await measure(args.repeat, execute),
+                    )
+                )
+            (old_build, old_request), (new_build, new_request) = results
+            print(
+                f"{name:>12}: build {old_build * 1e6:7.0f} -> {new_build * 1e6:5.0f} us, "
+                f"request {old_request * 1e6:7.0f} -> {new_request * 1e6:7.0f} us "
+                f"(saved {(old_request - new_request) * 1e6:.0f} us CPU per request)"
+            )
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-uri", default=settings.DATABASE_URI)
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument(
+        "--cache-size", type=int, default=settings.STATEMENT_CACHE_SIZE or 500
+    )
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,135 @@
+"""
+Measure storage of order status history: previous varchar status columns
+against order_status enum (postgres only)
+
+Two copies of order_status_update table with status index are filled
+with the same synthetic history by the database itself, then sizes of
+tables and indexes are printed. Tables are created in a transaction that
+is rolled back at the end.
+
+Usage: python bench_status_storage.py --rows 10000000
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+# Fix import for app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import schemas  # noqa
+from app.settings import settings  # noqa
+
+STATUS_TYPES = {"varchar": "varchar(100)", "enum": "order_status"}
+
+
+async def create_table(
+    connection: AsyncConnection, name: str, status_type: str, rows: int
+) -> None:
+    table = f"bench_history_{name}"
+    await connection.execute(
+        text(
+            f"""
+            CREATE TABLE {table} (
+                "user" varchar(100),
+                old_status {status_type},
+                new_status {status_type},
+                order_id uuid NOT NULL,
+                id uuid PRIMARY KEY,
+                created_at timestamptz,
+                updated_at timestamptz
+            )
+            """
+        )
+    )
+    # every order goes through all statuses, one history row per transition
+    await connection.execute(
+        text(
+            f"""
+            INSERT INTO {table}
+            SELECT
+                'user',
+                CAST(statuses[1 + (i - 1) % cardinality(statuses)] AS {status_type}),
+                CAST(statuses[1 + i % cardinality(statuses)] AS {status_type}),
+                CAST(md5(CAST(i / cardinality(statuses) AS text)) AS uuid),
+                CAST(md5(CAST(i AS text)) AS uuid),
+                now(),
+                now()
+            FROM generate_series(1, CAST(:rows AS integer)) AS i,
+                CAST(:statuses AS text[]) AS statuses
+            """
+        ),
+        {"rows": rows, "statuses": schemas.OrderStatus.values()},
+    )
+    await connection.execute(
+        text(f"CREATE INDEX {table}_new_status ON {table} (new_status)")
+    )
+    await connection.execute(
+        text(f"CREATE INDEX {table}_order_id ON {table} (order_id, created_at)")
+    )
+    await connection.execute(text(f"ANALYZE {table}"))
+
+
+async def get_sizes(connection: AsyncConnection, name: str) -> dict:
+    table = f"bench_history_{name}"
+    return (
+        (
+            await connection.execute(
+                text(
+                    "SELECT pg_relation_size(CAST(:table AS regclass)) AS table_size, "
+                    "pg_indexes_size(CAST(:table AS regclass)) AS indexes_size, "
+                    "pg_relation_size(CAST(:index AS regclass)) AS status_index_size"
+                ),
+                {"table": table, "index": f"{table}_new_status"},
+            )
+        )
+        .mappings()
+        .one()
+    )
+
+
+def mib(size: int) -> str:
+    return f"{size / 1024 / 1024:9.1f} MiB"
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_uri)
+    async with engine.connect() as connection:
+        if connection.dialect.name != "postgresql":
+            raise SystemExit("Only postgres is supported")
+        transaction = await connection.begin()
+        exists = (
+            await connection.execute(
+                text("SELECT count(*) FROM pg_type WHERE typname = 'order_status'")
+            )
+        ).scalar_one()
+        if not exists:
+            values = ", ".join(f"'{it}'" for it in schemas.OrderStatus.values())
+            await connection.execute(
+                text(f"CREATE TYPE order_status AS ENUM ({values})")
+            )
+        sizes = {}
+        for name, status_type in STATUS_TYPES.items():
+            await create_table(connection, name, status_type, args.rows)
+            sizes[name] = await get_sizes(connection, name)
+        for name, it in sizes.items():
+            print(
+                f"{name:>8}: table {mib(it['table_size'])}, "
+                f"indexes {mib(it['indexes_size'])}, "
+                f"status index {mib(it['status_index_size'])}"
+            )
+        old, new = sizes["varchar"], sizes["enum"]
+        for key in ("table_size", "indexes_size", "status_index_size"):
+            print(f"{key:>17} shrinkage: {1 - new[key] / old[key]:6.1%}")
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-uri", default=settings.DATABASE_URI)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    asyncio.run(run(parser.parse_args()))
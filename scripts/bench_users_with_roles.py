@@ -0,0 +1,112 @@
+"""
+Benchmark KeycloakClient.get_users_with_roles against fake keycloak
+
+Compares role-centric fetch with the previous per-user role requests.
+Fake keycloak answers every request after --latency milliseconds.
+
+Usage: python bench_users_with_roles.py --users 2000 --roles 10 --latency 5
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+# Fix import for app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.keycloak import KeycloakClient  # noqa
+from app.settings import settings  # noqa
+
+
+class FakeKeycloak:
+    def __init__(self, users_n: int, roles_n: int, latency: float):
+        self.latency = latency
+        self.requests = 0
+        self.roles = [
+            {"id": f"role-{i}", "name": f"role_{i}", "clientRole": True}
+            for i in range(roles_n)
+        ]
+        self.users = [{"id": f"user-{i}", "username": f"user{i}"} for i in range(users_n)]
+        # every user gets 1-3 roles
+        self.user_roles: Dict[str, List[Dict]] = {
+            user["id"]: [self.roles[(i + k) % roles_n] for k in range(1 + i % 3)]
+            for i, user in enumerate(self.users)
+        }
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        path = request.url.path
+        first = int(request.url.params.get("first", 0))
+        max_ = int(request.url.params.get("max", 100))
+        if path.endswith("/clients"):
+            return httpx.Response(200, json=[{"id": "client-uuid"}])
+        if path.endswith("/roles"):
+            return httpx.Response(200, json=self.roles)
+        if path.endswith("/users") and "/roles/" in path:
+            role_name = path.split("/")[-2]
+            members = [
+                user
+                for user in self.users
+                if role_name in [it["name"] for it in self.user_roles[user["id"]]]
+            ]
+            return httpx.Response(200, json=members[first:first + max_])
+        if "/role-mappings/clients/" in path:
+            user_id = path.split("/")[-4]
+            return httpx.Response(200, json=self.user_roles[user_id])
+        if path.endswith("/users"):
+            return httpx.Response(200, json=self.users[first:first + max_])
+        return httpx.Response(404)
+
+
+def get_client(fake: FakeKeycloak) -> KeycloakClient:
+    kc = KeycloakClient(
+        url="http://keycloak",
+        realm=settings.KEYCLOAK_REALM,
+        client_id="bench",
+        _access_token="token",
+        _access_token_exp=time.time() + 3600,
+    )
+    kc._http = httpx.AsyncClient(transport=httpx.MockTransport(fake))
+    kc._http_loop = asyncio.get_running_loop()
+    return kc
+
+
+async def per_user_roles(kc: KeycloakClient) -> List:
+    """Previous implementation: roles requested for every user one by one"""
+    users = await kc.get_users_all()
+    client_id = await kc.get_client_uuid()
+    for user in users:
+        user["roles"] = await kc.get_user_roles(user_id=user["id"], client_id=client_id)
+    return users
+
+
+async def run(users_n: int, roles_n: int, latency: float) -> None:
+    for name, method in [
+        ("per-user", per_user_roles),
+        ("role-centric", lambda kc: kc.get_users_with_roles()),
+    ]:
+        fake = FakeKeycloak(users_n, roles_n, latency)
+        kc = get_client(fake)
+        started = time.perf_counter()
+        users = await method(kc)
+        elapsed = time.perf_counter() - started
+        roles_assigned = sum(len(it["roles"]) for it in users)
+        print(
+            f"{name:>12}: {elapsed:8.3f}s {fake.requests:6d} requests "
+            f"{len(users)} users {roles_assigned} role mappings"
+        )
+        await kc.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--roles", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=5, help="milliseconds")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.roles, args.latency / 1000))
@@ -0,0 +1,126 @@
+"""
+Benchmark id columns: previous String(36) / String(50) keys against native uuid
+
+Parent and child tables are created for both key types and filled with the same
+ids, then size of primary and foreign key indexes, time of join of all children
+to parents and time of lookups by primary key are printed.
+Tables are created in a transaction that is rolled back at the end
+(index sizes are shown for postgres only, sqlite has no native uuid).
+
+Usage: python bench_uuid_keys.py --parents 100000 --children 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+# Fix import for app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.settings import settings  # noqa
+
+KEY_TYPES = {
+    "varchar": (sa.String(36), sa.String(50)),
+    "uuid": (sa.Uuid(as_uuid=False), sa.Uuid(as_uuid=False)),
+}
+
+
+def make_tables(name: str, metadata: sa.MetaData) -> Dict[str, sa.Table]:
+    id_type, fk_type = KEY_TYPES[name]
+    parent = sa.Table(
+        f"bench_{name}_parent",
+        metadata,
+        sa.Column("id", id_type, primary_key=True),
+        sa.Column("value", sa.Integer),
+    )
+    child = sa.Table(
+        f"bench_{name}_child",
+        metadata,
+        sa.Column("id", id_type, primary_key=True),
+        sa.Column("parent_id", fk_type, sa.ForeignKey(parent.c.id), index=True),
+    )
+    return {"parent": parent, "child": child}
+
+
+async def get_index_size(connection: AsyncConnection, table: sa.Table) -> Optional[int]:
+    if connection.dialect.name != "postgresql":
+        return None
+    return (
+        await connection.execute(
+            sa.text(
+                "SELECT sum(pg_relation_size(indexrelid)) FROM pg_index "
+                "WHERE indrelid = CAST(:table AS regclass)"
+            ),
+            {"table": table.name},
+        )
+    ).scalar_one()
+
+
+async def measure(connection: AsyncConnection, query: Any, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        (await connection.execute(query)).all()
+    return (time.perf_counter() - started) / repeat
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_uri)
+    metadata = sa.MetaData()
+    tables = {name: make_tables(name, metadata) for name in KEY_TYPES}
+    parents = [{"id": str(uuid.uuid4()), "value": i} for i in range(args.parents)]
+    children = [
+        {"id": str(uuid.uuid4()), "parent_id": parent["id"]}
+        for parent in parents
+        for _ in range(args.children)
+    ]
+    lookup_ids: List[str] = [
+        it["id"] for it in random.sample(parents, min(args.lookups, args.parents))
+    ]
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        await connection.run_sync(metadata.create_all)
+        for name, table in tables.items():
+            for rows, target in ((parents, "parent"), (children, "child")):
+                for start in range(0, len(rows), args.batch):
+                    await connection.execute(
+                        sa.insert(table[target]), rows[start:start + args.batch]
+                    )
+        await connection.exec_driver_sql("ANALYZE")
+        for name, table in tables.items():
+            parent, child = table["parent"], table["child"]
+            join = sa.select(sa.func.count(), sa.func.sum(parent.c.value)).select_from(
+                child.join(parent, child.c.parent_id == parent.c.id)
+            )
+            lookup = sa.select(parent.c.value).where(parent.c.id.in_(lookup_ids))
+            sizes = [await get_index_size(connection, it) for it in (parent, child)]
+            size = (
+                f"{sum(sizes) / 1024 / 1024:7.2f} MiB indexes"
+                if None not in sizes
+                else "indexes size n/a"
+            )
+            print(
+                f"{name:>8}: {size}, "
+                f"join {await measure(connection, join, args.repeat) * 1000:8.2f} ms, "
+                f"{len(lookup_ids)} lookups "
+                f"{await measure(connection, lookup, args.repeat) * 1000:8.2f} ms"
+            )
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-uri", default=settings.DATABASE_URI)
+    parser.add_argument("--parents", type=int, default=100000)
+    parser.add_argument("--children", type=int, default=5)
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
@@ -20,7 +20,9 @@ async def create_order(session, order_type: entities.OrderType) -> entities.Orde
     user_implementer_id = await Utils.get_random_user_id_order_manager()
     user_custormer_id = await Utils.get_random_user_id_customer()
     order_type_main = await order_type_service.read_one(dep_type="MAIN")
-    orders = await order_service.read_many(order_type_id=str(order_type_main.id))
+    orders = await order_service.read_many(
+        order_type_id=str(order_type_main.id), load_plan={}
+    )
     orders_ids = [it.id for it in orders]
     fields = {
         "user_customer": user_custormer_id,
@@ -46,19 +48,20 @@ def generate_order_param_value(value_type: schemas.OrderParamValueType):
 
 async def create_order_param(
     session, order_type: entities.OrderType, order: entities.Order
-) -> List[entities.OrderParamValue]:
+) -> List[str]:
     order_param_service = services.OrderParamValueService(session)
     order_type_param_service = services.OrderTypeParamService(session)
     params = await order_type_param_service.read_many(order_type_id=str(order_type.id))
-    created = []
-    for param in params:
-        value = generate_order_param_value(param.value_type)
-        created.append(
-            await order_param_service.create(
-                schemas.OrderParamValueCreate(value=str(value)), order, param
+    return await order_param_service.bulk_create(
+        [
+            entities.OrderParamValue(
+                value=str(generate_order_param_value(param.value_type)),
+                order_id=order.id,
+                order_type_param_id=param.id,
             )
-        )
-    return created
+            for param in params
+        ]
+    )
 
 
 async def generate(n: int):
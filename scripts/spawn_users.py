@@ -1,9 +1,21 @@
+"""
+Create keycloak users from json file
+
+Usage:
+    python spawn_users.py
+    python spawn_users.py --bulk --concurrency 32
+    python spawn_users.py --bulk --generate 5000 --prefix load --roles customer
+"""
+import argparse
 import asyncio
 import json
 import os
+import random
 import sys
+import time
 import traceback
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Set, TypeVar
 
 import httpx
 from dotenv import load_dotenv
@@ -21,6 +33,10 @@ sqlalchemy_database_uri = DATABASE_URI
 
 async_engine = create_async_engine(sqlalchemy_database_uri, pool_pre_ping=True)
 
+T = TypeVar("T")
+
+RETRY_STATUSES = {409, 429, 500, 502, 503, 504}
+
 
 async def create_users(users_list: List[Dict[str, str]]) -> None:
     from app.core import error
@@ -77,10 +93,155 @@ async def create_users(users_list: List[Dict[str, str]]) -> None:
             print(f"User creation error {traceback.format_exc()}")
 
 
+@dataclass
+class BulkStats:
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    retries: int = 0
+
+
+async def with_retries(
+    fn: Callable[[], Awaitable[T]],
+    stats: BulkStats,
+    retries: int,
+    backoff: float,
+    statuses: Set[int] = RETRY_STATUSES,
+) -> T:
+    """
+    Call keycloak, retry with exponential backoff (and jitter) on conflicts,
+    server errors and connection errors
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await fn()
+        except httpx.HTTPStatusError as ex:
+            if ex.response.status_code not in statuses or attempt == retries:
+                raise
+        except httpx.TransportError:
+            if attempt == retries:
+                raise
+        stats.retries += 1
+        await asyncio.sleep(backoff * 2**attempt * (0.5 + random.random()))
+    raise RuntimeError("unreachable")
+
+
+async def create_users_bulk(
+    users_list: List[Dict[str, Any]],
+    concurrency: int = 16,
+    retries: int = 5,
+    backoff: float = 0.2,
+) -> BulkStats:
+    """
+    Create users concurrently (at most ``concurrency`` users at once).
+    Client UUID and roles are resolved once. Existing users (409 on create)
+    only get missing roles.
+    """
+    from app.core.keycloak import get_service_client
+
+    kc = get_service_client()
+    client_id = await kc.get_client_uuid()
+    roles_by_name = {it["name"]: it for it in await kc.get_roles()}
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = BulkStats()
+
+    def call(
+        fn: Callable[[], Awaitable[T]], statuses: Set[int] = RETRY_STATUSES
+    ) -> Awaitable[T]:
+        return with_retries(
+            fn, stats, retries=retries, backoff=backoff, statuses=statuses
+        )
+
+    async def create_one(user_dict: Dict[str, Any]) -> None:
+        username = user_dict["username"]
+        roles = [roles_by_name[it] for it in user_dict["roles"]]
+        try:
+            # 409 on create means user exists, it is not retried
+            user_id = await call(
+                lambda: kc.create_user(user_dict), statuses=RETRY_STATUSES - {409}
+            )
+            created = True
+        except httpx.HTTPStatusError as ex:
+            if ex.response.status_code != 409:
+                raise
+            user_id, created = None, False
+        if user_id is None:
+            user = await call(lambda: kc.get_user_by_username(username))
+            user_id = user["id"]
+        if not created:
+            user_roles = await call(
+                lambda: kc.get_user_roles(user_id=user_id, client_id=client_id)
+            )
+            user_roles_names = {role["name"] for role in user_roles}
+            roles = [it for it in roles if it["name"] not in user_roles_names]
+        if roles:
+            await call(lambda: kc.add_user_roles(user_id=user_id, roles=roles))
+        if created:
+            stats.created += 1
+        elif roles:
+            stats.updated += 1
+        else:
+            stats.unchanged += 1
+
+    async def create_one_safe(user_dict: Dict[str, Any]) -> None:
+        async with semaphore:
+            try:
+                await create_one(user_dict)
+            except Exception as ex:
+                stats.failed += 1
+                print(f"User {user_dict['username']} creation error {ex!r}")
+
+    await asyncio.gather(*(create_one_safe(it) for it in users_list))
+    return stats
+
+
+def generate_users(
+    count: int, prefix: str, password: str, roles: List[str]
+) -> List[Dict[str, Any]]:
+    return [
+        {"username": f"{prefix}{i}", "password": password, "roles": roles}
+        for i in range(count)
+    ]
+
+
 if __name__ == "__main__":
-    users_dict = {}
-    with open("./users.json") as f:
-        users_dict = json.load(f)
-    users_list = users_dict.get("users", [])
-    asyncio.run(create_users(users_list))
-    print("Users successfully created.")
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default="./users.json")
+    parser.add_argument("--bulk", action="store_true", help="create users concurrently")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument(
+        "--generate",
+        type=int,
+        default=0,
+        help="create N generated users instead of file",
+    )
+    parser.add_argument("--prefix", default="load_user_")
+    parser.add_argument("--password", default="test")
+    parser.add_argument("--roles", nargs="*", default=["user", "customer"])
+    args = parser.parse_args()
+
+    if args.generate:
+        users_list = generate_users(
+            args.generate, prefix=args.prefix, password=args.password, roles=args.roles
+        )
+    else:
+        with open(args.file) as f:
+            users_list = json.load(f).get("users", [])
+
+    started = time.perf_counter()
+    if args.bulk:
+        stats = asyncio.run(
+            create_users_bulk(
+                users_list, concurrency=args.concurrency, retries=args.retries
+            )
+        )
+        print(stats)
+    else:
+        asyncio.run(create_users(users_list))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{len(users_list)} users processed in {elapsed:.2f}s "
+        f"({len(users_list) / elapsed:.1f} users/s)"
+    )
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+from typing import AsyncGenerator, Awaitable, Callable, List
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import schemas
+from app.db import entities
+from app.db.session import async_session
+
+CreateOrders = Callable[..., Awaitable[List[entities.Order]]]
+
+
+def get_sorting(field: str, type: schemas.SortingType) -> schemas.SortingList:
+    """
+    Sorting by one field
+    """
+    return schemas.SortingList(
+        sorting_list=[schemas.SortingListItem(field=field, type=type)]
+    )
+
+
+@pytest.fixture
+async def session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session which changes are rolled back after test
+    """
+    async with async_session() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+
+
+@pytest.fixture
+def customer() -> str:
+    """
+    Customer of orders created by test, filter by it to get only these orders
+    """
+    return f"test-{uuid4()}"
+
+
+@pytest.fixture
+def create_orders(session: AsyncSession, customer: str) -> CreateOrders:
+    """
+    Create orders of new order type: created one minute after another, statuses
+    go in turn and every third order has no implementer
+    """
+
+    async def create(amount: int, **fields: object) -> List[entities.Order]:
+        order_type = entities.OrderType(
+            name=schemas.OrderTypeName.BATH_ORDER, dep_type=schemas.OrderDepType.MAIN
+        )
+        session.add(order_type)
+        await session.flush()
+        statuses = list(schemas.OrderStatus)
+        created_at = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        orders = [
+            entities.Order(
+                **{
+                    "status": statuses[i % len(statuses)],
+                    "user_customer": customer,
+                    "user_implementer": None if i % 3 == 0 else f"implementer {i}",
+                    "order_type_id": order_type.id,
+                    "created_at": created_at + timedelta(minutes=i),
+                    **fields,
+                }
+            )
+            for i in range(amount)
+        ]
+        session.add_all(orders)
+        await session.flush()
+        return orders
+
+    return create
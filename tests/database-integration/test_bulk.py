@@ -0,0 +1,105 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app import schemas, services
+from app.core import error
+from app.db import entities
+from app.util.ids import gen_id
+
+UPDATED_AT = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_keeps_order(session, create_orders, customer) -> None:
+    (order,) = await create_orders(1)
+    service = services.OrderService(session)
+    items = [
+        {
+            "status": schemas.OrderStatus.NEW,
+            "user_customer": customer,
+            "user_implementer": f"implementer {i}",
+            "order_type_id": order.order_type_id,
+        }
+        for i in range(10)
+    ]
+    items[5] = entities.Order(**items[5])
+
+    created = await service.bulk_create(items, returning=["id", "user_implementer"])
+    assert [it["user_implementer"] for it in created] == [
+        f"implementer {i}" for i in range(10)
+    ]
+    ids = await service.bulk_create(items[:2])
+    assert len(set(ids)) == 2
+    assert await service.count(user_customer=customer) == 13
+    assert await service.bulk_create([]) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_update(session, create_orders, customer) -> None:
+    orders = await create_orders(4)
+    service = services.OrderService(session)
+    ids = [it.id for it in orders[:3]]
+
+    updated = await service.bulk_update(ids, {"user_implementer": "updated"})
+    assert sorted(updated) == sorted(ids)
+    assert sorted(
+        await service.read_scalar("id", user_implementer=["updated"])
+    ) == sorted(ids)
+    assert await service.bulk_update([gen_id()], {"user_implementer": "x"}) == []
+    assert await service.bulk_update([], {"user_implementer": "x"}) == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert(session, create_orders, customer) -> None:
+    orders = await create_orders(2, updated_at=UPDATED_AT)
+    service = services.OrderService(session)
+
+    def get_item(id: str, implementer: str) -> dict:
+        return {
+            "id": id,
+            "status": schemas.OrderStatus.NEW,
+            "user_customer": customer,
+            "user_implementer": implementer,
+            "order_type_id": orders[0].order_type_id,
+        }
+
+    items = [
+        get_item(gen_id(), "created 0"),
+        get_item(orders[1].id, "updated 1"),
+        get_item(gen_id(), "created 2"),
+        get_item(orders[0].id, "updated 3"),
+    ]
+    result = await service.bulk_upsert(
+        items,
+        conflict_cols=["id"],
+        returning=["id", "user_implementer", "updated_at"],
+    )
+    # returned in order of items, updated_at of existing items is set
+    assert [it["id"] for it in result] == [it["id"] for it in items]
+    assert [it["user_implementer"] for it in result] == [
+        it["user_implementer"] for it in items
+    ]
+    assert all(it["updated_at"].year > UPDATED_AT.year for it in result)
+    assert await service.count(user_customer=customer) == 4
+
+    # only update_cols are set for existing items
+    await service.bulk_upsert(
+        [{**items[1], "status": schemas.OrderStatus.DONE, "user_implementer": "x"}],
+        conflict_cols=["id"],
+        update_cols=["status"],
+    )
+    assert await service.read_scalar("status", id=orders[1].id) == [
+        schemas.OrderStatus.DONE
+    ]
+    assert await service.read_scalar("user_implementer", id=orders[1].id) == [
+        "updated 1"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_unsupported_dialect(session, monkeypatch) -> None:
+    monkeypatch.setattr("app.services.base.UPSERT_INSERTS", {})
+    service = services.OrderService(session)
+    with pytest.raises(error.UnsupportedOperation):
+        await service.bulk_upsert([{"id": gen_id()}], conflict_cols=["id"])
@@ -0,0 +1,126 @@
+import pytest
+from sqlalchemy import delete, update
+
+from app import schemas, services
+from app.db import entities
+from app.services.counts import CountCache
+from app.settings import settings
+
+
+async def read_count(
+    service: services.OrderService, strategy: schemas.CountStrategy, customer: str
+) -> schemas.PaginatedResponse:
+    return await service.read_many_paginated(
+        wrapper_class=schemas.Order,
+        limit=1,
+        count_strategy=strategy,
+        user_customer=customer,
+    )
+
+
+def test_count_cache_invalidate() -> None:
+    cache = CountCache(maxsize=10, ttl=60)
+    cache.set("order", "key", 1)
+    cache.set("material", "key", 2)
+    assert cache.get("order", "key") == 1
+    cache.invalidate("order")
+    assert cache.get("order", "key") is None
+    assert cache.get("material", "key") == 2
+    cache.set("order", "key", 3)
+    assert cache.get("order", "key") == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_count_invalidated_by_flush(
+    session, create_orders, customer
+) -> None:
+    await create_orders(3)
+    service = services.OrderService(session)
+
+    response = await read_count(service, schemas.CountStrategy.CACHED, customer)
+    assert (response.count, response.count_strategy) == (3, "exact")
+    response = await read_count(service, schemas.CountStrategy.CACHED, customer)
+    assert (response.count, response.count_strategy) == (3, "cached")
+
+    await create_orders(1)
+    response = await read_count(service, schemas.CountStrategy.CACHED, customer)
+    assert (response.count, response.count_strategy) == (4, "exact")
+
+    orders = await service.read_many(user_customer=customer)
+    await session.delete(orders[0])
+    await session.flush()
+    response = await read_count(service, schemas.CountStrategy.CACHED, customer)
+    assert (response.count, response.count_strategy) == (3, "exact")
+
+
+@pytest.mark.asyncio
+async def test_cached_count_invalidated_by_bulk_dml(
+    session, create_orders, customer
+) -> None:
+    orders = await create_orders(4)
+    service = services.OrderService(session)
+
+    async def assert_recounted(count: int) -> None:
+        response = await read_count(service, schemas.CountStrategy.CACHED, customer)
+        assert (response.count, response.count_strategy) == (count, "exact")
+        response = await read_count(service, schemas.CountStrategy.CACHED, customer)
+        assert (response.count, response.count_strategy) == (count, "cached")
+
+    await assert_recounted(4)
+    await session.execute(
+        update(entities.Order)
+        .where(entities.Order.id == orders[0].id)
+        .values(user_customer=f"{customer}-moved")
+    )
+    await assert_recounted(3)
+    await session.execute(
+        delete(entities.Order).where(entities.Order.id == orders[1].id)
+    )
+    await assert_recounted(2)
+    await service.bulk_create(
+        [
+            {"user_customer": customer, "order_type_id": orders[2].order_type_id}
+            for _ in range(3)
+        ]
+    )
+    await assert_recounted(5)
+    await service.bulk_update(
+        [orders[2].id, orders[3].id], {"user_customer": f"{customer}-moved"}
+    )
+    await assert_recounted(3)
+
+
+@pytest.mark.asyncio
+async def test_estimated_count_falls_back_to_exact(
+    session, create_orders, customer
+) -> None:
+    # few items are below COUNT_ESTIMATE_THRESHOLD, they are counted exactly
+    await create_orders(3)
+    service = services.OrderService(session)
+    assert await service.estimate_count(user_customer=customer) is None
+    response = await read_count(service, schemas.CountStrategy.ESTIMATED, customer)
+    assert (response.count, response.count_strategy) == (3, "exact")
+
+
+@pytest.mark.asyncio
+async def test_estimated_count_above_threshold(
+    session, create_orders, customer, monkeypatch
+) -> None:
+    if (await session.connection()).dialect.name != "postgresql":
+        pytest.skip("Count is estimated by postgres planner only")
+    monkeypatch.setattr(settings, "COUNT_ESTIMATE_THRESHOLD", 0)
+    await create_orders(3)
+    service = services.OrderService(session)
+    filters = {
+        "user_customer": customer,
+        "status": schemas.OrderStatus.NEW,
+        "id": [str(it) for it in await service.read_ids(user_customer=customer)],
+    }
+    estimate = await service.estimate_count(**filters)
+    assert isinstance(estimate, int)
+    response = await service.read_many_paginated(
+        wrapper_class=schemas.Order,
+        count_strategy=schemas.CountStrategy.ESTIMATED,
+        **filters,
+    )
+    assert (response.count, response.count_strategy) == (estimate, "estimated")
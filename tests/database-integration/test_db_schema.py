@@ -20,7 +20,7 @@ entities_l = [
     entities.OrderStatusUpdate,
 ]
 default_cols = {
-    "id": "VARCHAR(36)",
+    "id": "UUID",
     "created_at": "TIMESTAMP",
     "updated_at": "TIMESTAMP",
 }
@@ -35,34 +35,35 @@ entities_columns = {
         "name": "VARCHAR(100)",
         "value_type": "VARCHAR(100)",
         "required": "BOOLEAN",
-        "order_type_id": "VARCHAR(50)",
+        "order_type_id": "UUID",
     },
     str(entities.Order.__tablename__): {
         **default_cols,
-        "status": "VARCHAR(100)",
+        "status": "VARCHAR(11)",  # order_status enum
+        "status_changed_at": "TIMESTAMP",
         "user_customer": "VARCHAR(100)",
         "user_implementer": "VARCHAR(100)",
-        "order_type_id": "VARCHAR(50)",
-        "parent_order_id": "VARCHAR(50)",
+        "order_type_id": "UUID",
+        "parent_order_id": "UUID",
     },
     str(entities.OrderParamValue.__tablename__): {
         **default_cols,
         "value": "VARCHAR(100)",
-        "order_type_param_id": "VARCHAR(50)",
-        "order_id": "VARCHAR(50)",
+        "order_type_param_id": "UUID",
+        "order_id": "UUID",
     },
     str(entities.OrderConfirmation.__tablename__): {
         **default_cols,
         "user": "VARCHAR(100)",
         "signed": "BOOLEAN",
-        "order_id": "VARCHAR(50)",
+        "order_id": "UUID",
     },
     str(entities.OrderStatusUpdate.__tablename__): {
         **default_cols,
         "user": "VARCHAR(100)",
-        "old_status": "VARCHAR(100)",
-        "new_status": "VARCHAR(100)",
-        "order_id": "VARCHAR(50)",
+        "old_status": "VARCHAR(11)",  # order_status enum
+        "new_status": "VARCHAR(11)",  # order_status enum
+        "order_id": "UUID",
     },
 }
 
@@ -0,0 +1,51 @@
+from typing import List
+
+import pytest
+from conftest import get_sorting
+
+from app import schemas, services
+from app.services.base import KeysetPage
+
+
+@pytest.mark.asyncio
+async def test_keyset_selects_sorting_fields(session, create_orders, customer) -> None:
+    orders = await create_orders(5)
+    session.expunge_all()
+    service = services.OrderService(session)
+    kwargs = {
+        "limit": 2,
+        "user_customer": customer,
+        "fields": ["status"],
+        "sorting_list": get_sorting("created_at", schemas.SortingType.DESC),
+    }
+    pages: List[KeysetPage] = [await service.read_many_keyset(**kwargs)]
+    while pages[-1].next_cursor is not None:
+        pages.append(
+            await service.read_many_keyset(cursor=pages[-1].next_cursor, **kwargs)
+        )
+    items = [it for page in pages for it in page.items]
+    assert [it.id for it in items] == [it.id for it in reversed(orders)]
+    # id and sorting fields are loaded for cursors, other columns are not
+    assert all({"id", "status", "created_at"} <= set(it.__dict__) for it in items)
+    assert all("user_implementer" not in it.__dict__ for it in items)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("keyset", [False, True])
+async def test_paginated_fieldset(session, create_orders, customer, keyset) -> None:
+    orders = await create_orders(3)
+    session.expunge_all()
+    service = services.OrderService(session)
+    response = await service.read_many_paginated(
+        wrapper_class=schemas.Order,
+        keyset=keyset,
+        fieldset=schemas.FieldSet(fields=("status",), expand=("order_type",)),
+        user_customer=customer,
+        sorting_list=get_sorting("created_at", schemas.SortingType.ASC),
+    )
+    assert [it["status"] for it in response.results] == [it.status for it in orders]
+    assert all(set(it) == {"status", "order_type"} for it in response.results)
+    assert all(
+        it["order_type"]["id"] == orders[0].order_type_id for it in response.results
+    )
+    assert all("params" not in it["order_type"] for it in response.results)
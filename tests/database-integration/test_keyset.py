@@ -0,0 +1,169 @@
+from typing import Any, Dict, List, Optional
+
+import pytest
+from conftest import get_sorting
+
+from app import schemas, services
+from app.core import error
+from app.services.base import KeysetPage
+from app.util.cursor import decode_cursor, encode_cursor
+
+
+async def read_all_pages(
+    service: services.OrderService, limit: int, backward: bool, **kwargs: Any
+) -> List[KeysetPage]:
+    """
+    Walk over all pages forward from the first one, then backward from the last one
+    """
+    pages = [await service.read_many_keyset(limit=limit, **kwargs)]
+    while pages[-1].next_cursor is not None:
+        pages.append(
+            await service.read_many_keyset(
+                limit=limit, cursor=pages[-1].next_cursor, **kwargs
+            )
+        )
+    if not backward:
+        return pages
+    pages = pages[-1:]
+    while pages[0].previous_cursor is not None:
+        pages.insert(
+            0,
+            await service.read_many_keyset(
+                limit=limit, cursor=pages[0].previous_cursor, **kwargs
+            ),
+        )
+    return pages
+
+
+def get_ids(pages: List[KeysetPage]) -> List[str]:
+    return [str(it.id) for page in pages for it in page.items]
+
+
+def get_expected_ids(orders: List[Any], field: str, desc: bool) -> List[str]:
+    """
+    Postgres order: NULL values are last in ascending order and first in descending,
+    ties are ordered by time-ordered id in the same direction
+    """
+    asc = sorted(
+        orders,
+        key=lambda it: (
+            getattr(it, field) is None,
+            getattr(it, field) or "",
+            str(it.id),
+        ),
+    )
+    ids = [str(it.id) for it in asc]
+    return ids[::-1] if desc else ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backward", [False, True])
+@pytest.mark.parametrize("limit", [1, 3, 4, 20])
+async def test_keyset_pages_cover_all_items(
+    session, create_orders, customer, limit: int, backward: bool
+) -> None:
+    orders = await create_orders(10)
+    service = services.OrderService(session)
+    sorting = get_sorting("created_at", schemas.SortingType.DESC)
+
+    pages = await read_all_pages(
+        service, limit, backward, user_customer=customer, sorting_list=sorting
+    )
+
+    ids = get_ids(pages)
+    assert ids == [str(it.id) for it in reversed(orders)]
+    assert len(set(ids)) == len(ids)
+    assert all(len(it.items) == limit for it in pages[:-1])
+    assert pages[0].previous_cursor is None
+    assert pages[-1].next_cursor is None and not pages[-1].has_more
+    assert all(it.has_more for it in pages[:-1])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backward", [False, True])
+@pytest.mark.parametrize("type", list(schemas.SortingType))
+async def test_keyset_pages_with_nulls(
+    session, create_orders, customer, type: schemas.SortingType, backward: bool
+) -> None:
+    # every third order has no implementer and two orders share one
+    orders = await create_orders(10)
+    orders[4].user_implementer = orders[5].user_implementer
+    await session.flush()
+    service = services.OrderService(session)
+    service.sorting_fields = {*service.sorting_fields, "user_implementer"}
+    sorting = get_sorting("user_implementer", type)
+
+    pages = await read_all_pages(
+        service, 3, backward, user_customer=customer, sorting_list=sorting
+    )
+
+    desc = type == schemas.SortingType.DESC
+    assert get_ids(pages) == get_expected_ids(orders, "user_implementer", desc)
+
+
+@pytest.mark.asyncio
+async def test_keyset_without_sorting_is_ordered_by_id(
+    session, create_orders, customer
+) -> None:
+    orders = await create_orders(5)
+    service = services.OrderService(session)
+    pages = await read_all_pages(service, 2, False, user_customer=customer)
+    assert get_ids(pages) == sorted(str(it.id) for it in orders)
+
+
+async def read_page(
+    service: services.OrderService,
+    cursor: str,
+    sorting: Optional[schemas.SortingList] = None,
+    **kwargs: Any,
+) -> KeysetPage:
+    return await service.read_many_keyset(
+        limit=2, cursor=cursor, sorting_list=sorting, **kwargs
+    )
+
+
+def tamper(cursor: str, **data: Any) -> str:
+    values: Dict[str, Any] = {**decode_cursor(cursor), **data}
+    return encode_cursor(values)
+
+
+@pytest.mark.asyncio
+async def test_keyset_rejects_incorrect_cursors(
+    session, create_orders, customer
+) -> None:
+    await create_orders(5)
+    service = services.OrderService(session)
+    sorting = get_sorting("created_at", schemas.SortingType.ASC)
+    page = await service.read_many_keyset(
+        limit=2, user_customer=customer, sorting_list=sorting
+    )
+    cursor = page.next_cursor
+    assert cursor is not None
+    fields, values = decode_cursor(cursor)["f"], decode_cursor(cursor)["v"]
+    assert fields == ["created_at", "id"]
+    assert (await read_page(service, cursor, sorting, user_customer=customer)).items
+
+    incorrect = [
+        "not a cursor!",
+        cursor[:-5],
+        encode_cursor({"v": values}),
+        encode_cursor({"f": fields}),
+        tamper(cursor, v=values[:1]),
+        tamper(cursor, v="2023-01-01"),
+        tamper(cursor, v=["yesterday", values[1]]),
+        tamper(cursor, v=[values[0], "not uuid"]),
+        tamper(cursor, f=["id", "created_at"]),
+        tamper(cursor, f=None),
+    ]
+    for it in incorrect:
+        with pytest.raises(error.IncorrectCursor):
+            await read_page(service, it, sorting, user_customer=customer)
+
+    # cursor of page with another sorting
+    for other in [
+        None,
+        get_sorting("status", schemas.SortingType.ASC),
+        get_sorting("created_at", schemas.SortingType.DESC),
+    ]:
+        with pytest.raises(error.IncorrectCursor):
+            await read_page(service, cursor, other, user_customer=customer)
@@ -0,0 +1,128 @@
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy import event
+
+from app import schemas, services
+from app.db import entities
+from app.schemas.order import OrderStatusUpdate
+
+
+@pytest.fixture
+async def items(session, create_orders, customer) -> Dict[str, Any]:
+    """
+    Order with parent order, params, history and materials
+    """
+    parent, order = await create_orders(2)
+    order.parent_order_id = parent.id
+    order_type_params = [
+        entities.OrderTypeParam(
+            name=f"param {i}",
+            value_type=schemas.OrderParamValueType.INT,
+            required=True,
+            order_type_id=order.order_type_id,
+        )
+        for i in range(2)
+    ]
+    session.add_all(order_type_params)
+    await session.flush()
+    params = [
+        entities.OrderParamValue(
+            value=str(i), order_id=it.id, order_type_param_id=param.id
+        )
+        for it in [parent, order]
+        for i, param in enumerate(order_type_params)
+    ]
+    history = [
+        entities.OrderStatusUpdate(
+            user=customer,
+            old_status=schemas.OrderStatus.NEW,
+            new_status=schemas.OrderStatus.READY,
+            order_id=it.id,
+        )
+        for it in [parent, order]
+    ]
+    material = entities.Material(
+        name="Дрова",
+        amount=2,
+        value_type=schemas.MaterialValueType.MASS,
+        item_price=100,
+        user_creator=customer,
+        user_updator=customer,
+        order_id=order.id,
+    )
+    session.add_all([*params, *history, material])
+    await session.flush()
+    items = {
+        "order": order,
+        "order_type": order_type_params[0].order_type_id,
+        "order_type_param": order_type_params[0],
+        "order_param_value": params[0],
+        "order_status_update": history[0],
+        "material": material,
+    }
+    ids = {k: v if isinstance(v, str) else v.id for k, v in items.items()}
+    # entities are loaded from database again by tests
+    session.expunge_all()
+    return ids
+
+
+async def serialize(session, service: Any, schema: Any, id: str) -> Dict[str, Any]:
+    """
+    Read item with default load plan of service and serialize it without queries
+    """
+    items = await service(session).read_many(id=[id])
+    assert len(items) == 1
+    statements: List[str] = []
+
+    def before_execute(conn, cursor, statement, *args: Any) -> None:
+        statements.append(statement)
+
+    engine = (await session.connection()).sync_engine
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        result = schemas.serialize(schema, items[0])
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+    assert statements == []
+    assert result is not None and result["id"] == id
+    return result
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "name,service,schema",
+    [
+        ("order_type_param", services.OrderTypeParamService, schemas.OrderTypeParam),
+        ("order_param_value", services.OrderParamValueService, schemas.OrderParamValue),
+        ("order_status_update", services.OrderStatusUpdateService, OrderStatusUpdate),
+        ("material", services.MaterialsService, schemas.Material),
+    ],
+)
+async def test_serialize_plain_items(session, items, name, service, schema) -> None:
+    await serialize(session, service, schema, items[name])
+
+
+@pytest.mark.asyncio
+async def test_serialize_order_type(session, items) -> None:
+    result = await serialize(
+        session, services.OrderTypeService, schemas.OrderType, items["order_type"]
+    )
+    assert [it["name"] for it in result["params"]] == ["param 0", "param 1"]
+
+
+@pytest.mark.asyncio
+async def test_serialize_order(session, items) -> None:
+    result = await serialize(
+        session, services.OrderService, schemas.Order, items["order"]
+    )
+    assert len(result["order_type"]["params"]) == 2
+    assert len(result["params"]) == 2
+    assert [it["new_status"] for it in result["history"]] == ["READY"]
+    parent = result["parent_order"]
+    assert parent["id"] == result["parent_order_id"]
+    assert len(parent["order_type"]["params"]) == 2
+    assert len(parent["params"]) == 2 and len(parent["history"]) == 1
+    # relationships out of load plan are not loaded lazily
+    assert parent["parent_order"] is None
+    assert result["params"][0]["order_type_param"] is None
@@ -0,0 +1,74 @@
+from typing import Any
+
+import pytest
+from conftest import get_sorting
+from sqlalchemy.sql.expression import BindParameter
+
+from app import schemas, services
+from app.services.base import statement_cache
+
+
+def get_statement(**kwargs: Any) -> Any:
+    service = services.OrderService(None)  # type: ignore
+    q, _ = service._get_cached_query(service._setup_query, **kwargs)
+    return q
+
+
+def test_statement_shared_by_values() -> None:
+    statement_cache.clear()
+    q = get_statement(user_customer="a", status=["NEW"], limit=1)
+    assert get_statement(user_customer="b", status=["NEW", "DONE"], limit=5) is q
+
+
+@pytest.mark.parametrize(
+    "kwargs,other",
+    [
+        ({"user_customer": "a"}, {"user_implementer": "a"}),
+        ({"user_customer": "a"}, {"user_customer": "a", "status": "NEW"}),
+        ({"user_customer": "a"}, {"user_customer": ["a"]}),
+        ({"user_customer": "a"}, {"user_customer": None}),
+        ({"user_customer": "a"}, {"user_customer": "a", "limit": 1}),
+        ({"user_customer": "a"}, {"user_customer": "a", "filtering_policy": "or"}),
+        ({"user_customer": "a"}, {"user_customer": "a", "fields": ["status"]}),
+        ({"user_customer": "a"}, {"user_customer": "a", "load_props": []}),
+        (
+            {"sorting_list": get_sorting("created_at", schemas.SortingType.ASC)},
+            {"sorting_list": get_sorting("created_at", schemas.SortingType.DESC)},
+        ),
+        (
+            {"sorting_list": get_sorting("created_at", schemas.SortingType.ASC)},
+            {"sorting_list": get_sorting("status", schemas.SortingType.ASC)},
+        ),
+    ],
+)
+def test_statement_not_shared_by_shapes(kwargs: Any, other: Any) -> None:
+    statement_cache.clear()
+    assert get_statement(**kwargs) is not get_statement(**other)
+
+
+def test_list_filter_expanding() -> None:
+    service = services.OrderService(None)  # type: ignore
+    args, params = service._bind_params(
+        id=["a", "b"], user_customer="c", user_implementer=None, offset=0
+    )
+    assert isinstance(args["id"], BindParameter) and args["id"].expanding
+    assert isinstance(args["user_customer"], BindParameter)
+    assert not args["user_customer"].expanding
+    assert args["user_implementer"] is None
+    assert params == {
+        "filter_id": ["a", "b"],
+        "filter_user_customer": "c",
+        "page_offset": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_cached_statement_results(session, create_orders, customer) -> None:
+    orders = await create_orders(5)
+    service = services.OrderService(session)
+    ids = [it.id for it in orders]
+    for amount in [1, 3, 5, 2]:
+        items = await service.read_many(id=ids[:amount], user_customer=customer)
+        assert sorted(it.id for it in items) == sorted(ids[:amount])
+    items = await service.read_many(id=ids, user_customer="other")
+    assert items == []
@@ -0,0 +1,128 @@
+from typing import Any, List, Optional, Sequence
+
+import pytest
+from conftest import get_sorting
+
+from app import schemas, services
+
+
+def get_ids(items: Sequence[Any]) -> List[str]:
+    return [str(it.id) if not isinstance(it, dict) else it["id"] for it in items]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "offset,limit,sorting",
+    [
+        (0, 4, get_sorting("created_at", schemas.SortingType.ASC)),
+        (4, 4, get_sorting("created_at", schemas.SortingType.DESC)),
+        (8, 4, get_sorting("created_at", schemas.SortingType.ASC)),
+        (0, None, get_sorting("created_at", schemas.SortingType.DESC)),
+        (2, 3, None),
+    ],
+)
+async def test_read_many_with_count_matches_two_queries(
+    session, create_orders, customer, offset: int, limit: Optional[int], sorting
+) -> None:
+    await create_orders(10)
+    service = services.OrderService(session)
+    filters = {"user_customer": customer, "sorting_list": sorting}
+
+    items, count = await service.read_many_with_count(
+        offset=offset, limit=limit, **filters
+    )
+    expected = await service.read_many(offset=offset, limit=limit, **filters)
+
+    assert count == await service.count(**filters) == 10
+    if sorting is None:
+        # order is not defined without sorting, page contents must still match
+        assert sorted(get_ids(items)) == sorted(get_ids(expected))
+    else:
+        assert get_ids(items) == get_ids(expected)
+
+
+@pytest.mark.asyncio
+async def test_read_many_with_count_loads_relationships(
+    session, create_orders, customer
+) -> None:
+    await create_orders(3)
+    service = services.OrderService(session)
+    items, count = await service.read_many_with_count(
+        limit=2, user_customer=customer, load_props=["order_type"]
+    )
+    assert count == 3
+    assert len(items) == 2
+    assert all("order_type" in it.__dict__ for it in items)
+
+
+@pytest.mark.asyncio
+async def test_read_many_with_count_empty_page(
+    session, create_orders, customer
+) -> None:
+    await create_orders(3)
+    service = services.OrderService(session)
+
+    assert await service.read_many_with_count(
+        offset=3, limit=2, user_customer=customer
+    ) == ([], None)
+
+    # count of empty page is calculated with separate query
+    response = await service.read_many_paginated(
+        wrapper_class=schemas.Order,
+        offset=3,
+        limit=2,
+        count_strategy=schemas.CountStrategy.EXACT,
+        user_customer=customer,
+    )
+    assert response.results == []
+    assert response.count == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("window_count", [True, False])
+async def test_read_many_paginated_count(
+    session, create_orders, customer, window_count: bool
+) -> None:
+    await create_orders(5)
+    service = services.OrderService(session)
+    sorting = get_sorting("created_at", schemas.SortingType.ASC)
+    response = await service.read_many_paginated(
+        wrapper_class=schemas.Order,
+        offset=1,
+        limit=2,
+        window_count=window_count,
+        count_strategy=schemas.CountStrategy.EXACT,
+        user_customer=customer,
+        sorting_list=sorting,
+    )
+    expected = await service.read_many(
+        offset=1, limit=2, user_customer=customer, sorting_list=sorting
+    )
+    assert response.count == 5
+    assert get_ids(response.results) == get_ids(expected)
+
+
+@pytest.mark.asyncio
+async def test_read_many_paginated_custom_method(
+    session, create_orders, customer
+) -> None:
+    await create_orders(5)
+    service = services.OrderService(session)
+    calls = []
+
+    async def read_many(*args: Any, **kwargs: Any) -> Sequence[Any]:
+        calls.append(args)
+        return await service.read_many(**kwargs)
+
+    # custom method is used for page, count is calculated with separate query
+    response = await service.read_many_paginated(
+        "arg",
+        wrapper_class=schemas.Order,
+        limit=2,
+        method=read_many,
+        count_strategy=schemas.CountStrategy.EXACT,
+        user_customer=customer,
+    )
+    assert calls == [("arg",)]
+    assert len(response.results) == 2
+    assert response.count == 5
@@ -0,0 +1,83 @@
+import pytest
+
+from app import schemas, services
+from app.core import error
+from app.util.ids import gen_id
+
+
+@pytest.mark.asyncio
+async def test_create_returns_defaults(session, create_orders, customer) -> None:
+    (existing,) = await create_orders(1)
+    service = services.OrderService(session)
+    order_type = await services.OrderTypeService(session).read_one(
+        id=existing.order_type_id
+    )
+
+    created = await service.create(
+        item=schemas.OrderCreate(
+            user_customer=customer,
+            user_implementer="implementer",
+            order_type_id=order_type.id,
+        ),
+        order_type=order_type,
+    )
+    assert created.id is not None
+    assert created.status == schemas.OrderStatus.NEW
+    assert created.created_at is not None and created.updated_at is not None
+    assert created.status_changed_at is not None
+    # relationships are not loaded without load plan
+    assert "order_type" not in created.__dict__ and "params" not in created.__dict__
+    assert await service.read_one(id=created.id) is created
+
+
+@pytest.mark.asyncio
+async def test_create_with_load_plan(session, create_orders, customer) -> None:
+    (parent,) = await create_orders(1)
+    service = services.OrderService(session)
+    order_type = await services.OrderTypeService(session).read_one(
+        id=parent.order_type_id
+    )
+    order_type.dep_type = "CHILD"
+
+    created = await service.create(
+        item=schemas.OrderCreate(
+            user_customer=customer,
+            user_implementer="implementer",
+            order_type_id=order_type.id,
+            parent_order_id=parent.id,
+        ),
+        order_type=order_type,
+        load_plan=service.load_plan,
+    )
+    result = schemas.serialize(schemas.Order, created)
+    assert result is not None
+    assert result["order_type"]["id"] == order_type.id
+    assert result["parent_order"]["id"] == parent.id
+    assert (result["params"], result["history"]) == ([], [])
+
+
+@pytest.mark.asyncio
+async def test_update(session, create_orders, customer) -> None:
+    orders = await create_orders(2)
+    service = services.OrderService(session)
+
+    updated = await service.update(orders[0].id, user_implementer="updated")
+    assert updated is orders[0]
+    assert updated.user_implementer == "updated"
+    assert "order_type" not in updated.__dict__
+
+    updated = await service.update(
+        orders[1].id,
+        load_plan={"order_type": services.LoadStrategy.JOINED},
+        status=schemas.OrderStatus.READY,
+    )
+    assert updated.status == schemas.OrderStatus.READY
+    assert updated.order_type.id == orders[1].order_type_id
+    assert (await service.read_one(id=orders[0].id)).user_implementer == "updated"
+
+
+@pytest.mark.asyncio
+async def test_update_not_found(session) -> None:
+    service = services.OrderService(session)
+    with pytest.raises(error.ItemNotFound):
+        await service.update(gen_id(), user_implementer="updated")
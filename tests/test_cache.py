@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+import pytest
+
+from app.util.cache import SingleFlight, TTLCache
+
+
+def test_ttl_cache_lru_limit() -> None:
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expiration(monkeypatch) -> None:
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1, ttl=5)
+    cache.set("b", 2, ttl=600)
+    cache.set("c", 3, ttl=-1)
+    assert cache.get("c") is None
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert cache.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_calls() -> None:
+    calls = 0
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    single_flight = SingleFlight()
+    results = await asyncio.gather(*[single_flight.do("key", call) for _ in range(8)])
+    assert results == [1] * 8
+    assert await single_flight.do("key", call) == 2
+    assert not single_flight.in_flight("key")
@@ -0,0 +1,25 @@
+import time
+from uuid import RFC_4122
+
+from app.util import ids
+
+
+def test_uuid7_format() -> None:
+    before = time.time_ns() // 1_000_000
+    value = ids.uuid7()
+    after = time.time_ns() // 1_000_000
+    assert value.version == 7
+    assert value.variant == RFC_4122
+    assert before <= value.int >> 80 <= after + 1
+
+
+def test_uuid7_increasing() -> None:
+    values = [ids.gen_id() for _ in range(10000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_uuid7_clock_back(monkeypatch) -> None:
+    first = ids.uuid7()
+    monkeypatch.setattr(time, "time_ns", lambda: 0)
+    assert ids.uuid7() > first
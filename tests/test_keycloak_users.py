@@ -0,0 +1,81 @@
+import asyncio
+import time
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from app.core.keycloak import KeycloakClient
+
+ROLES = [{"id": f"role-{i}", "name": f"role_{i}", "clientRole": True} for i in range(4)]
+# more users than one page (500) of users and of role members
+USERS = [{"id": f"user-{i}", "username": f"user{i}"} for i in range(1500)]
+# every 4th user has no roles, others have 1-3 roles
+USER_ROLES: Dict[str, List[Dict]] = {
+    user["id"]: [ROLES[(i // 4 + k) % len(ROLES)] for k in range(i % 4)]
+    for i, user in enumerate(USERS)
+}
+ROLE_MEMBERS = {
+    role["name"]: [user for user in USERS if role in USER_ROLES[user["id"]]]
+    for role in ROLES
+}
+
+
+def fake_keycloak(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    first = int(request.url.params.get("first", 0))
+    max_ = int(request.url.params.get("max", 100))
+    if path.endswith("/clients"):
+        return httpx.Response(200, json=[{"id": "client-uuid"}])
+    if path.endswith("/roles"):
+        return httpx.Response(200, json=ROLES)
+    if path.endswith("/users") and "/roles/" in path:
+        members = ROLE_MEMBERS[path.split("/")[-2]]
+        return httpx.Response(200, json=members[first:first + max_])
+    if "/role-mappings/clients/" in path:
+        return httpx.Response(200, json=USER_ROLES[path.split("/")[-4]])
+    if path.endswith("/users"):
+        return httpx.Response(200, json=USERS[first:first + max_])
+    return httpx.Response(404)
+
+
+def get_client() -> KeycloakClient:
+    kc = KeycloakClient(
+        url="http://keycloak",
+        realm="test",
+        client_id="test",
+        _access_token="token",
+        _access_token_exp=time.time() + 3600,
+    )
+    kc._http = httpx.AsyncClient(transport=httpx.MockTransport(fake_keycloak))
+    kc._http_loop = asyncio.get_running_loop()
+    return kc
+
+
+async def get_users_with_roles_per_user(kc: KeycloakClient) -> List[Dict]:
+    """Previous implementation: roles are requested for every user"""
+    users = await kc.get_users_all()
+    client_id = await kc.get_client_uuid()
+    for user in users:
+        user["roles"] = await kc.get_user_roles(user_id=user["id"], client_id=client_id)
+    return users
+
+
+def get_user_role_names(users: List[Dict]) -> Dict[str, List[str]]:
+    return {user["id"]: sorted(it["name"] for it in user["roles"]) for user in users}
+
+
+@pytest.mark.asyncio
+async def test_get_users_with_roles_matches_per_user_roles() -> None:
+    kc = get_client()
+    try:
+        expected = get_user_role_names(await get_users_with_roles_per_user(kc))
+        kc.invalidate_metadata()
+        actual = get_user_role_names(await kc.get_users_with_roles())
+    finally:
+        await kc.aclose()
+    assert actual == expected
+    assert len(actual) == len(USERS)
+    assert [] in actual.values()
+    assert max(len(it) for it in actual.values()) == 3
+    assert all(len(it) > 500 for it in ROLE_MEMBERS.values())
@@ -0,0 +1,261 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+from uuid import UUID
+
+import pytest
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+
+from app import schemas
+from app.core import error
+from app.db import entities
+from app.schemas import serializers
+from app.schemas.order import OrderStatusUpdate
+from app.util.cache import TTLCache
+from app.util.ids import gen_id
+
+CREATED_AT = datetime(2023, 5, 1, 12, 30, tzinfo=timezone.utc)
+ORM_SCHEMAS = [
+    schemas.Order,
+    schemas.OrderType,
+    schemas.OrderTypeParam,
+    schemas.OrderParamValue,
+    OrderStatusUpdate,
+    schemas.Material,
+]
+
+
+@pytest.fixture(autouse=True)
+def orm_mode(monkeypatch) -> None:
+    # response schemas are not used with from_orm in app, it is a reference here
+    for schema in ORM_SCHEMAS:
+        monkeypatch.setattr(schema.__config__, "orm_mode", True)
+
+
+def from_orm(schema: Any, item: Any) -> Any:
+    return jsonable_encoder(schema.from_orm(item))
+
+
+def timestamps(minutes: int = 0) -> dict:
+    created_at = CREATED_AT + timedelta(minutes=minutes)
+    return {"id": gen_id(), "created_at": created_at, "updated_at": created_at}
+
+
+def make_order_type() -> entities.OrderType:
+    order_type = entities.OrderType(
+        **timestamps(),
+        name=schemas.OrderTypeName.BATH_ORDER,
+        dep_type=schemas.OrderDepType.MAIN,
+    )
+    order_type.params = [
+        entities.OrderTypeParam(
+            **timestamps(i),
+            name=f"param {i}",
+            value_type=schemas.OrderParamValueType.INT,
+            required=bool(i % 2),
+            order_type_id=order_type.id,
+        )
+        for i in range(2)
+    ]
+    return order_type
+
+
+def make_order(
+    order_type: entities.OrderType, parent: Optional[entities.Order] = None
+) -> entities.Order:
+    order = entities.Order(
+        **timestamps(),
+        status=schemas.OrderStatus.IN_PROGRESS,
+        status_changed_at=CREATED_AT.replace(tzinfo=None),
+        user_customer="customer",
+        user_implementer="implementer",
+        order_type_id=order_type.id,
+        order_type=order_type,
+        parent_order_id=parent.id if parent is not None else None,
+        parent_order=parent,
+    )
+    order.params = [
+        entities.OrderParamValue(
+            **timestamps(i),
+            value=str(i),
+            order_id=order.id,
+            order_type_param_id=param.id,
+            order_type_param=param,
+        )
+        for i, param in enumerate(order_type.params)
+    ]
+    order.history = [
+        entities.OrderStatusUpdate(
+            **timestamps(),
+            user="user",
+            old_status=schemas.OrderStatus.READY,
+            new_status=schemas.OrderStatus.IN_PROGRESS,
+            order_id=order.id,
+        )
+    ]
+    return order
+
+
+def test_serialize_order_as_from_orm() -> None:
+    order_type = make_order_type()
+    order = make_order(order_type, parent=make_order(order_type))
+    result = schemas.serialize(schemas.Order, order)
+    assert result == from_orm(schemas.Order, order)
+    assert result is not None
+    assert result["status"] == "IN PROGRESS"
+    assert result["history"][0]["old_status"] == "READY"
+    assert result["id"] == order.id
+    assert result["created_at"] == "2023-05-01T12:30:00+00:00"
+    assert result["status_changed_at"] == "2023-05-01T12:30:00"
+    assert result["parent_order"]["id"] == order.parent_order_id
+
+
+def test_serialize_missing_relationships_as_from_orm() -> None:
+    order_type = make_order_type()
+    order = make_order(order_type)
+    result = schemas.serialize(schemas.Order, order)
+    assert result == from_orm(schemas.Order, order)
+    assert result is not None
+    assert result["parent_order"] is None
+
+    # relationships that are not loaded (set) are serialized empty
+    not_loaded = entities.Order(
+        **timestamps(),
+        status=schemas.OrderStatus.NEW,
+        user_customer="customer",
+        user_implementer="implementer",
+        order_type_id=order_type.id,
+    )
+    result = schemas.serialize(schemas.Order, not_loaded)
+    assert result == from_orm(schemas.Order, not_loaded)
+    assert result is not None
+    assert (result["order_type"], result["params"], result["history"]) == (None, [], [])
+
+
+def test_serialize_uuid_objects_as_strings() -> None:
+    order_type = make_order_type()
+    order_type.id = UUID(order_type.id)
+    result = schemas.serialize(schemas.OrderType, order_type)
+    assert result == from_orm(schemas.OrderType, order_type)
+    assert result is not None
+    assert result["id"] == str(order_type.id)
+
+
+def test_serialize_enums_as_values() -> None:
+    material = entities.Material(
+        **timestamps(),
+        name="Дрова",
+        amount=2,
+        value_type=schemas.MaterialValueType.MASS,
+        item_price=100,
+        user_creator="creator",
+        user_updator="updator",
+        order_id=gen_id(),
+    )
+    result = schemas.serialize(schemas.Material, material)
+    assert result == from_orm(schemas.Material, material)
+    assert result is not None
+    assert result["value_type"] == "MASS"
+
+
+def test_serialize_many() -> None:
+    order_type = make_order_type()
+    orders = [make_order(order_type) for _ in range(3)]
+    assert schemas.serialize_many(schemas.Order, orders) == [
+        from_orm(schemas.Order, it) for it in orders
+    ]
+    assert schemas.serialize(schemas.Order, None) is None
+
+
+def test_fieldset_include() -> None:
+    assert schemas.FieldSet().get_include(schemas.Order) is None
+    include = schemas.FieldSet(fields=("id", "status")).get_include(schemas.Order)
+    assert include == {"id": None, "status": None}
+
+    order_type = make_order_type()
+    order = make_order(order_type, parent=make_order(order_type))
+    fieldset = schemas.FieldSet(fields=("id", "order_type"))
+    assert schemas.serialize(schemas.Order, order, fieldset) == {
+        "id": order.id,
+        "order_type": {
+            "id": order_type.id,
+            "created_at": "2023-05-01T12:30:00+00:00",
+            "updated_at": "2023-05-01T12:30:00+00:00",
+            "name": "Заказ на баню",
+            "dep_type": "MAIN",
+        },
+    }
+
+
+def test_fieldset_nested_expand() -> None:
+    fieldset = schemas.FieldSet(
+        fields=("id",), expand=("order_type.params", "params.order_type_param")
+    )
+    include = fieldset.get_include(schemas.Order)
+    assert include is not None
+    assert schemas.get_include_columns(include) == ["id"]
+    assert schemas.get_include_paths(include) == [
+        "order_type.params",
+        "params.order_type_param",
+    ]
+
+    order_type = make_order_type()
+    order = make_order(order_type)
+    result = schemas.serialize(schemas.Order, order, fieldset)
+    assert result is not None
+    assert set(result) == {"id", "order_type", "params"}
+    assert [it["name"] for it in result["order_type"]["params"]] == [
+        "param 0",
+        "param 1",
+    ]
+    assert "order_type_param" in result["params"][0]
+    assert "params" not in result["params"][0]["order_type_param"]
+    # expanded items are serialized with plain fields, nested ones are not included
+    expand_all = schemas.FieldSet(expand=("parent_order",))
+    result = schemas.serialize(
+        schemas.Order, make_order(order_type, parent=order), expand_all
+    )
+    assert result is not None
+    assert "order_type" not in result
+    assert "params" not in result["parent_order"]
+
+
+@pytest.mark.parametrize(
+    "fieldset",
+    [
+        schemas.FieldSet(fields=("id", "unknown")),
+        schemas.FieldSet(expand=("status",)),
+        schemas.FieldSet(expand=("order_type.unknown",)),
+        schemas.FieldSet(expand=("order_type.name",)),
+    ],
+)
+def test_fieldset_incorrect_fields(fieldset: schemas.FieldSet) -> None:
+    with pytest.raises(error.IncorrectFields):
+        fieldset.get_include(schemas.Order)
+
+
+@pytest.mark.asyncio
+async def test_fieldset_incorrect_fields_response() -> None:
+    from app.main import app
+
+    with pytest.raises(error.IncorrectFields) as exc:
+        schemas.FieldSet(fields=("unknown",)).get_include(schemas.Order)
+    handler = app.exception_handlers[error.IncorrectFields]
+    response = await handler(Request({"type": "http"}), exc.value)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("maxsize", [0, 2])
+def test_serializers_cache_is_bounded(monkeypatch, maxsize: int) -> None:
+    cache: TTLCache = TTLCache(maxsize=maxsize, ttl=60)
+    monkeypatch.setattr(serializers, "_serializers", cache)
+    order_type = make_order_type()
+    order = make_order(order_type, parent=make_order(order_type))
+    expected = from_orm(schemas.Order, order)
+    fields = ["id", "status", "user_customer", "user_implementer", "created_at"]
+    for i in range(len(fields)):
+        fieldset = schemas.FieldSet(fields=tuple(fields[:i + 1]))
+        result = schemas.serialize(schemas.Order, order, fieldset)
+        assert result == {k: expected[k] for k in fields[:i + 1]}
+        assert len(cache) <= maxsize
+    assert schemas.serialize(schemas.Order, order) == expected
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core import error, keycloak
+from app.core.user_directory import UserDirectory
+from app.settings import settings
+
+USER = {"id": "user", "username": "user"}
+# status codes of keycloak responses for user ids
+STATUSES = {"user": 200, "missing": 404, "unauthorized": 401, "forbidden": 403}
+
+
+def fake_keycloak(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path.endswith("/clients"):
+        return httpx.Response(200, json=[{"id": "client-uuid"}])
+    if "/role-mappings/clients/" in path:
+        return httpx.Response(200, json=[])
+    status = STATUSES[path.split("/")[-1]]
+    return httpx.Response(status, json=USER if status == 200 else {})
+
+
+@pytest.fixture
+async def kc(monkeypatch):
+    kc = keycloak.KeycloakClient(
+        url="http://keycloak",
+        realm="test",
+        client_id="test",
+        _access_token="token",
+        _access_token_exp=time.time() + 3600,
+    )
+    kc._http = httpx.AsyncClient(transport=httpx.MockTransport(fake_keycloak))
+    kc._http_loop = asyncio.get_running_loop()
+    monkeypatch.setattr(keycloak, "get_service_client", lambda: kc)
+    yield kc
+    await kc.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_missing_user(kc) -> None:
+    directory = UserDirectory()
+    assert (await directory.get_user("user"))["roles"] == []
+    with pytest.raises(error.ItemNotFound):
+        await directory.get_user("missing")
+    assert directory._missing.get("missing")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("user_id", ["unauthorized", "forbidden"])
+async def test_rejected_token_is_not_missing_user(kc, monkeypatch, user_id) -> None:
+    directory = UserDirectory()
+    with pytest.raises(httpx.HTTPStatusError):
+        await directory.get_user(user_id)
+    assert directory._missing.get(user_id) is None
+
+    # user is found once keycloak accepts token again
+    monkeypatch.setitem(STATUSES, user_id, 200)
+    assert (await directory.get_user(user_id))["id"] == "user"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("enabled", [False, True])
+async def test_lookups_are_not_added_to_mirror(kc, monkeypatch, enabled) -> None:
+    monkeypatch.setattr(settings, "USER_DIRECTORY_ENABLED", enabled)
+    directory = UserDirectory()
+    user = await directory.get_user("user")
+    assert directory.get_users() == []
+    assert directory._found.get("user") is user
+    assert await directory.get_user("user") is user